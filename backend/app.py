@@ -2,10 +2,16 @@ from flask import Flask, jsonify
 from flask_cors import CORS
 from config import Config
 from extensions import db
+from common import db_routing
+from commands import register_commands
 from routes.ocr_routes import ocr_bp
 from routes.translation_routes import translation_bp
 from routes.rag_routes import rag_bp
 from routes.disputed_lands_routes import disputed_lands_bp
+from routes.land_records_routes import land_records_bp
+from routes.bulk_routes import bulk_bp
+from routes.dashboard_routes import dashboard_bp
+from routes.farmer_routes import farmers_bp
 import os
 import logging
 
@@ -22,22 +28,48 @@ def create_app(config_class=Config):
     
     # Initialize Extensions
     db.init_app(app)
+    db_routing.init_app(app)
     
-    # Create database tables
-    with app.app_context():
-        try:
-            from models import Document, Farmer, LandParcel, ProcessingStats, DisputedLand
-            db.create_all()
-            logger.info("Database tables created successfully")
-        except Exception as e:
-            logger.error(f"Error creating database tables: {e}")
+    # Schema work is a deploy step (`flask init-db`); only run it at boot when asked to
+    if app.config['AUTO_CREATE_SCHEMA']:
+        with app.app_context():
+            try:
+                from common.schema import init_database
+                init_database()
+                logger.info("Database tables created successfully")
+            except Exception as e:
+                logger.error(f"Error creating database tables: {e}")
+    
+    # Keep the document search index in sync with ORM writes
+    from document.search_index import register_search_listeners
+    register_search_listeners()
+    
+    # Keep the claimant name index in sync with ORM writes
+    from common.claimant_index import register_claimant_listeners
+    register_claimant_listeners()
+    
+    # Keep the farmer matching blocking keys in sync with ORM writes
+    from common.farmer_matching import register_farmer_listeners
+    register_farmer_listeners()
+    
+    # Bump the dashboard data version on writes (ETag / snapshot invalidation)
+    from common.data_version import register_version_listener
+    register_version_listener()
+    register_commands(app)
+    
+    # Optional model warmup; under gunicorn preload this already happened in the master.
+    # With a translation service configured the model lives there instead.
+    from translation import worker_pool
+    from translation.ai4bharat_translator import model_manager, translation_status
+    if app.config['TRANSLATION_WARMUP'] and not worker_pool.configured() and not model_manager.ready:
+        model_manager.warmup(background=True)
     
     # Initialize CORS with proper configuration
     CORS(app, resources={
         r"/api/*": {
             "origins": app.config['CORS_ORIGINS'],
             "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-            "allow_headers": ["Content-Type", "Authorization"]
+            "allow_headers": ["Content-Type", "Authorization", db_routing.READ_PRIMARY_HEADER]
         }
     })
     
@@ -46,6 +78,10 @@ def create_app(config_class=Config):
     app.register_blueprint(translation_bp, url_prefix='/api/translate')
     app.register_blueprint(rag_bp, url_prefix='/api/rag')
     app.register_blueprint(disputed_lands_bp, url_prefix='/api')
+    app.register_blueprint(land_records_bp, url_prefix='/api/land-records')
+    app.register_blueprint(bulk_bp, url_prefix='/api/bulk')
+    app.register_blueprint(dashboard_bp, url_prefix='/api/dashboard')
+    app.register_blueprint(farmers_bp, url_prefix='/api/farmers')
     
     # Health check endpoint
     @app.route('/api/health')
@@ -57,7 +93,8 @@ def create_app(config_class=Config):
             "service": "OCR Backend",
             "environment": app.config['ENV'],
             "google_vision_configured": google_vision,
-            "database": "connected" if db.engine else "not_connected"
+            "database": "connected" if db.engine else "not_connected",
+            "translation_model": translation_status()
         })
     
     # Root endpoint
@@ -71,7 +108,11 @@ def create_app(config_class=Config):
                 "ocr": "/api/ocr",
                 "translation": "/api/translate",
                 "rag": "/api/rag",
-                "disputed_lands": "/api/disputed-lands"
+                "disputed_lands": "/api/disputed-lands",
+                "land_records": "/api/land-records",
+                "bulk": "/api/bulk",
+                "dashboard": "/api/dashboard",
+                "farmers": "/api/farmers"
             }
         })
     
@@ -0,0 +1,129 @@
+"""
+Translation backend benchmark: latency, throughput, memory and quality
+
+Each backend runs in a fresh interpreter (so peak memory is its own) over
+the Urdu fixture sentences in benchmarks/fixtures/urdu_en.tsv:
+- load time
+- median latency of a single sentence
+- throughput of one batched call over all sentences
+- peak RSS
+- chrF against the reference translations and against the float32 (torch)
+  output, which shows how far quantization moves the translations
+
+The translation memory is bypassed so every run does the model work.
+
+Usage:
+    python benchmarks/backend_benchmark.py [--backends torch,torch-int8,ctranslate2,onnx]
+        [--fixtures benchmarks/fixtures/urdu_en.tsv] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import Counter
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_FIXTURES = os.path.join(BACKEND_DIR, 'benchmarks', 'fixtures', 'urdu_en.tsv')
+
+CHILD_SCRIPT = r"""
+import json, resource, statistics, sys, time
+sources, repeat = json.loads(sys.stdin.read())
+from translation.ai4bharat_translator import model_manager, translate_batch
+t0 = time.perf_counter()
+ready = model_manager.warmup()
+load_s = time.perf_counter() - t0
+if not ready:
+    print(json.dumps({'error': model_manager.status()['error']}))
+    sys.exit(0)
+latencies = []
+for _ in range(repeat):
+    for source in sources:
+        t = time.perf_counter()
+        translate_batch([source], use_memory=False)
+        latencies.append((time.perf_counter() - t) * 1000)
+t = time.perf_counter()
+outputs = translate_batch(sources, use_memory=False)
+batch_s = time.perf_counter() - t
+print(json.dumps({
+    'load_s': load_s,
+    'latency_ms': statistics.median(latencies),
+    'sentences_per_s': len(sources) / batch_s,
+    'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'outputs': outputs,
+}))
+"""
+
+
+def read_fixtures(path):
+    pairs = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip() and not line.startswith('#'):
+                source, reference = line.rstrip('\n').split('\t')
+                pairs.append((source, reference))
+    return pairs
+
+
+def _ngrams(text, n):
+    return Counter(text[i:i + n] for i in range(len(text) - n + 1))
+
+
+def chrf(hypotheses, references, max_n=6, beta=2):
+    """Corpus chrF (character n-gram F-score, n = 1..6, beta = 2) on 0..100"""
+    precisions, recalls = [], []
+    for n in range(1, max_n + 1):
+        match = hyp_total = ref_total = 0
+        for hypothesis, reference in zip(hypotheses, references):
+            hyp, ref = _ngrams(hypothesis.replace(' ', ''), n), _ngrams(reference.replace(' ', ''), n)
+            match += sum((hyp & ref).values())
+            hyp_total += sum(hyp.values())
+            ref_total += sum(ref.values())
+        precisions.append(match / hyp_total if hyp_total else 0.0)
+        recalls.append(match / ref_total if ref_total else 0.0)
+    precision, recall = statistics.mean(precisions), statistics.mean(recalls)
+    if not precision and not recall:
+        return 0.0
+    return 100 * (1 + beta ** 2) * precision * recall / (beta ** 2 * precision + recall)
+
+
+def run_backend(backend, sources, repeat):
+    env = dict(os.environ, TRANSLATION_BACKEND=backend)
+    result = subprocess.run(
+        [sys.executable, '-c', CHILD_SCRIPT], input=json.dumps([sources, repeat]),
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    lines = result.stdout.strip().splitlines()
+    if result.returncode or not lines:
+        return {'error': (result.stderr.strip().splitlines() or ['failed'])[-1]}
+    return json.loads(lines[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backends', default='torch,torch-int8,ctranslate2,onnx')
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES)
+    parser.add_argument('--repeat', type=int, default=3, help='Single-sentence latency passes')
+    args = parser.parse_args()
+
+    pairs = read_fixtures(args.fixtures)
+    sources = [source for source, _ in pairs]
+    references = [reference for _, reference in pairs]
+    print(f"{len(pairs)} fixture sentences")
+
+    results = {backend: run_backend(backend, sources, args.repeat) for backend in args.backends.split(',')}
+    baseline = results.get('torch', {}).get('outputs')
+
+    print(f"{'backend':<13}{'load s':>8}{'latency ms':>12}{'sent/s':>8}{'peak MB':>9}{'chrF ref':>10}{'chrF f32':>10}")
+    for backend, result in results.items():
+        if 'error' in result:
+            print(f"{backend:<13} unavailable: {result['error']}")
+            continue
+        agreement = f"{chrf(result['outputs'], baseline):>10.1f}" if baseline else f"{'-':>10}"
+        print(f"{backend:<13}{result['load_s']:>8.1f}{result['latency_ms']:>12.1f}{result['sentences_per_s']:>8.1f}"
+              f"{result['peak_rss_mb']:>9.0f}{chrf(result['outputs'], references):>10.1f}{agreement}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Cold start benchmark for the Flask app
+
+Each run starts a fresh interpreter (like a serverless cold start) and times
+importing app.py, create_app() and the first /api/health request. It also
+reports which heavy libraries ended up imported, which should be none of
+them until an endpoint that needs one is called.
+
+Usage:
+    python benchmarks/startup_benchmark.py [--runs 5] [--auto-create-schema]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ('fitz', 'cv2', 'transformers', 'torch', 'google.cloud.vision', 'reportlab')
+
+CHILD_SCRIPT = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from app import create_app
+t1 = time.perf_counter()
+app = create_app()
+t2 = time.perf_counter()
+response = app.test_client().get('/api/health')
+t3 = time.perf_counter()
+print(json.dumps({
+    'import_ms': (t1 - t0) * 1000,
+    'create_app_ms': (t2 - t1) * 1000,
+    'first_request_ms': (t3 - t2) * 1000,
+    'total_ms': (t3 - t0) * 1000,
+    'status': response.status_code,
+    'heavy_modules': [m for m in HEAVY if m in sys.modules],
+}))
+"""
+
+
+def run_once(auto_create_schema):
+    env = dict(os.environ, AUTO_CREATE_SCHEMA='true' if auto_create_schema else 'false')
+    script = f"HEAVY = {HEAVY_MODULES!r}\n{CHILD_SCRIPT}"
+    result = subprocess.run(
+        [sys.executable, '-c', script],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--auto-create-schema', action='store_true',
+                        help='Include schema creation in startup (old behaviour)')
+    args = parser.parse_args()
+
+    results = [run_once(args.auto_create_schema) for _ in range(args.runs)]
+
+    print(f"{'phase':<18}{'median ms':>12}{'min ms':>10}{'max ms':>10}")
+    for phase in ('import_ms', 'create_app_ms', 'first_request_ms', 'total_ms'):
+        values = [r[phase] for r in results]
+        print(f"{phase:<18}{statistics.median(values):>12.1f}{min(values):>10.1f}{max(values):>10.1f}")
+
+    heavy = sorted({m for r in results for m in r['heavy_modules']})
+    print(f"health status: {results[-1]['status']}")
+    print(f"heavy modules imported at startup: {', '.join(heavy) or 'none'}")
+
+
+if __name__ == '__main__':
+    main()
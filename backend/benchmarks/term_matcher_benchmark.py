@@ -0,0 +1,81 @@
+"""
+Domain-term replacement benchmark
+
+Compares the old one-str.replace-per-term loop with the compiled single-pass
+TermMatcher on synthetic documents of growing size and dictionaries of
+growing size (the land record terms plus generated filler terms).
+
+Usage:
+    python benchmarks/term_matcher_benchmark.py [--pages 1,10,100] [--terms 118,1000,5000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from translation.simple_translator import LAND_RECORD_TERMS
+from translation.term_matcher import TermMatcher
+
+CHARS_PER_PAGE = 3000
+URDU_LETTERS = 'ابپتٹثجچحخدڈذرڑزژسشصضطظعغفقکگلمنوہیے'
+
+
+def dictionary(size, rng):
+    terms = dict(LAND_RECORD_TERMS)
+    while len(terms) < size:
+        word = ''.join(rng.choice(URDU_LETTERS) for _ in range(rng.randint(3, 8)))
+        terms.setdefault(word, f"term-{len(terms)}")
+    return terms
+
+
+def document(pages, rng):
+    words = list(LAND_RECORD_TERMS) + [''.join(rng.choice(URDU_LETTERS) for _ in range(5)) for _ in range(200)]
+    text = []
+    length = 0
+    while length < pages * CHARS_PER_PAGE:
+        word = rng.choice(words)
+        text.append(word)
+        length += len(word) + 1
+    return ' '.join(text)
+
+
+def replace_loop(terms, text):
+    for term, replacement in terms.items():
+        text = text.replace(term, replacement)
+    return text
+
+
+def timed(function, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', default='1,10,100')
+    parser.add_argument('--terms', default=f"{len(LAND_RECORD_TERMS)},1000,5000")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    print(f"{'terms':>7}{'pages':>7}{'build ms':>10}{'loop ms':>10}{'matcher ms':>12}{'ms/page':>9}")
+    for size in (int(t) for t in args.terms.split(',')):
+        terms = dictionary(size, rng)
+        start = time.perf_counter()
+        matcher = TermMatcher(terms)
+        build_ms = (time.perf_counter() - start) * 1000
+        for pages in (int(p) for p in args.pages.split(',')):
+            text = document(pages, rng)
+            loop_ms = timed(replace_loop, terms, text)
+            matcher_ms = timed(matcher.replace, text)
+            print(f"{size:>7}{pages:>7}{build_ms:>10.1f}{loop_ms:>10.1f}{matcher_ms:>12.1f}{matcher_ms / pages:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
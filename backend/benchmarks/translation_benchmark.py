@@ -0,0 +1,103 @@
+"""
+Translation throughput benchmark (pages per minute)
+
+Segments pages the same way as /api/translate/document, then translates them
+one segment per generate() call and with length-bucketed batches at a few
+token budgets, reporting padding overhead, wall time and pages/minute.
+Pages come from a text PDF (--pdf) or are synthesized from the land record
+vocabulary in simple_translator.py.
+
+Without the AI4Bharat model installed only the batch plans are compared
+(--plan-only does the same on purpose).
+
+Usage:
+    python benchmarks/translation_benchmark.py [--pdf jamabandi.pdf] [--pages 10]
+        [--budgets 1024,4096,8192] [--plan-only]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from translation.batching import MAX_BATCH_SIZE, estimate_tokens, padding_ratio, plan_batches
+from translation.segmenter import segment_document
+from translation.simple_translator import LAND_RECORD_TERMS
+
+
+def synthetic_pages(count, lines_per_page=30, seed=7):
+    """Urdu-looking pages whose lines vary from a couple of words to long entries"""
+    rng = random.Random(seed)
+    words = [term for term in LAND_RECORD_TERMS if not term.isascii()]
+    return [
+        [' '.join(rng.choice(words) for _ in range(rng.choice((2, 3, 5, 8, 12, 20, 35)))) + '۔' for _ in range(lines_per_page)]
+        for _ in range(count)
+    ]
+
+
+def pdf_pages(path):
+    import fitz
+
+    with fitz.open(path) as doc:
+        return [[line for line in page.get_text("text").split("\n") if line.strip()] for page in doc]
+
+
+def unsorted_batches(count, size):
+    return [list(range(start, min(start + size, count))) for start in range(0, count, size)]
+
+
+def report_plans(segments, budgets):
+    lengths = [estimate_tokens(s) for s in segments]
+    print(f"{'plan':<28}{'batches':>9}{'padding':>10}")
+    plan = unsorted_batches(len(lengths), MAX_BATCH_SIZE)
+    print(f"{f'unsorted x{MAX_BATCH_SIZE}':<28}{len(plan):>9}{padding_ratio(lengths, plan):>10.1%}")
+    for budget in budgets:
+        plan = plan_batches(lengths, budget)
+        print(f"{f'bucketed {budget} tokens':<28}{len(plan):>9}{padding_ratio(lengths, plan):>10.1%}")
+
+
+def time_run(translate_batch, segments, pages, **kwargs):
+    start = time.perf_counter()
+    # Without the translation memory, so every run does the same model work
+    translate_batch(segments, use_memory=False, **kwargs)
+    seconds = time.perf_counter() - start
+    return seconds, pages / seconds * 60
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pdf', help='Text PDF to translate (default: synthetic pages)')
+    parser.add_argument('--pages', type=int, default=10, help='Synthetic page count')
+    parser.add_argument('--budgets', default='1024,4096,8192', help='Comma-separated batch token budgets')
+    parser.add_argument('--plan-only', action='store_true', help='Compare batch plans without running the model')
+    args = parser.parse_args()
+
+    pages = pdf_pages(args.pdf) if args.pdf else synthetic_pages(args.pages)
+    # Same segmentation as /api/translate/document
+    text = '\n'.join(f"--- Page {number} ---\n" + '\n'.join(lines) for number, lines in enumerate(pages, 1))
+    segments = [segment for *_, segment in segment_document(text)]
+    budgets = [int(b) for b in args.budgets.split(',')]
+    print(f"{len(pages)} pages, {len(segments)} segments ({len(set(segments))} distinct), "
+          f"~{sum(map(estimate_tokens, segments))} input tokens")
+    report_plans(segments, budgets)
+
+    if args.plan_only:
+        return
+    from translation.ai4bharat_translator import model_manager, translate_batch
+    if not model_manager.warmup():
+        print(f"model unavailable ({model_manager.status()['error']}); plans only")
+        return
+
+    translate_batch(segments[:4])  # first-call overhead outside the timings
+    print(f"\n{'run':<28}{'seconds':>9}{'pages/min':>11}")
+    seconds, rate = time_run(translate_batch, segments, len(pages), max_batch_size=1)
+    print(f"{'one segment per call':<28}{seconds:>9.1f}{rate:>11.1f}")
+    for budget in budgets:
+        seconds, rate = time_run(translate_batch, segments, len(pages), max_batch_tokens=budget)
+        print(f"{f'bucketed {budget} tokens':<28}{seconds:>9.1f}{rate:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
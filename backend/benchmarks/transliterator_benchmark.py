@@ -0,0 +1,62 @@
+"""
+Name transliteration throughput benchmark
+
+Transliterates synthetic farmer names (two or three words drawn from a pool
+of common and generated name words, so names repeat as in real imports)
+from Urdu and Devanagari to Latin with transliterate_batch(), with a cold
+and a warm word cache.
+
+Usage:
+    python benchmarks/transliterator_benchmark.py [--names 1000,100000] [--words 2000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from translation.transliterator import NAME_TABLE, transliterate_batch, transliterate_word
+
+URDU_LETTERS = 'ابپتٹجچخدڈرزسشغفقکگلمنوہی'
+DEVANAGARI_SYLLABLES = ['क', 'रा', 'म', 'लि', 'सु', 'दे', 'वी', 'ज', 'य', 'प्री', 'त', 'न', 'ह', 'बी', 'र']
+
+
+def name_words(script, count, rng):
+    column = 1 if script == 'urdu' else 2
+    words = [entry[column] for entry in NAME_TABLE]
+    while len(words) < count:
+        if script == 'urdu':
+            words.append(''.join(rng.choice(URDU_LETTERS) for _ in range(rng.randint(3, 6))))
+        else:
+            words.append(''.join(rng.choice(DEVANAGARI_SYLLABLES) for _ in range(rng.randint(2, 3))))
+    return words
+
+
+def timed(names, script):
+    start = time.perf_counter()
+    transliterate_batch(names, script, 'latin')
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--names', default='1000,100000', help='Comma-separated batch sizes')
+    parser.add_argument('--words', type=int, default=2000, help='Distinct name words per script')
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    print(f"{'script':<12}{'names':>9}{'cold ms':>10}{'warm ms':>10}{'names/s (cold)':>16}")
+    for script in ('urdu', 'devanagari'):
+        words = name_words(script, args.words, rng)
+        for count in (int(n) for n in args.names.split(',')):
+            names = [' '.join(rng.choice(words) for _ in range(rng.choice((2, 3)))) for _ in range(count)]
+            transliterate_word.cache_clear()
+            cold = timed(names, script)
+            warm = timed(names, script)
+            print(f"{script:<12}{count:>9}{cold * 1000:>10.1f}{warm * 1000:>10.1f}{count / cold:>16,.0f}")
+
+
+if __name__ == '__main__':
+    main()
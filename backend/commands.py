@@ -0,0 +1,213 @@
+"""
+Flask CLI commands for database maintenance
+
+Usage:
+    flask --app app init-db
+    flask --app app rebuild-search-index
+    flask --app app backfill-khasra-keys
+    flask --app app backfill-map-fields
+    flask --app app rebuild-dispute-summary [--check]
+    flask --app app rebuild-claimant-index
+    flask --app app rebuild-farmer-keys
+    flask --app app dedup-farmers --out farmer_duplicates.ndjson [--threshold 0.9]
+    flask --app app export-documents --format parquet --out documents.parquet
+    flask --app app translation-service [--replicas 2] [--address 127.0.0.1:6100]
+"""
+import click
+from extensions import db
+
+
+def register_commands(app):
+    @app.cli.command('init-db')
+    def init_db_command():
+        """Create tables, add missing columns/indexes, build the search index and seed data"""
+        from common.schema import init_database
+
+        added = init_database()
+        click.echo(f"Database initialized ({len(added)} columns added)")
+
+    @app.cli.command('rebuild-search-index')
+    def rebuild_search_index_command():
+        """Create and re-populate the document full-text search index"""
+        from document.search_index import create_search_index, rebuild_search_index
+
+        create_search_index(db.engine)
+        indexed = rebuild_search_index(db.engine)
+        click.echo(f"Search index rebuilt ({indexed} documents indexed)")
+
+    @app.cli.command('backfill-khasra-keys')
+    @click.option('--batch-size', default=1000, show_default=True)
+    def backfill_khasra_keys_command(batch_size):
+        """Re-extract missing land record fields, canonicalize place names and recompute khasra keys"""
+        from models import Document, LandParcel, DisputedLand
+        from document.rag_document_processor import extract_land_record_fields, normalize_khasra
+        from common.place_names import set_document_places
+
+        for model in (Document, LandParcel, DisputedLand):
+            updated = 0
+            last_id = None
+            while True:
+                query = model.query.order_by(model.id)
+                if last_id is not None:
+                    query = query.filter(model.id > last_id)
+                rows = query.limit(batch_size).all()
+                if not rows:
+                    break
+                for row in rows:
+                    if model is Document and not row.khasra_number and row.ocr_text:
+                        fields = extract_land_record_fields(row.ocr_text, row.translated_text)
+                        row.khasra_number = fields['khasra_number']
+                        row.mauza = row.mauza or fields['mauza']
+                        row.tehsil = row.tehsil or fields['tehsil']
+                        row.district = row.district or fields['district']
+                        row.farmer_name = row.farmer_name or fields['owner_name']
+                    if model is Document and not (row.district_raw or row.tehsil_raw or row.mauza_raw):
+                        # Places stored as read (Urdu/Hindi) before canonical names existed
+                        set_document_places(row, row.district, row.tehsil, row.mauza)
+                    key = normalize_khasra(row.khasra_number)
+                    if row.khasra_normalized != key:
+                        row.khasra_normalized = key
+                        updated += 1
+                db.session.commit()
+                last_id = rows[-1].id
+            click.echo(f"{model.__tablename__}: {updated} khasra keys updated")
+
+    @app.cli.command('backfill-map-fields')
+    @click.option('--batch-size', default=1000, show_default=True)
+    def backfill_map_fields_command(batch_size):
+        """Recompute geohash and claimants_count for disputed lands"""
+        from models import DisputedLand
+        from common.geohash import encode as encode_geohash
+
+        updated = 0
+        last_id = None
+        while True:
+            query = DisputedLand.query.order_by(DisputedLand.id)
+            if last_id is not None:
+                query = query.filter(DisputedLand.id > last_id)
+            rows = query.limit(batch_size).all()
+            if not rows:
+                break
+            for row in rows:
+                geohash = encode_geohash(row.latitude, row.longitude)
+                claimants_count = len(row.claimants) if row.claimants else 0
+                if row.geohash != geohash or row.claimants_count != claimants_count:
+                    row.geohash = geohash
+                    row.claimants_count = claimants_count
+                    updated += 1
+            db.session.commit()
+            last_id = rows[-1].id
+        click.echo(f"disputed_lands: {updated} rows updated")
+
+    @app.cli.command('rebuild-dispute-summary')
+    @click.option('--check', is_flag=True, help='Only report facets that disagree with disputed_lands')
+    def rebuild_dispute_summary_command(check):
+        """Backfill or verify the dispute_facets summary table"""
+        from common import dispute_summary
+
+        if check:
+            mismatches = dispute_summary.check_consistency()
+            for key, stored, expected in mismatches:
+                click.echo(f"{'/'.join(key)}: stored={stored} expected={expected}")
+            click.echo(f"{len(mismatches)} inconsistent facets")
+            if mismatches:
+                raise SystemExit(1)
+            return
+
+        written = dispute_summary.rebuild()
+        click.echo(f"Dispute summary rebuilt ({written} facets)")
+
+    @app.cli.command('rebuild-claimant-index')
+    def rebuild_claimant_index_command():
+        """Re-populate the dispute_claimants name index from disputed_lands"""
+        from common import claimant_index
+
+        indexed = claimant_index.rebuild()
+        db.session.commit()
+        click.echo(f"Claimant index rebuilt ({indexed} claimants indexed)")
+
+    @app.cli.command('rebuild-farmer-keys')
+    def rebuild_farmer_keys_command():
+        """Re-populate the farmer_match_keys blocking index from farmers"""
+        from common import farmer_matching
+
+        written = farmer_matching.rebuild()
+        db.session.commit()
+        click.echo(f"Farmer match keys rebuilt ({written} keys)")
+
+    @app.cli.command('dedup-farmers')
+    @click.option('--out', required=True, type=click.Path(dir_okay=False), help='NDJSON file, one duplicate group per line')
+    @click.option('--threshold', default=0.9, show_default=True, type=float)
+    @click.option('--tehsil', default=None, help='Only this tehsil')
+    def dedup_farmers_command(out, threshold, tehsil):
+        """Find groups of likely duplicate farmers (report only, nothing is merged)"""
+        import json
+        from common import farmer_matching
+
+        groups = 0
+        farmers = 0
+        with open(out, 'w', encoding='utf-8') as f:
+            for tehsil_key, group in farmer_matching.find_duplicates(threshold=threshold, tehsil=tehsil):
+                f.write(json.dumps({
+                    'tehsil': tehsil_key,
+                    'farmers': [{
+                        'id': str(farmer['id']),
+                        'name_local': farmer['name_local'],
+                        'name_english': farmer['name_english'],
+                        'father_name': farmer['father_name'],
+                        'district': farmer['district'],
+                        'score': round(score, 3)
+                    } for farmer, score in group]
+                }, ensure_ascii=False) + '\n')
+                groups += 1
+                farmers += len(group)
+        click.echo(f"{groups} duplicate groups ({farmers} farmers) written to {out}")
+
+    @app.cli.command('export-documents')
+    @click.option('--format', 'fmt', type=click.Choice(['ndjson', 'parquet']), default='ndjson', show_default=True)
+    @click.option('--out', required=True, help='Output file path')
+    @click.option('--since', help='Only documents created on/after this ISO date')
+    @click.option('--until', help='Only documents created before this ISO date')
+    @click.option('--district')
+    @click.option('--status', default='processed', show_default=True)
+    @click.option('--after', help='Resume cursor printed by a previous export')
+    def export_documents_command(fmt, out, since, until, district, status, after):
+        """Stream the document corpus to NDJSON or Parquet"""
+        from document.corpus_export import iter_chunks, write_parquet
+        import json
+
+        filters = dict(since=since, until=until, district=district, status=status, after=after)
+        if fmt == 'parquet':
+            written, last_cursor = write_parquet(db.session, out, **filters)
+        else:
+            written, last_cursor = 0, None
+            with open(out, 'a' if after else 'w', encoding='utf-8') as f:
+                for rows in iter_chunks(db.session, **filters):
+                    f.writelines(json.dumps(row, ensure_ascii=False) + '\n' for row in rows)
+                    written += len(rows)
+                    last_cursor = rows[-1]['cursor']
+        click.echo(f"Exported {written} documents to {out}")
+        if last_cursor:
+            click.echo(f"Resume cursor: {last_cursor}")
+
+    @app.cli.command('translation-service')
+    @click.option('--address', default=None, help='host:port or unix socket path [TRANSLATION_SERVICE_ADDRESS]')
+    @click.option('--replicas', default=None, type=int, help='Model processes [TRANSLATION_REPLICAS]')
+    @click.option('--queue-size', default=None, type=int, help='Queued + running batches [TRANSLATION_QUEUE_SIZE]')
+    def translation_service_command(address, replicas, queue_size):
+        """Run the translation model replicas that Flask workers send segments to"""
+        from translation import worker_pool
+
+        address = address or worker_pool.SERVICE_ADDRESS
+        if not address:
+            raise click.UsageError('Pass --address or set TRANSLATION_SERVICE_ADDRESS')
+        try:
+            service = worker_pool.TranslationService(
+                address,
+                replicas=replicas or worker_pool.REPLICAS,
+                queue_size=queue_size or worker_pool.QUEUE_SIZE
+            )
+        except ValueError as e:
+            raise click.UsageError(str(e))
+        click.echo(f"Starting {service.replicas} translation replicas on {address}")
+        service.serve_forever()
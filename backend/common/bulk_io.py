@@ -0,0 +1,317 @@
+"""
+Streaming bulk import/export for disputed lands, land parcels and farmers
+
+Import reads CSV or NDJSON row by row, validates each row against the model's
+columns, and inserts valid rows in batches with a single executemany per
+batch (SQLAlchemy groups these into multi-row INSERTs). A failing batch is
+retried row by row so that every bad row gets its own error.
+
+Export streams rows with yield_per, which uses a server-side cursor on
+PostgreSQL, so memory stays flat regardless of table size.
+"""
+import csv
+import io
+import json
+import uuid
+from collections import Counter
+from datetime import date, datetime
+from types import SimpleNamespace
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, JSON, String, Uuid, select
+from sqlalchemy.exc import SQLAlchemyError
+from extensions import db
+from models import DisputedLand, Farmer, LandParcel, derived_values, generate_uuid
+
+BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+# Columns computed by derived_values() or managed by the database layer
+_SYSTEM_COLUMNS = {'khasra_normalized', 'geohash', 'claimants_count', 'created_at', 'updated_at'}
+
+ENTITIES = {
+    'disputed-lands': {
+        'model': DisputedLand,
+        'defaults': {'dispute_status': 'under_review', 'partition_impact': False, 'claimants': []},
+    },
+    'land-parcels': {
+        'model': LandParcel,
+        'defaults': {},
+    },
+    'farmers': {
+        'model': Farmer,
+        'defaults': {},
+        'require_any': ('name_local', 'name_english'),
+        # Filled by transliteration when missing: {column: source column}
+        'transliterate': {'name_english': 'name_local'},
+    },
+}
+
+
+class BulkImportError(ValueError):
+    """Raised for request-level import problems (unknown entity, bad format)"""
+
+
+def get_entity(name):
+    if name not in ENTITIES:
+        raise BulkImportError(f"Unknown entity '{name}'. Supported: {', '.join(ENTITIES)}")
+    return ENTITIES[name]
+
+
+def importable_columns(model):
+    return [c for c in model.__table__.columns if c.name not in _SYSTEM_COLUMNS]
+
+
+def _parse_value(column, raw):
+    """Convert a raw CSV/JSON value to the column's Python type (raises ValueError)"""
+    if raw is None or (isinstance(raw, str) and raw.strip() == ''):
+        return None
+    column_type = column.type
+
+    if isinstance(column_type, JSON):
+        value = json.loads(raw) if isinstance(raw, str) else raw
+        if not isinstance(value, (list, dict)):
+            raise ValueError("expected a JSON list or object")
+        return value
+    if isinstance(column_type, Boolean):
+        if isinstance(raw, bool):
+            return raw
+        lowered = str(raw).strip().lower()
+        if lowered in ('true', '1', 'yes', 'y'):
+            return True
+        if lowered in ('false', '0', 'no', 'n'):
+            return False
+        raise ValueError("expected true/false")
+    if isinstance(column_type, Integer):
+        return int(raw)
+    if isinstance(column_type, Float):
+        return float(raw)
+    if isinstance(column_type, DateTime):
+        return datetime.fromisoformat(str(raw).strip())
+    if isinstance(column_type, Date):
+        return datetime.strptime(str(raw).strip(), '%Y-%m-%d').date()
+    if isinstance(column_type, Uuid):
+        return uuid.UUID(str(raw).strip())
+
+    value = str(raw).strip()
+    if isinstance(column_type, String) and column_type.length and len(value) > column_type.length:
+        raise ValueError(f"longer than {column_type.length} characters")
+    return value
+
+
+def validate_row(entity, raw):
+    """
+    Validate one input row
+
+    Returns:
+        (values, errors) - values is a dict ready for insert when errors is empty
+    """
+    model = entity['model']
+    values = {}
+    errors = []
+
+    for column in importable_columns(model):
+        if column.name not in raw:
+            continue
+        try:
+            values[column.name] = _parse_value(column, raw[column.name])
+        except (ValueError, TypeError) as e:
+            errors.append(f"{column.name}: {e}")
+
+    for name, default in entity['defaults'].items():
+        if values.get(name) is None:
+            values[name] = default
+
+    for column in importable_columns(model):
+        if not column.nullable and not column.primary_key and values.get(column.name) is None:
+            errors.append(f"{column.name}: required")
+
+    require_any = entity.get('require_any')
+    if require_any and not any(values.get(name) for name in require_any):
+        errors.append(f"one of {', '.join(require_any)} is required")
+
+    if model is DisputedLand:
+        if values.get('claimants') is not None and not isinstance(values['claimants'], list):
+            errors.append("claimants: expected a JSON list")
+        for name, low, high in (('latitude', -90, 90), ('longitude', -180, 180)):
+            if values.get(name) is not None and not low <= values[name] <= high:
+                errors.append(f"{name}: out of range")
+
+    if errors:
+        return None, errors
+
+    values['id'] = values.get('id') or generate_uuid()
+    now = datetime.utcnow()
+    values.setdefault('created_at', now)
+    if 'updated_at' in model.__table__.columns:
+        values['updated_at'] = now
+    values.update(derived_values(model, values.get))
+    return values, []
+
+
+def iter_records(stream, fmt):
+    """Yield (line_number, row_dict or None, parse_error or None) from a binary stream"""
+    text_stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+    if fmt == 'csv':
+        reader = csv.DictReader(text_stream)
+        for row in reader:
+            yield reader.line_num, row, None
+    elif fmt == 'ndjson':
+        for line_number, line in enumerate(text_stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield line_number, None, f"invalid JSON: {e}"
+                continue
+            if not isinstance(row, dict):
+                yield line_number, None, "expected a JSON object"
+                continue
+            yield line_number, row, None
+    else:
+        raise BulkImportError("format must be 'csv' or 'ndjson'")
+
+
+def _after_insert(model, rows):
+    """Keep derived tables in sync for rows inserted outside the ORM (caller commits)"""
+    from common import data_version
+    data_version.mark_changed()
+    if model is Farmer:
+        from common import farmer_matching
+        farmer_matching.index_rows(db.session.connection(), rows)
+    if model is DisputedLand:
+        from common import claimant_index, dispute_summary
+        claimant_index.index_rows(db.session.connection(), rows)
+        deltas = Counter()
+        for row in rows:
+            deltas.update(dispute_summary.facet_keys(SimpleNamespace(**{
+                'dispute_type': None, 'district': None, 'tehsil': None, **row
+            })))
+        dispute_summary.apply_deltas(deltas)
+
+
+def _fill_transliterations(entity, batch):
+    """Fill empty Latin name columns from the local-script ones, one batch call per column"""
+    from translation.transliterator import transliterate_batch
+    for target, source in entity.get('transliterate', {}).items():
+        length = entity['model'].__table__.columns[target].type.length
+        rows = [values for _, values in batch if not values.get(target) and values.get(source)]
+        for values, latin in zip(rows, transliterate_batch([values[source] for values in rows], 'auto', 'latin')):
+            values[target] = latin[:length]
+
+
+def _insert_batch(model, batch, report):
+    """Insert (line_number, values) pairs; on failure retry row by row to isolate bad rows"""
+    table = model.__table__
+    rows = [values for _, values in batch]
+    try:
+        db.session.execute(table.insert(), rows)
+        _after_insert(model, rows)
+        db.session.commit()
+        report['inserted'] += len(rows)
+        return
+    except SQLAlchemyError:
+        db.session.rollback()
+
+    for line_number, values in batch:
+        try:
+            db.session.execute(table.insert(), [values])
+            _after_insert(model, [values])
+            db.session.commit()
+            report['inserted'] += 1
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            _add_error(report, line_number, [str(getattr(e, 'orig', e))])
+
+
+def _add_error(report, line_number, errors):
+    report['failed'] += 1
+    if len(report['errors']) < MAX_REPORTED_ERRORS:
+        report['errors'].append({'line': line_number, 'errors': errors})
+
+
+def import_records(entity_name, stream, fmt, dry_run=False, batch_size=BATCH_SIZE):
+    """
+    Stream-import rows for an entity
+
+    Returns:
+        report dict with inserted/failed counts and per-row errors
+    """
+    entity = get_entity(entity_name)
+    model = entity['model']
+    report = {'entity': entity_name, 'inserted': 0, 'failed': 0, 'valid': 0, 'errors': [], 'dry_run': dry_run}
+    batch = []
+
+    for line_number, raw, parse_error in iter_records(stream, fmt):
+        if parse_error:
+            _add_error(report, line_number, [parse_error])
+            continue
+        values, errors = validate_row(entity, raw)
+        if errors:
+            _add_error(report, line_number, errors)
+            continue
+        report['valid'] += 1
+        if dry_run:
+            continue
+        batch.append((line_number, values))
+        if len(batch) >= batch_size:
+            _fill_transliterations(entity, batch)
+            _insert_batch(model, batch, report)
+            batch = []
+
+    if batch:
+        _fill_transliterations(entity, batch)
+        _insert_batch(model, batch, report)
+
+    report['errors_truncated'] = report['failed'] > len(report['errors'])
+    return report
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def export_records(entity_name, fmt, filters=None, chunk_size=BATCH_SIZE):
+    """
+    Yield CSV or NDJSON text chunks for every row of an entity
+
+    Rows are fetched with yield_per (a server-side cursor on PostgreSQL) and
+    written out chunk by chunk, so memory use does not grow with table size.
+    """
+    entity = get_entity(entity_name)
+    table = entity['model'].__table__
+    if fmt not in ('csv', 'ndjson'):
+        raise BulkImportError("format must be 'csv' or 'ndjson'")
+
+    stmt = select(table)
+    for name, value in (filters or {}).items():
+        if value and name in table.columns:
+            stmt = stmt.where(table.columns[name] == value)
+    stmt = stmt.order_by(table.columns['id']).execution_options(yield_per=chunk_size)
+
+    columns = [c.name for c in table.columns]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == 'csv' else None
+    if writer:
+        writer.writerow(columns)
+
+    for partition in db.session.execute(stmt).mappings().partitions():
+        for row in partition:
+            if writer:
+                writer.writerow([
+                    json.dumps(row[c], ensure_ascii=False) if isinstance(row[c], (list, dict))
+                    else (row[c].isoformat() if isinstance(row[c], (date, datetime)) else row[c])
+                    for c in columns
+                ])
+            else:
+                buffer.write(json.dumps(dict(row), ensure_ascii=False, default=_json_default))
+                buffer.write('\n')
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    remaining = buffer.getvalue()
+    if remaining:
+        yield remaining
@@ -0,0 +1,186 @@
+"""
+Claimant name index (dispute_claimants table)
+
+DisputedLand.claimants is a JSON list, so each claimant is also stored as
+rows with its normalized name and phonetic key (common/name_matching.py),
+one row per word suffix ("muhammad yusuf", "yusuf") so that any name word
+can be matched as a prefix.
+Mapper events rewrite a dispute's rows whenever its claimants change; Core
+bulk inserts call index_rows() themselves.
+
+Searches use LIKE 'prefix%' on the two indexed columns, so they read an
+index range instead of scanning disputed_lands:
+- prefix: names starting with the query, in the same script or by phonetic
+  key across Urdu / Devanagari / Latin spellings
+- fuzzy: for each word of the query's phonetic key, the rows whose key
+  starts with that word, read as the nearest FUZZY_CANDIDATE_LIMIT rows
+  around the query in key order (so common words such as "mhmd" yield the
+  closest spellings, always the same ones), ranked by
+  name_matching.similarity()
+"""
+from sqlalchemy import delete, event, inspect, or_, select
+from extensions import db
+from models import DisputedLand, DisputeClaimant
+from common.name_matching import normalize_name, phonetic_key, similarity
+
+FUZZY_CANDIDATE_LIMIT = 2000
+PREFIX_CANDIDATES_PER_RESULT = 10
+DEFAULT_MIN_SCORE = 0.75
+
+_listeners_registered = False
+
+
+def claimant_rows(dispute_id, claimants):
+    """dispute_claimants rows for a dispute's claimants JSON (string entries are names)"""
+    rows = []
+    for position, claimant in enumerate(claimants or []):
+        if isinstance(claimant, str):
+            claimant = {'name': claimant}
+        if not isinstance(claimant, dict):
+            continue
+        name = str(claimant.get('name') or '').strip()
+        words = normalize_name(name).split()
+        for offset in range(len(words)):
+            suffix = ' '.join(words[offset:])
+            rows.append({
+                'dispute_id': dispute_id,
+                'position': position,
+                'word_offset': offset,
+                'name': name[:255],
+                'father_name': (str(claimant['father_name'])[:255] if claimant.get('father_name') else None),
+                'claim_type': (str(claimant['claim_type'])[:100] if claimant.get('claim_type') else None),
+                'name_normalized': suffix[:255],
+                'name_key': phonetic_key(suffix)[:255],
+            })
+    return rows
+
+
+def _best_per_claimant(scored, limit):
+    """Keep the best-scoring suffix row per (dispute, claimant), best first"""
+    best = {}
+    for item in scored:
+        claimant = item[0]
+        key = (claimant.dispute_id, claimant.position)
+        if key not in best or item[2] > best[key][2]:
+            best[key] = item
+    return sorted(best.values(), key=lambda item: item[2], reverse=True)[:limit]
+
+
+def index_rows(connection, disputes):
+    """Insert claimant rows for newly inserted disputes given as dicts with id and claimants"""
+    rows = [row for d in disputes for row in claimant_rows(d['id'], d.get('claimants'))]
+    if rows:
+        connection.execute(DisputeClaimant.__table__.insert(), rows)
+    return len(rows)
+
+
+def _sync(connection, dispute_id, claimants):
+    connection.execute(delete(DisputeClaimant.__table__).where(DisputeClaimant.__table__.c.dispute_id == dispute_id))
+    rows = claimant_rows(dispute_id, claimants)
+    if rows:
+        connection.execute(DisputeClaimant.__table__.insert(), rows)
+
+
+def register_claimant_listeners():
+    """Keep dispute_claimants in sync with ORM writes to DisputedLand"""
+    global _listeners_registered
+    if _listeners_registered:
+        return
+
+    @event.listens_for(DisputedLand, 'after_insert')
+    def _after_insert(mapper, connection, target):
+        _sync(connection, target.id, target.claimants)
+
+    @event.listens_for(DisputedLand, 'after_update')
+    def _after_update(mapper, connection, target):
+        if inspect(target).attrs.claimants.history.has_changes():
+            _sync(connection, target.id, target.claimants)
+
+    @event.listens_for(DisputedLand, 'before_delete')
+    def _before_delete(mapper, connection, target):
+        # Explicit because SQLite does not enforce ON DELETE CASCADE by default
+        _sync(connection, target.id, [])
+
+    _listeners_registered = True
+
+
+def rebuild(batch_size=1000):
+    """Re-populate dispute_claimants from disputed_lands (caller commits). Returns rows indexed."""
+    connection = db.session.connection()
+    connection.execute(delete(DisputeClaimant.__table__))
+    indexed = 0
+    last_id = None
+    while True:
+        query = select(DisputedLand.id, DisputedLand.claimants).order_by(DisputedLand.id).limit(batch_size)
+        if last_id is not None:
+            query = query.where(DisputedLand.id > last_id)
+        disputes = db.session.execute(query).mappings().all()
+        if not disputes:
+            break
+        indexed += index_rows(connection, disputes)
+        last_id = disputes[-1]['id']
+    return indexed
+
+
+def _like_prefix(value):
+    escaped = value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"{escaped}%"
+
+
+def search_claimants(q, mode='prefix', district=None, limit=20, min_score=DEFAULT_MIN_SCORE):
+    """
+    Search claimants by name
+
+    Returns:
+        list of (DisputeClaimant, DisputedLand summary row, score), best first
+    """
+    normalized = normalize_name(q)
+    key = phonetic_key(q)
+    if not normalized:
+        return []
+
+    query = db.session.query(
+        DisputeClaimant,
+        DisputedLand.khasra_number, DisputedLand.mauza, DisputedLand.tehsil,
+        DisputedLand.district, DisputedLand.dispute_type, DisputedLand.dispute_status
+    ).join(DisputedLand, DisputedLand.id == DisputeClaimant.dispute_id)
+    if district:
+        query = query.filter(DisputedLand.district == district)
+
+    if mode == 'prefix':
+        conditions = [DisputeClaimant.name_normalized.like(_like_prefix(normalized), escape='\\')]
+        if key:
+            conditions.append(DisputeClaimant.name_key.like(_like_prefix(key), escape='\\'))
+        rows = query.filter(or_(*conditions)).order_by(DisputeClaimant.name_normalized) \
+            .limit(limit * PREFIX_CANDIDATES_PER_RESULT).all()
+        return _best_per_claimant(
+            [(row[0], row, similarity(q, row[0].name_normalized, prefix=True)) for row in rows], limit
+        )
+
+    if mode != 'fuzzy':
+        raise ValueError("mode must be 'prefix' or 'fuzzy'")
+    if not key:
+        return []
+
+    # Block on each key word; read the rows nearest the query in key order
+    words = key.split()
+    offsets = [i for i, word in enumerate(words) if len(word) > 1] or [0]
+    per_side = max(1, FUZZY_CANDIDATE_LIMIT // (2 * len(offsets)))
+    rows = {}
+    for offset in offsets:
+        anchor = ' '.join(words[offset:])
+        block = query.filter(DisputeClaimant.name_key.like(_like_prefix(words[offset]), escape='\\'))
+        for row in (
+            block.filter(DisputeClaimant.name_key >= anchor)
+                .order_by(DisputeClaimant.name_key, DisputeClaimant.id).limit(per_side).all()
+            + block.filter(DisputeClaimant.name_key < anchor)
+                .order_by(DisputeClaimant.name_key.desc(), DisputeClaimant.id.desc()).limit(per_side).all()
+        ):
+            rows[row[0].id] = row
+
+    # A suffix row ("yusuf") stands for its whole name too ("muhammad yusuf")
+    scored = [
+        (row[0], row, max(similarity(q, row[0].name_normalized), similarity(q, normalize_name(row[0].name))))
+        for row in rows.values()
+    ]
+    return _best_per_claimant([item for item in scored if item[2] >= min_score], limit)
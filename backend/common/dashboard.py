@@ -0,0 +1,156 @@
+"""
+Dashboard statistics and the precomputed dashboard bundle
+
+The bundle (OCR stats, district progress, dispute stats) is stored in
+dashboard_snapshots together with the data version it was computed at.
+It is only recomputed when common/data_version reports a newer version.
+"""
+from datetime import datetime
+from sqlalchemy import case, func
+from sqlalchemy.exc import IntegrityError
+from extensions import db
+from models import DashboardSnapshot, DistrictTarget, Document, Farmer, LandParcel
+from common import data_version, dispute_summary
+
+SNAPSHOT_ID = 'dashboard'
+DEFAULT_DISTRICT_TARGET = 1000
+
+# Initial targets, seeded into district_targets when the table is empty
+DEFAULT_DISTRICT_TARGETS = {
+    'Srinagar': 5000,
+    'Jammu': 4500,
+    'Anantnag': 3000,
+    'Baramulla': 2500,
+    'Udhampur': 2000,
+    'Pulwama': 1500,
+    'Budgam': 1500,
+    'Kupwara': 1500
+}
+
+
+def seed_district_targets():
+    """Insert the default targets if no targets exist. Returns number inserted."""
+    if DistrictTarget.query.first():
+        return 0
+    db.session.add_all([
+        DistrictTarget(district=district, target_documents=target)
+        for district, target in DEFAULT_DISTRICT_TARGETS.items()
+    ])
+    db.session.commit()
+    return len(DEFAULT_DISTRICT_TARGETS)
+
+
+def _count_where(condition):
+    return func.sum(case((condition, 1), else_=0))
+
+
+def compute_ocr_stats():
+    """Document processing statistics (one aggregate query over documents)"""
+    processed = Document.processing_status == 'processed'
+    row = db.session.query(
+        _count_where(processed).label('processed'),
+        _count_where(Document.processing_status == 'failed').label('failed'),
+        _count_where(Document.processing_status == 'pending').label('pending'),
+        func.avg(case((processed, Document.processing_time_ms))).label('avg_time'),
+        func.avg(case((processed, Document.ocr_confidence))).label('avg_confidence'),
+        _count_where(Document.detected_language.in_(['ur', 'urd', 'urdu'])).label('urdu'),
+        _count_where(Document.detected_language.in_(['hi', 'hin', 'hindi'])).label('hindi'),
+        _count_where(Document.detected_language.in_(['en', 'eng', 'english'])).label('english')
+    ).one()
+
+    total_processed = int(row.processed or 0)
+    total_failed = int(row.failed or 0)
+    total_attempts = total_processed + total_failed
+    success_rate = (total_processed / total_attempts * 100) if total_attempts > 0 else 0
+
+    return {
+        "total_processed": total_processed,
+        "success_rate": round(success_rate, 1),
+        "avg_processing_time": round(row.avg_time / 1000, 2) if row.avg_time else 0,
+        "accuracy_rate": round(row.avg_confidence, 1) if row.avg_confidence else 0,
+        "farmers_registered": db.session.query(func.count(Farmer.id)).scalar() or 0,
+        "parcels_linked": db.session.query(func.count(LandParcel.id)).scalar() or 0,
+        "pending_records": int(row.pending or 0),
+        "language_distribution": {
+            "urdu": int(row.urdu or 0),
+            "hindi": int(row.hindi or 0),
+            "english": int(row.english or 0)
+        }
+    }
+
+
+def compute_district_progress():
+    """Processed documents per district against the district_targets table"""
+    district_stats = db.session.query(
+        Document.district,
+        func.count(Document.id).label('completed')
+    ).filter(
+        Document.processing_status == 'processed',
+        Document.district.isnot(None)
+    ).group_by(Document.district).all()
+
+    district_targets = {t.district: t.target_documents for t in DistrictTarget.query.all()}
+
+    progress = []
+    for dist, completed in district_stats:
+        total = district_targets.get(dist, DEFAULT_DISTRICT_TARGET)
+        progress.append({
+            'name': dist,
+            'total': total,
+            'completed': completed,
+            'percentage': round((completed / total) * 100, 1) if total > 0 else 0
+        })
+
+    # Add districts with no processed documents yet
+    processed_districts = {p['name'] for p in progress}
+    for dist, total in district_targets.items():
+        if dist not in processed_districts:
+            progress.append({
+                'name': dist,
+                'total': total,
+                'completed': 0,
+                'percentage': 0
+            })
+
+    # Sort by percentage descending
+    progress.sort(key=lambda x: x['percentage'], reverse=True)
+    return progress
+
+
+def compute_bundle():
+    return {
+        'ocr_stats': compute_ocr_stats(),
+        'district_progress': compute_district_progress(),
+        'dispute_stats': dispute_summary.get_stats()
+    }
+
+
+def get_bundle(version=None):
+    """
+    Dashboard bundle for the current data version, recomputed only if stale
+
+    Returns:
+        (version, payload, computed_at)
+    """
+    if version is None:
+        version = data_version.get_version()
+
+    snapshot = DashboardSnapshot.query.get(SNAPSHOT_ID)
+    if snapshot and snapshot.version == version:
+        return version, snapshot.payload, snapshot.computed_at
+
+    payload = compute_bundle()
+    computed_at = datetime.utcnow()
+    try:
+        if snapshot:
+            snapshot.version = version
+            snapshot.payload = payload
+            snapshot.computed_at = computed_at
+        else:
+            db.session.add(DashboardSnapshot(id=SNAPSHOT_ID, version=version,
+                                             payload=payload, computed_at=computed_at))
+        db.session.commit()
+    except IntegrityError:
+        # Another worker stored the snapshot first; ours is equally valid to return
+        db.session.rollback()
+    return version, payload, computed_at
@@ -0,0 +1,78 @@
+"""
+Data version counter for cache validation
+
+Any ORM flush that touches a dashboard-relevant model marks the session,
+and the 'dashboard' version is bumped with a single upsert on the session's
+own connection just before it commits. The counter row is therefore locked
+only for the commit itself, not for the whole writer transaction, and the
+new version becomes visible atomically with the data it describes.
+Readers compare the version against a cached snapshot or a client ETag
+with a single primary-key read.
+Core bulk writes bypass the flush events and call mark_changed() directly.
+"""
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from common import upsert
+from extensions import db
+from models import DataVersion, Document, Farmer, LandParcel, DisputedLand, DistrictTarget
+
+DASHBOARD_SCOPE = 'dashboard'
+PENDING_KEY = 'data_version_scopes'  # session.info key of scopes to bump on commit
+
+TRACKED_MODELS = (Document, Farmer, LandParcel, DisputedLand, DistrictTarget)
+
+_listener_registered = False
+
+
+def get_version(scope=DASHBOARD_SCOPE):
+    version = db.session.query(DataVersion.version).filter(DataVersion.scope == scope).scalar()
+    return version or 0
+
+
+def bump(scope=DASHBOARD_SCOPE, connection=None):
+    """Increment a scope's version inside the current transaction"""
+    upsert.increment(connection or db.session.connection(), DataVersion.__table__, ['scope'],
+                     [{'scope': scope, 'version': 1}], column='version')
+
+
+def mark_changed(session=None, scope=DASHBOARD_SCOPE):
+    """Bump a scope's version once the session's transaction commits"""
+    (session or db.session).info.setdefault(PENDING_KEY, set()).add(scope)
+
+
+def _touches_tracked_models(session):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, TRACKED_MODELS) and (obj in session.new or obj in session.deleted
+                                                 or session.is_modified(obj)):
+            return True
+    return False
+
+
+def register_version_listener():
+    """Bump the dashboard version in every commit that wrote tracked models"""
+    global _listener_registered
+    if _listener_registered:
+        return
+
+    @event.listens_for(Session, 'before_flush')
+    def _before_flush(session, flush_context, instances):
+        if _touches_tracked_models(session):
+            mark_changed(session)
+
+    @event.listens_for(Session, 'before_commit')
+    def _before_commit(session):
+        if session.in_nested_transaction():
+            return  # the outermost commit bumps
+        # before_commit runs ahead of the final flush; flush now so its writes are counted
+        session.flush()
+        scopes = session.info.pop(PENDING_KEY, None)
+        if scopes:
+            connection = session.connection()
+            for scope in sorted(scopes):
+                bump(scope, connection)
+
+    @event.listens_for(Session, 'after_rollback')
+    def _after_rollback(session):
+        session.info.pop(PENDING_KEY, None)
+
+    _listener_registered = True
@@ -0,0 +1,91 @@
+"""
+Read-replica routing for the SQLAlchemy session
+
+When REPLICA_DATABASE_URL is set it is registered as the 'replica' bind.
+Views decorated with @read_only send their queries to the replica pool;
+everything else goes to the primary. Within a read-only view, any flush or
+INSERT/UPDATE/DELETE goes to the primary and pins the rest of the request
+to it as well.
+
+Read-your-writes across requests: a request that wrote sets a short-lived
+cookie (REPLICA_STICKY_SECONDS) so the same client reads from the primary
+until the replica has caught up. Clients that do not send cookies can ask
+for the primary explicitly with an `X-Read-Primary: 1` header.
+
+Without a replica configured all of this is a no-op.
+"""
+import time
+from functools import wraps
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+REPLICA_BIND = 'replica'
+PRIMARY_UNTIL_COOKIE = 'db_primary_until'
+READ_PRIMARY_HEADER = 'X-Read-Primary'
+
+
+class RoutingSession(Session):
+    """db.session class that routes reads of @read_only views to the replica bind"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if getattr(clause, 'is_dml', False):
+                _mark_write(self)
+            elif _use_replica(self):
+                engine = self._db.engines.get(REPLICA_BIND)
+                if engine is not None:
+                    return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _use_replica(session):
+    return (
+        has_request_context()
+        and g.get('db_read_only', False)
+        and not session.info.get('wrote_primary', False)
+    )
+
+
+def _mark_write(session):
+    session.info['wrote_primary'] = True
+    if has_request_context():
+        g.db_wrote = True
+
+
+@event.listens_for(RoutingSession, 'before_flush')
+def _before_flush(session, flush_context, instances):
+    _mark_write(session)
+
+
+def replica_configured():
+    return REPLICA_BIND in current_app.config.get('SQLALCHEMY_BINDS', {})
+
+
+def _client_needs_primary():
+    if request.headers.get(READ_PRIMARY_HEADER) == '1':
+        return True
+    try:
+        return float(request.cookies.get(PRIMARY_UNTIL_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def read_only(view):
+    """Serve this view's queries from the replica (when configured)"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.db_read_only = replica_configured() and not _client_needs_primary()
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def init_app(app):
+    """Set the read-your-writes cookie on responses to requests that wrote"""
+    @app.after_request
+    def _stick_to_primary(response):
+        if g.get('db_wrote') and replica_configured():
+            seconds = app.config.get('REPLICA_STICKY_SECONDS', 5)
+            response.set_cookie(PRIMARY_UNTIL_COOKIE, str(int(time.time() + seconds)),
+                                max_age=seconds, httponly=True, samesite='Lax')
+        return response
@@ -0,0 +1,141 @@
+"""
+Incrementally maintained dispute summary (dispute_facets table)
+
+Each disputed land contributes +1 to a fixed set of facet rows: the total,
+its type, status, district, (district, tehsil) and partition flag. The
+create/update/delete handlers apply the difference between a record's old
+and new facet keys in the same transaction as the record change, so the
+stats and facet endpoints are single indexed reads.
+"""
+from collections import Counter
+from sqlalchemy import func
+from common import upsert
+from extensions import db
+from models import DisputedLand, DisputeFacet
+
+TOTAL = ('total', '', '')
+
+
+def facet_keys(land):
+    """Facet keys (dimension, parent, value) a disputed land counts towards"""
+    keys = [
+        TOTAL,
+        ('type', '', land.dispute_type or ''),
+        ('status', '', land.dispute_status or ''),
+        ('district', '', land.district or ''),
+        ('tehsil', land.district or '', land.tehsil or ''),
+    ]
+    if land.partition_impact:
+        keys.append(('partition', '', 'true'))
+    return keys
+
+
+def apply_deltas(deltas):
+    """Add count deltas {key: delta} to the facet table in one upsert (caller commits)"""
+    rows = [
+        {'dimension': dimension, 'parent': parent, 'value': value, 'count': delta}
+        for (dimension, parent, value), delta in sorted(deltas.items()) if delta
+    ]
+    upsert.increment(db.session.connection(), DisputeFacet.__table__, ['dimension', 'parent', 'value'], rows)
+
+
+def record_change(old_keys, new_keys):
+    """Apply the facet difference between a record's old and new state (caller commits)"""
+    deltas = Counter(new_keys)
+    deltas.subtract(Counter(old_keys))
+    apply_deltas(deltas)
+
+
+def _label(value):
+    return value or 'unknown'
+
+
+def get_stats():
+    """Dispute statistics from the summary table in a single query"""
+    facets = DisputeFacet.query.filter(
+        DisputeFacet.dimension.in_(['total', 'type', 'status', 'district', 'partition']),
+        DisputeFacet.count > 0
+    ).all()
+
+    stats = {
+        'total_disputes': 0,
+        'by_type': {},
+        'by_status': {},
+        'by_district': {},
+        'partition_affected': 0
+    }
+    for facet in facets:
+        if facet.dimension == 'total':
+            stats['total_disputes'] = facet.count
+        elif facet.dimension == 'partition':
+            stats['partition_affected'] = facet.count
+        else:
+            stats[f'by_{facet.dimension}'][_label(facet.value)] = facet.count
+    return stats
+
+
+def get_districts():
+    rows = db.session.query(DisputeFacet.value).filter(
+        DisputeFacet.dimension == 'district',
+        DisputeFacet.value != '',
+        DisputeFacet.count > 0
+    ).order_by(DisputeFacet.value).all()
+    return [r[0] for r in rows]
+
+
+def get_tehsils(district=None):
+    query = db.session.query(DisputeFacet.value).filter(
+        DisputeFacet.dimension == 'tehsil',
+        DisputeFacet.value != '',
+        DisputeFacet.count > 0
+    )
+    if district:
+        query = query.filter(DisputeFacet.parent == district)
+    return sorted({r[0] for r in query.all()})
+
+
+def compute_facets():
+    """Recompute all facet counts from disputed_lands with GROUP BY scans"""
+    counts = Counter()
+    counts[TOTAL] = db.session.query(func.count(DisputedLand.id)).scalar() or 0
+
+    for dimension, column in (('type', DisputedLand.dispute_type),
+                              ('status', DisputedLand.dispute_status),
+                              ('district', DisputedLand.district)):
+        for value, count in db.session.query(column, func.count(DisputedLand.id)).group_by(column).all():
+            counts[(dimension, '', value or '')] += count
+
+    tehsil_rows = db.session.query(
+        DisputedLand.district, DisputedLand.tehsil, func.count(DisputedLand.id)
+    ).group_by(DisputedLand.district, DisputedLand.tehsil).all()
+    for district, tehsil, count in tehsil_rows:
+        counts[('tehsil', district or '', tehsil or '')] += count
+
+    partition = db.session.query(func.count(DisputedLand.id)).filter(DisputedLand.partition_impact.is_(True)).scalar()
+    if partition:
+        counts[('partition', '', 'true')] = partition
+
+    return counts
+
+
+def check_consistency():
+    """Return [(key, stored, expected)] for every facet that disagrees with disputed_lands"""
+    expected = compute_facets()
+    stored = {(f.dimension, f.parent, f.value): f.count for f in DisputeFacet.query.all()}
+    mismatches = []
+    for key in set(expected) | set(stored):
+        if expected.get(key, 0) != stored.get(key, 0):
+            mismatches.append((key, stored.get(key, 0), expected.get(key, 0)))
+    return sorted(mismatches)
+
+
+def rebuild():
+    """Replace the summary table contents with freshly computed counts. Returns facet rows written."""
+    counts = compute_facets()
+    DisputeFacet.query.delete()
+    db.session.add_all([
+        DisputeFacet(dimension=dimension, parent=parent, value=value, count=count)
+        for (dimension, parent, value), count in counts.items() if count
+    ])
+    db.session.commit()
+    return len(counts)
@@ -0,0 +1,407 @@
+"""
+Fuzzy farmer matching: blocking keys + vectorized similarity scoring
+
+Blocking: every farmer gets one farmer_match_keys row per phonetic name word
+(common/name_matching.phonetic_key) within its tehsil, so candidates for a
+name are the farmers sharing at least one name word key - an indexed lookup
+instead of a comparison against every farmer. Words such as "mhmd", "glm"
+or "sng" are shared by much of a tehsil; a key held by more than
+MAX_BLOCK_SIZE farmers is a stop-key and does not form a block on its own.
+Lookups then rely on the other words of the name, or on farmers sharing
+all of its common words, and bulk deduplication blocks on pairs of
+stop-keys, falling back to a sorted neighbourhood (each farmer against the
+NEIGHBOURHOOD next ones in phonetic order) for blocks that are still too
+large.
+
+Scoring: names are embedded as L2-normalized hashed character-trigram
+vectors (numpy), both as written and as phonetic keys, so a whole candidate
+block is scored with a few matrix products. Father names, when both sides
+have one, contribute a quarter of the score.
+
+find_matches() backs the matching API; find_duplicates() runs the same
+scorer over the pairs of each tehsil's blocks for bulk deduplication,
+scoring a pair sharing several keys once. numpy is imported on first use,
+so importing the app does not pay for it.
+"""
+import zlib
+from collections import Counter, defaultdict
+from functools import lru_cache
+from itertools import combinations
+from sqlalchemy import delete, event, inspect, or_, select
+from extensions import db
+from models import Farmer, FarmerMatchKey
+from common.name_matching import KEY_MATCH_WEIGHT, normalize_name, phonetic_key
+
+VECTOR_DIM = 256
+FATHER_WEIGHT = 0.25
+DUPLICATE_THRESHOLD = 0.9
+MAX_CANDIDATES = 500  # pre-ranked by number of shared name keys
+MAX_BLOCK_SIZE = 1000  # farmers per key and tehsil beyond which a key is a stop-key
+NEIGHBOURHOOD = 20
+PAIR_CHUNK = 8192
+
+_MATCH_FIELDS = ('name_local', 'name_english', 'father_name')
+
+_listeners_registered = False
+
+
+def tehsil_key(tehsil):
+    return normalize_name(tehsil)[:100]
+
+
+def block_keys(name_local=None, name_english=None):
+    """Distinct phonetic word keys of a farmer's names (single letters are too common to block on)"""
+    keys = set()
+    for name in (name_local, name_english):
+        keys.update(word for word in phonetic_key(name).split() if len(word) > 1)
+    return sorted(keys)
+
+
+def key_rows(farmer_id, name_local, name_english, tehsil):
+    tk = tehsil_key(tehsil)
+    return [
+        {'farmer_id': farmer_id, 'tehsil_key': tk, 'block_key': key[:64]}
+        for key in block_keys(name_local, name_english)
+    ]
+
+
+def index_rows(connection, farmers):
+    """Insert blocking keys for newly inserted farmers given as dicts"""
+    rows = [
+        row for f in farmers
+        for row in key_rows(f['id'], f.get('name_local'), f.get('name_english'), f.get('tehsil'))
+    ]
+    if rows:
+        connection.execute(FarmerMatchKey.__table__.insert(), rows)
+    return len(rows)
+
+
+def _sync(connection, farmer, delete_only=False):
+    table = FarmerMatchKey.__table__
+    connection.execute(delete(table).where(table.c.farmer_id == farmer.id))
+    if not delete_only:
+        rows = key_rows(farmer.id, farmer.name_local, farmer.name_english, farmer.tehsil)
+        if rows:
+            connection.execute(table.insert(), rows)
+
+
+def register_farmer_listeners():
+    """Keep farmer_match_keys in sync with ORM writes to Farmer"""
+    global _listeners_registered
+    if _listeners_registered:
+        return
+
+    @event.listens_for(Farmer, 'after_insert')
+    def _after_insert(mapper, connection, target):
+        _sync(connection, target)
+
+    @event.listens_for(Farmer, 'after_update')
+    def _after_update(mapper, connection, target):
+        state = inspect(target)
+        if any(state.attrs[name].history.has_changes() for name in ('name_local', 'name_english', 'tehsil')):
+            _sync(connection, target)
+
+    @event.listens_for(Farmer, 'before_delete')
+    def _before_delete(mapper, connection, target):
+        _sync(connection, target, delete_only=True)
+
+    _listeners_registered = True
+
+
+def rebuild(batch_size=5000):
+    """Re-populate farmer_match_keys (caller commits). Returns keys written."""
+    connection = db.session.connection()
+    connection.execute(delete(FarmerMatchKey.__table__))
+    written = 0
+    last_id = None
+    while True:
+        query = select(Farmer.id, Farmer.name_local, Farmer.name_english, Farmer.tehsil) \
+            .order_by(Farmer.id).limit(batch_size)
+        if last_id is not None:
+            query = query.where(Farmer.id > last_id)
+        farmers = db.session.execute(query).mappings().all()
+        if not farmers:
+            break
+        written += index_rows(connection, farmers)
+        last_id = farmers[-1]['id']
+    return written
+
+
+@lru_cache(maxsize=65536)
+def _trigram_buckets(text):
+    padded = f"  {text} "
+    return tuple(zlib.crc32(padded[j:j + 3].encode('utf-8')) % VECTOR_DIM for j in range(len(padded) - 2))
+
+
+def vectorize(texts):
+    """(len(texts), VECTOR_DIM) float32 matrix of L2-normalized hashed character trigrams"""
+    import numpy as np
+
+    rows, cols = [], []
+    for i, text in enumerate(texts):
+        if text:
+            buckets = _trigram_buckets(text)
+            rows.extend([i] * len(buckets))
+            cols.extend(buckets)
+    matrix = np.zeros((len(texts), VECTOR_DIM), dtype=np.float32)
+    if rows:
+        np.add.at(matrix, (np.array(rows), np.array(cols)), 1.0)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def features(records):
+    """Trigram matrices for a list of dicts with name_local/name_english/father_name"""
+    import numpy as np
+
+    local = [normalize_name(r.get('name_local')) for r in records]
+    english = [normalize_name(r.get('name_english')) for r in records]
+    father = [normalize_name(r.get('father_name')) for r in records]
+    return {
+        'local': vectorize(local),
+        'english': vectorize(english),
+        # Script-independent key: compares a local-only farmer with an English-only one
+        'key': vectorize([phonetic_key(l or e) for l, e in zip(local, english)]),
+        'father': vectorize(father),
+        'father_key': vectorize([phonetic_key(f) for f in father]),
+        'has_father': np.array([bool(f) for f in father]),
+    }
+
+
+def pairwise_scores(a, b):
+    """(len(a), len(b)) match scores in 0..1 between two feature sets"""
+    import numpy as np
+
+    name = np.maximum.reduce([
+        a['local'] @ b['local'].T,
+        a['english'] @ b['english'].T,
+        KEY_MATCH_WEIGHT * (a['key'] @ b['key'].T),
+    ])
+    father = np.maximum(a['father'] @ b['father'].T, KEY_MATCH_WEIGHT * (a['father_key'] @ b['father_key'].T))
+    both = np.outer(a['has_father'], b['has_father'])
+    return np.where(both, (1 - FATHER_WEIGHT) * name + FATHER_WEIGHT * father, name)
+
+
+def pair_scores(feats, rows_a, rows_b):
+    """Match scores of the pairs (rows_a[k], rows_b[k]) of one feature set"""
+    import numpy as np
+
+    def dot(name):
+        return np.einsum('ij,ij->i', feats[name][rows_a], feats[name][rows_b])
+
+    name = np.maximum.reduce([dot('local'), dot('english'), KEY_MATCH_WEIGHT * dot('key')])
+    father = np.maximum(dot('father'), KEY_MATCH_WEIGHT * dot('father_key'))
+    both = feats['has_father'][rows_a] & feats['has_father'][rows_b]
+    return np.where(both, (1 - FATHER_WEIGHT) * name + FATHER_WEIGHT * father, name)
+
+
+def _key_query(key, tehsil):
+    query = select(FarmerMatchKey.farmer_id).where(FarmerMatchKey.block_key == key)
+    if tehsil:
+        query = query.where(FarmerMatchKey.tehsil_key == tehsil_key(tehsil))
+    return query
+
+
+def _candidate_ids(keys, tehsil=None):
+    """
+    Farmers sharing the most name keys with the query
+
+    At most MAX_BLOCK_SIZE + 1 rows are read per key; a key with more is a
+    stop-key. Candidates come from the other keys, ranked by keys shared,
+    or - when every key is a stop-key - are farmers holding all of them.
+    """
+    shared = Counter()
+    stop_keys = []
+    for key in keys:
+        farmer_ids = db.session.execute(_key_query(key, tehsil).limit(MAX_BLOCK_SIZE + 1)).scalars().all()
+        if len(farmer_ids) > MAX_BLOCK_SIZE:
+            stop_keys.append(key)
+        else:
+            shared.update(farmer_ids)
+    if shared or not stop_keys:
+        return [farmer_id for farmer_id, _ in shared.most_common(MAX_CANDIDATES)]
+
+    # Only common words ("Muhammad Ghulam"): farmers holding all of them, bounded
+    query = _key_query(stop_keys[0], tehsil)
+    for key in stop_keys[1:]:
+        query = query.where(FarmerMatchKey.farmer_id.in_(_key_query(key, tehsil)))
+    return db.session.execute(query.limit(MAX_CANDIDATES)).scalars().all()
+
+
+def find_matches(name, father_name=None, tehsil=None, district=None, limit=10, min_score=0.6):
+    """
+    Top candidate farmers for a (possibly OCR'd) name
+
+    Returns:
+        list of (Farmer, score), best first
+    """
+    keys = block_keys(name)
+    if not keys:
+        return []
+    candidate_ids = _candidate_ids(keys, tehsil)
+    if not candidate_ids:
+        return []
+
+    query = db.session.query(Farmer.id, *(getattr(Farmer, field) for field in _MATCH_FIELDS)) \
+        .filter(Farmer.id.in_(candidate_ids))
+    if district:
+        query = query.filter(Farmer.district == district)
+    candidates = [row._asdict() for row in query.all()]
+    if not candidates:
+        return []
+
+    import numpy as np
+
+    target = features([{'name_local': name, 'name_english': name, 'father_name': father_name}])
+    scores = pairwise_scores(target, features(candidates))[0]
+
+    top = [i for i in np.argsort(-scores)[:limit] if scores[i] >= min_score]
+    farmers = {f.id: f for f in Farmer.query.filter(Farmer.id.in_([candidates[i]['id'] for i in top])).all()}
+    return [(farmers[candidates[i]['id']], float(scores[i])) for i in top]
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, item):
+        self.parent.setdefault(item, item)
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a, b):
+        self.parent[self.find(a)] = self.find(b)
+
+
+def _blocks(farmers):
+    """
+    {block key: member indices} of one tehsil's farmers
+
+    Name words held by more than MAX_BLOCK_SIZE farmers (stop-keys) only
+    block in pairs ("glm mhmd"); a farmer whose only word is a stop-key
+    stays in that word's block, which is then compared by neighbourhood.
+    """
+    keys = [block_keys(f['name_local'], f['name_english']) for f in farmers]
+    frequency = Counter(key for farmer_keys in keys for key in farmer_keys)
+    blocks = defaultdict(list)
+    for index, farmer_keys in enumerate(keys):
+        common = [key for key in farmer_keys if frequency[key] > MAX_BLOCK_SIZE]
+        own = [key for key in farmer_keys if frequency[key] <= MAX_BLOCK_SIZE]
+        own += [f"{a} {b}" for a, b in combinations(common, 2)]
+        for key in own or common:
+            blocks[key].append(index)
+    return {key: members for key, members in blocks.items() if len(members) > 1}
+
+
+_NO_BLOCK = 2 ** 31 - 1
+
+
+def _first_shared(member_blocks, rows_a, rows_b):
+    """Lowest exhaustive block id shared by each pair (_NO_BLOCK if none)"""
+    import numpy as np
+
+    a, b = member_blocks[rows_a], member_blocks[rows_b]
+    shared = ((a[:, :, None] == b[:, None, :]) & (a[:, :, None] >= 0)).any(axis=2)
+    return np.where(shared, a, _NO_BLOCK).min(axis=1)
+
+
+def _duplicate_pairs(farmers, threshold):
+    """
+    Pairs (i, j, score) of one tehsil's farmers scoring >= threshold, each pair scored once
+
+    Blocks of up to MAX_BLOCK_SIZE farmers are compared exhaustively with one
+    matrix product each, and a pair is only taken from the first such block
+    it shares. Larger blocks only compare each farmer with its NEIGHBOURHOOD
+    successors in phonetic order; those pairs are deduplicated, and pairs
+    already covered by an exhaustive block dropped, before scoring.
+    """
+    import numpy as np
+
+    blocks = _blocks(farmers)
+    exhaustive = sorted(key for key, members in blocks.items() if len(members) <= MAX_BLOCK_SIZE)
+    farmer_blocks = [[] for _ in farmers]
+    for block_id, key in enumerate(exhaustive):
+        for member in blocks[key]:
+            farmer_blocks[member].append(block_id)
+    member_blocks = np.full((len(farmers), max(map(len, farmer_blocks), default=0) or 1), -1, dtype=np.int64)
+    for index, block_ids in enumerate(farmer_blocks):
+        member_blocks[index, :len(block_ids)] = block_ids
+
+    for block_id, key in enumerate(exhaustive):
+        # One matrix product per block is cheaper than gathering its pairs
+        members = np.array(blocks[key])
+        feats = features([farmers[m] for m in members])
+        scores = pairwise_scores(feats, feats)
+        a, b = np.nonzero(np.triu(scores >= threshold, 1))
+        keep = _first_shared(member_blocks, members[a], members[b]) == block_id
+        for i, j in zip(a[keep], b[keep]):
+            yield int(members[i]), int(members[j]), float(scores[i, j])
+
+    order_keys = [phonetic_key(normalize_name(f['name_local']) or normalize_name(f['name_english'])) for f in farmers]
+    neighbours = []
+    for key, members in blocks.items():
+        if len(members) <= MAX_BLOCK_SIZE:
+            continue
+        order = np.array(sorted(members, key=order_keys.__getitem__))
+        for distance in range(1, min(NEIGHBOURHOOD, len(order) - 1) + 1):
+            a, b = order[:-distance], order[distance:]
+            neighbours.append(np.stack([np.minimum(a, b), np.maximum(a, b)], axis=1))
+    if not neighbours:
+        return
+    pairs = np.unique(np.concatenate(neighbours), axis=0)
+    for start in range(0, len(pairs), PAIR_CHUNK):
+        chunk = pairs[start:start + PAIR_CHUNK]
+        chunk = chunk[_first_shared(member_blocks, chunk[:, 0], chunk[:, 1]) == _NO_BLOCK]
+        involved = np.unique(chunk)
+        feats = features([farmers[m] for m in involved])
+        scores = pair_scores(feats, np.searchsorted(involved, chunk[:, 0]), np.searchsorted(involved, chunk[:, 1]))
+        hits = scores >= threshold
+        for (i, j), score in zip(chunk[hits], scores[hits]):
+            yield int(i), int(j), float(score)
+
+
+def _tehsil_duplicates(farmers, threshold):
+    groups = _UnionFind()
+    best = {}
+    for a, b, score in _duplicate_pairs(farmers, threshold):
+        groups.union(a, b)
+        best[a] = max(best.get(a, 0), score)
+        best[b] = max(best.get(b, 0), score)
+
+    clusters = defaultdict(list)
+    for index in list(groups.parent):
+        clusters[groups.find(index)].append(index)
+    for members in clusters.values():
+        if len(members) > 1:
+            yield [(farmers[m], best[m]) for m in sorted(members)]
+
+
+def find_duplicates(threshold=DUPLICATE_THRESHOLD, tehsil=None):
+    """
+    Yield groups of likely duplicate farmers, one tehsil at a time
+
+    Only one tehsil's farmers are held in memory, and pairs are only scored
+    within blocks that share a name key (see _duplicate_pairs), so the job
+    scales with the number of farmers rather than the square of it.
+
+    Yields:
+        (tehsil, [(farmer dict, best pair score), ...])
+    """
+    # Group spelling variants of a tehsil ("Budgam", "budgam ") the same way the key table does
+    by_key = defaultdict(list)
+    for (value,) in db.session.query(Farmer.tehsil).distinct().all():
+        by_key[tehsil_key(value)].append(value)
+    keys = [tehsil_key(tehsil)] if tehsil is not None else sorted(by_key)
+
+    columns = (Farmer.id, Farmer.name_local, Farmer.name_english, Farmer.father_name, Farmer.tehsil, Farmer.district)
+    for key in keys:
+        values = by_key.get(key, [])
+        conditions = [Farmer.tehsil.in_([v for v in values if v is not None])]
+        if None in values:
+            conditions.append(Farmer.tehsil.is_(None))
+        farmers = [dict(row) for row in db.session.execute(select(*columns).where(or_(*conditions))).mappings()]
+        for group in _tehsil_duplicates(farmers, threshold):
+            yield key, group
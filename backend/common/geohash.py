@@ -0,0 +1,71 @@
+"""
+Geohash encoding for map clustering
+
+Disputed lands store a precision-9 geohash; prefixes of it group nearby points
+into grid cells, so clustering at a given zoom level is a GROUP BY on a
+prefix of an indexed column.
+"""
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+GEOHASH_PRECISION = 9
+MAX_CLUSTER_PRECISION = 8
+
+
+def encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Encode a coordinate as a geohash string, or None if either value is missing"""
+    if latitude is None or longitude is None:
+        return None
+
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(chars) < precision:
+        if even:
+            mid = (lon_range[0] + lon_range[1]) / 2
+            if longitude >= mid:
+                bits = (bits << 1) | 1
+                lon_range[0] = mid
+            else:
+                bits <<= 1
+                lon_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= mid:
+                bits = (bits << 1) | 1
+                lat_range[0] = mid
+            else:
+                bits <<= 1
+                lat_range[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return ''.join(chars)
+
+
+def precision_for_zoom(zoom):
+    """Geohash prefix length giving a handful of cells per 256px map tile"""
+    return max(1, min(MAX_CLUSTER_PRECISION, (zoom + 3) // 2))
+
+
+def parse_bbox(value):
+    """
+    Parse "west,south,east,north" into floats
+
+    Raises:
+        ValueError if the value is malformed or out of range
+    """
+    parts = [float(p) for p in value.split(',')]
+    if len(parts) != 4:
+        raise ValueError("bbox must be west,south,east,north")
+    west, south, east, north = parts
+    if not (-180 <= west <= 180 and -180 <= east <= 180 and -90 <= south <= north <= 90):
+        raise ValueError("bbox out of range")
+    return west, south, east, north
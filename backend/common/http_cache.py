@@ -0,0 +1,47 @@
+"""
+HTTP conditional GET helpers (ETag / Last-Modified / Cache-Control)
+"""
+from flask import Response, current_app, jsonify, request
+from werkzeug.http import is_resource_modified
+
+
+def is_not_modified(etag, last_modified=None):
+    """
+    True if If-None-Match / If-Modified-Since show the client copy is current
+    (check before loading or building the payload)
+    """
+    if not etag and not last_modified:
+        return False
+    return not is_resource_modified(request.environ, etag=etag, last_modified=last_modified)
+
+
+def record_etag(kind, record_id, changed_at):
+    """Strong validator for a record that changes only when changed_at does"""
+    stamp = int(changed_at.timestamp() * 1000000) if changed_at else 0
+    return f"{kind}-{record_id}-{stamp}"
+
+
+def detail_cache_control():
+    """Cache-Control for rarely-changing record detail responses (browser/CDN revalidate with ETag)"""
+    max_age = current_app.config.get('DETAIL_CACHE_MAX_AGE', 60)
+    return f"public, max-age={max_age}, must-revalidate"
+
+
+def not_modified_response(etag, cache_control='no-cache'):
+    response = Response(status=304)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    return response
+
+
+def conditional_json(payload, etag, last_modified=None, cache_control='no-cache'):
+    """
+    JSON response with validators; answers 304 when If-None-Match or
+    If-Modified-Since shows the client copy is current
+    """
+    response = jsonify(payload)
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = cache_control
+    return response.make_conditional(request)
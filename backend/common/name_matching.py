@@ -0,0 +1,142 @@
+"""
+Name normalization and phonetic keys for matching people across scripts
+
+normalize_name() folds a name within its own script (case, diacritics,
+Arabic/Urdu letter variants, punctuation). phonetic_key() maps Urdu,
+Devanagari and Latin spellings to a shared consonant skeleton, so that
+"Muhammad Yusuf", "Mohammad Yousuf" and "محمد یوسف" get the same key.
+"""
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from functools import lru_cache
+
+# Arabic-script letter variants and diacritics folded before matching
+_ARABIC_FOLD = str.maketrans({
+    'ي': 'ی',  # ي arabic yeh -> ی
+    'ى': 'ی',  # ى alef maksura -> ی
+    'ك': 'ک',  # ك arabic kaf -> ک
+    'ه': 'ہ',  # ه heh -> ہ
+    'ة': 'ہ',  # ة teh marbuta -> ہ
+    'ۀ': 'ہ',  # ۀ -> ہ
+    'أ': 'ا',  # أ -> ا
+    'إ': 'ا',  # إ -> ا
+    'آ': 'ا',  # آ -> ا
+    'ٱ': 'ا',  # ٱ -> ا
+})
+_ARABIC_MARKS = re.compile('[\u0610-\u061A\u064B-\u065F\u0670\u06D6-\u06ED\u0640]')
+
+# Urdu letters -> Latin key letters ('' = dropped, vowels become 'a'; do-chashmi
+# aspiration is dropped like Latin 'bh'/'dh')
+_URDU_TO_LATIN = {
+    'ا': 'a', 'ب': 'b', 'پ': 'p', 'ت': 't', 'ٹ': 't', 'ث': 's', 'ج': 'j', 'چ': 'c',
+    'ح': 'h', 'خ': 'x', 'د': 'd', 'ڈ': 'd', 'ذ': 'z', 'ر': 'r', 'ڑ': 'r', 'ز': 'z',
+    'ژ': 'z', 'س': 's', 'ش': 's', 'ص': 's', 'ض': 'z', 'ط': 't', 'ظ': 'z', 'ع': 'a',
+    'غ': 'g', 'ف': 'f', 'ق': 'k', 'ک': 'k', 'گ': 'g', 'ل': 'l', 'م': 'm', 'ن': 'n',
+    'ں': 'n', 'و': 'v', 'ؤ': 'v', 'ہ': 'h', 'ھ': '', 'ی': 'y', 'ے': 'y', 'ۓ': 'y',
+    'ئ': 'y', 'ء': '',
+}
+
+# Devanagari consonants -> Latin key letters; vowel signs are dropped
+_DEVANAGARI_TO_LATIN = {
+    'क': 'k', 'ख': 'x', 'ग': 'g', 'घ': 'g', 'ङ': 'n', 'च': 'c', 'छ': 'c', 'ज': 'j',
+    'झ': 'j', 'ञ': 'n', 'ट': 't', 'ठ': 't', 'ड': 'd', 'ढ': 'd', 'ण': 'n', 'त': 't',
+    'थ': 't', 'द': 'd', 'ध': 'd', 'न': 'n', 'प': 'p', 'फ': 'f', 'ब': 'b', 'भ': 'b',
+    'म': 'm', 'य': 'y', 'र': 'r', 'ल': 'l', 'व': 'v', 'श': 's', 'ष': 's', 'स': 's',
+    'ह': 'h', 'ं': 'n', 'ँ': 'n',
+    'अ': 'a', 'आ': 'a', 'इ': 'a', 'ई': 'a', 'उ': 'a', 'ऊ': 'a', 'ए': 'a', 'ऐ': 'a',
+    'ओ': 'a', 'औ': 'a',
+}
+_DEVANAGARI_NUKTA = {'क': 'k', 'ख': 'x', 'ग': 'g', 'ज': 'z', 'फ': 'f', 'ड': 'r', 'ढ': 'r'}
+
+# Latin spellings -> key letters (longest first)
+_LATIN_DIGRAPHS = (
+    ('kh', 'x'), ('gh', 'g'), ('ph', 'f'), ('sh', 's'), ('ch', 'c'), ('th', 't'),
+    ('dh', 'd'), ('bh', 'b'), ('jh', 'j'), ('ck', 'k'), ('q', 'k'), ('w', 'v'), ('c', 'k'),
+)
+_LATIN_DIGRAPH_RE = re.compile('|'.join(src for src, _ in _LATIN_DIGRAPHS))
+_LATIN_DIGRAPH_MAP = dict(_LATIN_DIGRAPHS)
+
+KEY_MATCH_WEIGHT = 0.9
+
+_VOWELS = set('aeiou')
+_SEMIVOWELS = set('vy')  # kept only at the start of a word (often written as vowels)
+
+
+# Names repeat heavily (Muhammad, Ghulam, Bhat ...), so results are memoized
+@lru_cache(maxsize=65536)
+def normalize_name(name):
+    """Case/diacritic/variant-folded name in its original script"""
+    if not name:
+        return ''
+    text = unicodedata.normalize('NFKC', str(name)).casefold()
+    text = _ARABIC_MARKS.sub('', text.translate(_ARABIC_FOLD))
+    if not text.isascii():
+        # Strip Latin accents (é -> e) without touching Indic combining marks
+        text = ''.join(
+            c for c in unicodedata.normalize('NFD', text)
+            if not (unicodedata.combining(c) and ord(c) < 0x0370)
+        )
+        text = unicodedata.normalize('NFC', text)
+    # Punctuation, symbols and digits separate words; letters and combining marks stay
+    text = ''.join(' ' if unicodedata.category(c)[0] in 'PSNZC' else c for c in text)
+    return ' '.join(text.split())
+
+
+def _romanize_word(word):
+    out = []
+    i = 0
+    while i < len(word):
+        char = word[i]
+        if char in _DEVANAGARI_TO_LATIN or char in _DEVANAGARI_NUKTA:
+            if i + 1 < len(word) and word[i + 1] == '़' and char in _DEVANAGARI_NUKTA:
+                out.append(_DEVANAGARI_NUKTA[char])
+                i += 2
+                continue
+            out.append(_DEVANAGARI_TO_LATIN.get(char, ''))
+        elif char in _URDU_TO_LATIN:
+            out.append(_URDU_TO_LATIN[char])
+        elif 'a' <= char <= 'z':
+            out.append(char)
+        i += 1
+    latin = ''.join(out)
+    return _LATIN_DIGRAPH_RE.sub(lambda m: _LATIN_DIGRAPH_MAP[m.group(0)], latin)
+
+
+def _skeleton(word):
+    key = []
+    for i, char in enumerate(word):
+        if char in _VOWELS:
+            continue
+        if char in _SEMIVOWELS and i > 0:
+            continue
+        if key and key[-1] == char:
+            continue
+        key.append(char)
+    return ''.join(key)
+
+
+@lru_cache(maxsize=65536)
+def phonetic_key(name):
+    """Script-independent consonant skeleton, one group per word"""
+    words = (_skeleton(_romanize_word(w)) for w in normalize_name(name).split())
+    return ' '.join(w for w in words if w)
+
+
+def similarity(query, name, prefix=False):
+    """
+    0..1 score between a query and a stored name, compared in-script and by key
+
+    With prefix=True only the leading part of the name (as long as the query)
+    is compared, for search-as-you-type.
+    """
+    normalized_q, normalized_n = normalize_name(query), normalize_name(name)
+    key_q, key_n = phonetic_key(query), phonetic_key(name)
+    if prefix:
+        normalized_n = normalized_n[:len(normalized_q)]
+        key_n = key_n[:len(key_q)]
+    score = SequenceMatcher(None, normalized_q, normalized_n).ratio()
+    if key_q and key_n:
+        # Same-spelling matches rank above matches that only sound alike
+        score = max(score, KEY_MATCH_WEIGHT * SequenceMatcher(None, key_q, key_n).ratio())
+    return score
@@ -0,0 +1,98 @@
+"""
+Canonical English place names for district/tehsil/mauza values read by OCR
+
+Land records name places in Urdu or Hindi script ("ضلع سرینگر"), while
+parcels, disputes and district targets use English names ("Srinagar"), and
+those columns are compared across tables (/district-progress, /lookup).
+Documents keep the values as read in district_raw/tehsil_raw/mauza_raw and
+store a canonical name in district/tehsil/mauza:
+
+- Latin values are kept as they are.
+- Other scripts are matched phonetically (and by their Latin transliteration)
+  against known English names: the districts of Jammu & Kashmir and the
+  district targets for districts, and the parcels and disputes filed under
+  the same khasra key for all three (the rows /lookup would join them with).
+- Without a match close enough, the Latin transliteration is stored.
+"""
+from sqlalchemy import select, union
+from common.name_matching import similarity
+from extensions import db
+
+MATCH_THRESHOLD = 0.7
+
+DISTRICTS = (
+    'Anantnag', 'Bandipora', 'Baramulla', 'Budgam', 'Doda', 'Ganderbal', 'Jammu', 'Kathua',
+    'Kishtwar', 'Kulgam', 'Kupwara', 'Poonch', 'Pulwama', 'Rajouri', 'Ramban', 'Reasi',
+    'Samba', 'Shopian', 'Srinagar', 'Udhampur',
+)
+
+FIELDS = ('district', 'tehsil', 'mauza')
+
+
+def _is_latin(value):
+    return all(ord(c) < 0x250 for c in value)
+
+
+def closest_name(value, names):
+    """
+    Canonical spelling of a place name among known names
+
+    Returns:
+        The best known name scoring at least MATCH_THRESHOLD, else the
+        Latin transliteration of value
+    """
+    from translation.transliterator import transliterate
+
+    latin = transliterate(value, 'auto', 'latin')
+    best, best_score = None, MATCH_THRESHOLD
+    for name in set(names):
+        score = max(similarity(value, name), similarity(latin, name))
+        if score >= best_score:
+            best, best_score = name, score
+    return best or latin
+
+
+def _known_places(khasra_key):
+    """{field: names} from district targets and the parcels/disputes under a khasra key"""
+    from models import DisputedLand, DistrictTarget, LandParcel
+
+    known = {'district': list(DISTRICTS), 'tehsil': [], 'mauza': []}
+    with db.session.no_autoflush:  # the document being filled in may be pending
+        known['district'].extend(db.session.execute(select(DistrictTarget.district)).scalars())
+        rows = db.session.execute(union(*(
+            select(model.district, model.tehsil, model.mauza).where(model.khasra_normalized == khasra_key)
+            for model in (LandParcel, DisputedLand)
+        ))).all() if khasra_key else []
+    for row in rows:
+        for field, value in zip(FIELDS, row):
+            if value:
+                known[field].append(value)
+    return known
+
+
+def canonical_places(district=None, tehsil=None, mauza=None, khasra_key=None):
+    """
+    Canonical district/tehsil/mauza for values as read from a record
+
+    Returns:
+        {'district': ..., 'tehsil': ..., 'mauza': ...} (None stays None)
+    """
+    values = {'district': district, 'tehsil': tehsil, 'mauza': mauza}
+    values = {field: value.strip() if value else None for field, value in values.items()}
+    if all(not value or _is_latin(value) for value in values.values()):
+        return values
+
+    known = _known_places(khasra_key)
+    return {
+        field: closest_name(value, known[field]) if value and not _is_latin(value) else value
+        for field, value in values.items()
+    }
+
+
+def set_document_places(doc, district=None, tehsil=None, mauza=None):
+    """Store places as read in the *_raw columns and their canonical names in the compared ones"""
+    from document.rag_document_processor import normalize_khasra
+
+    doc.district_raw, doc.tehsil_raw, doc.mauza_raw = district, tehsil, mauza
+    places = canonical_places(district, tehsil, mauza, normalize_khasra(doc.khasra_number))
+    doc.district, doc.tehsil, doc.mauza = places['district'], places['tehsil'], places['mauza']
@@ -0,0 +1,104 @@
+"""
+Lightweight schema upkeep for deployments without a migration tool
+
+db.create_all() only creates missing tables. add_missing_columns() also adds
+columns and indexes that were introduced on existing tables after they were
+first created. New columns are always added as nullable.
+
+init_database() runs all of this plus the search index and seed data. It is
+invoked by `flask init-db` (deploy step) and only at app startup when
+AUTO_CREATE_SCHEMA is enabled, so cold starts do no schema work.
+"""
+import logging
+from sqlalchemy import String, Uuid, inspect, text
+
+logger = logging.getLogger(__name__)
+
+
+def add_missing_columns(engine, metadata):
+    """Add model columns/indexes missing from existing tables. Returns added column names."""
+    inspector = inspect(engine)
+    added = []
+    with engine.begin() as conn:
+        for table in metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c['name'] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+                added.append(f"{table.name}.{column.name}")
+                logger.info(f"Added column {table.name}.{column.name}")
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+    return added
+
+
+def convert_uuid_columns(engine, metadata):
+    """
+    Migrate id columns created as String(36) to the Uuid type's storage
+
+    PostgreSQL columns are altered to the native uuid type; elsewhere Uuid is
+    stored as 32 hex characters, so dashed values are rewritten in place.
+    Existing ids keep their values (old UUID4 ids stay valid, new rows get
+    time-ordered UUID7s). Returns the converted column names.
+    """
+    inspector = inspect(engine)
+    converted = []
+    with engine.begin() as conn:
+        for table in metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c['name']: c['type'] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if not isinstance(column.type, Uuid) or column.name not in existing:
+                    continue
+                if engine.dialect.name == 'postgresql':
+                    if not isinstance(existing[column.name], String):
+                        continue
+                    conn.execute(text(
+                        f'ALTER TABLE {table.name} ALTER COLUMN {column.name} '
+                        f'TYPE uuid USING {column.name}::uuid'
+                    ))
+                else:
+                    result = conn.execute(text(
+                        f"UPDATE {table.name} SET {column.name} = replace({column.name}, '-', '') "
+                        f"WHERE {column.name} LIKE '%-%'"
+                    ))
+                    if not result.rowcount:
+                        continue
+                converted.append(f"{table.name}.{column.name}")
+                logger.info(f"Converted {table.name}.{column.name} to uuid storage")
+    return converted
+
+
+def init_database():
+    """Create/upgrade tables, the search index and seed data (needs an app context)"""
+    from extensions import db
+    from models import DisputedLand, DisputeClaimant, DisputeFacet, Farmer, FarmerMatchKey
+    from document.search_index import create_search_index
+    from common import claimant_index, dispute_summary, farmer_matching
+    from common.dashboard import seed_district_targets
+
+    # Existing String(36) ids become uuid first: create_all() then adds new
+    # tables (dispute_claimants, farmer_match_keys) whose uuid foreign keys
+    # PostgreSQL would reject against a VARCHAR(36) primary key
+    convert_uuid_columns(db.engine, db.metadata)
+    db.create_all()
+    added = add_missing_columns(db.engine, db.metadata)
+    create_search_index(db.engine)
+
+    # Backfill the dispute summary table the first time it exists
+    if not DisputeFacet.query.first() and DisputedLand.query.first():
+        dispute_summary.rebuild()
+    if not DisputeClaimant.query.first() and DisputedLand.query.first():
+        claimant_index.rebuild()
+        db.session.commit()
+    if not FarmerMatchKey.query.first() and Farmer.query.first():
+        farmer_matching.rebuild()
+        db.session.commit()
+
+    seed_district_targets()
+    return added
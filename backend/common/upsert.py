@@ -0,0 +1,39 @@
+"""
+INSERT ... ON CONFLICT DO UPDATE for the supported databases
+
+Counters that many writers touch (dispute facets, data versions) are
+upserted in one statement instead of UPDATE, then INSERT in a SAVEPOINT,
+then UPDATE again on a conflict. PostgreSQL and SQLite 3.24+ both accept it.
+"""
+from sqlalchemy.dialects import postgresql, sqlite
+
+_INSERTS = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+
+
+def insert(connection, table):
+    """
+    Dialect insert() construct with on_conflict_do_update() for the connection's database
+
+    Raises:
+        NotImplementedError for databases without INSERT ... ON CONFLICT
+    """
+    try:
+        return _INSERTS[connection.dialect.name](table)
+    except KeyError:
+        raise NotImplementedError(f"Upserts are not supported for dialect {connection.dialect.name}")
+
+
+def increment(connection, table, key_columns, rows, column='count'):
+    """
+    Insert rows, or add their `column` value to the existing row with the same key
+
+    Args:
+        rows: Dicts with the key columns and the amount to add; keys must be unique
+    """
+    if not rows:
+        return
+    stmt = insert(connection, table).values(rows)
+    connection.execute(stmt.on_conflict_do_update(
+        index_elements=key_columns,
+        set_={column: table.c[column] + stmt.excluded[column]}
+    ))
@@ -22,6 +22,12 @@ class Config:
         'pool_pre_ping': True,
     }
     
+    # Optional read replica: @read_only routes query it, writes stay on the primary
+    REPLICA_DATABASE_URL = os.environ.get('REPLICA_DATABASE_URL')
+    SQLALCHEMY_BINDS = {'replica': REPLICA_DATABASE_URL} if REPLICA_DATABASE_URL else {}
+    # Seconds a client reads from the primary after writing (replication lag allowance)
+    REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 5))
+    
     # Supabase Client Configuration (Optional for Auth/Storage)
     SUPABASE_URL = os.environ.get('SUPABASE_URL')
     SUPABASE_KEY = os.environ.get('SUPABASE_KEY')
@@ -38,12 +44,18 @@ class Config:
     # AI4Bharat (Optional for translation)
     AI4BHARAT_CACHE_DIR = os.environ.get('AI4BHARAT_CACHE_DIR', './models/ai4bharat')
     AI4BHARAT_DEVICE = os.environ.get('AI4BHARAT_DEVICE', 'auto')
+    # Load the translation model at startup instead of on the first request
+    # (gunicorn.conf.py does it in the master before forking workers)
+    TRANSLATION_WARMUP = os.environ.get('TRANSLATION_WARMUP', 'false').lower() == 'true'
     
     # File Upload
     MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))  # 16MB default
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER', './uploads')
     ALLOWED_EXTENSIONS = {'pdf', 'png', 'jpg', 'jpeg', 'gif', 'tiff', 'bmp'}
     
+    # HTTP caching for record detail endpoints (seconds a browser/CDN may reuse a response)
+    DETAIL_CACHE_MAX_AGE = int(os.environ.get('DETAIL_CACHE_MAX_AGE', 60))
+    
     # CORS - Production should use specific origins
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', 'http://localhost:5173').split(',')
     
@@ -52,6 +64,12 @@ class Config:
     DEBUG = ENV == 'development'
     TESTING = False
     
+    # Create/upgrade the schema on every app start (development convenience).
+    # Production runs `flask --app app init-db` once per deploy instead.
+    AUTO_CREATE_SCHEMA = os.environ.get(
+        'AUTO_CREATE_SCHEMA', 'true' if ENV == 'development' else 'false'
+    ).lower() == 'true'
+    
     # Logging
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
 
@@ -0,0 +1,132 @@
+"""
+Streaming export of the processed document corpus (NDJSON or Parquet)
+
+Rows are read in id order with yield_per, which uses a server-side cursor
+on PostgreSQL, and written out one chunk at a time. Ids are UUIDv7, so this
+is also creation order for everything but rows migrated from string ids.
+Every exported row carries an opaque `cursor`; passing the last one seen
+back as `after` resumes the export right after that row. The cursor holds
+the id alone, so rows without a created_at cannot be skipped.
+"""
+import base64
+import json
+import uuid
+from datetime import datetime
+from sqlalchemy import select
+from models import Document
+
+CHUNK_SIZE = 500
+
+EXPORT_COLUMNS = (
+    'id', 'filename', 'file_type', 'detected_language', 'ocr_confidence',
+    'processing_status', 'processing_time_ms', 'khasra_number', 'farmer_name',
+    'mauza', 'tehsil', 'district', 'ocr_text', 'translated_text',
+    'processed_at', 'created_at',
+)
+
+
+def encode_cursor(doc_id):
+    return base64.urlsafe_b64encode(str(doc_id).encode('ascii')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """
+    Raises:
+        ValueError if the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        return uuid.UUID(raw.rsplit('|', 1)[-1])  # older cursors were "created_at|id"
+    except Exception:
+        raise ValueError("Invalid export cursor")
+
+
+def _parse_date(value, name):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an ISO date or datetime")
+
+
+def build_query(since=None, until=None, district=None, status=None, after=None):
+    """Select statement for the export, ordered for keyset resumption"""
+    columns = [getattr(Document, name) for name in EXPORT_COLUMNS]
+    stmt = select(*columns)
+
+    since = _parse_date(since, 'since')
+    until = _parse_date(until, 'until')
+    if since:
+        stmt = stmt.where(Document.created_at >= since)
+    if until:
+        stmt = stmt.where(Document.created_at < until)
+    if district:
+        stmt = stmt.where(Document.district == district)
+    if status:
+        stmt = stmt.where(Document.processing_status == status)
+    if after:
+        stmt = stmt.where(Document.id > decode_cursor(after))
+
+    return stmt.order_by(Document.id)
+
+
+def iter_chunks(session, chunk_size=CHUNK_SIZE, limit=None, **filters):
+    """Yield lists of export row dicts, chunk_size rows at a time"""
+    stmt = build_query(**filters)
+    if limit:
+        stmt = stmt.limit(limit)
+    result = session.execute(stmt.execution_options(yield_per=chunk_size))
+    for partition in result.mappings().partitions():
+        rows = []
+        for row in partition:
+            record = dict(row)
+            record['cursor'] = encode_cursor(row['id'])
+            record['id'] = str(record['id'])
+            for name in ('processed_at', 'created_at'):
+                if record[name]:
+                    record[name] = record[name].isoformat()
+            rows.append(record)
+        yield rows
+
+
+def iter_ndjson(session, **kwargs):
+    """Yield NDJSON text, one chunk of rows per item"""
+    for rows in iter_chunks(session, **kwargs):
+        yield ''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in rows)
+
+
+def write_parquet(session, path, **kwargs):
+    """
+    Write the export to a Parquet file, one row group per chunk
+
+    Returns:
+        (rows_written, last_cursor)
+
+    Raises:
+        RuntimeError if pyarrow is not installed
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+
+    schema = pa.schema([
+        ('id', pa.string()), ('filename', pa.string()), ('file_type', pa.string()),
+        ('detected_language', pa.string()), ('ocr_confidence', pa.float64()),
+        ('processing_status', pa.string()), ('processing_time_ms', pa.int64()),
+        ('khasra_number', pa.string()), ('farmer_name', pa.string()), ('mauza', pa.string()),
+        ('tehsil', pa.string()), ('district', pa.string()), ('ocr_text', pa.string()),
+        ('translated_text', pa.string()), ('processed_at', pa.string()),
+        ('created_at', pa.string()), ('cursor', pa.string()),
+    ])
+
+    written = 0
+    last_cursor = None
+    with pq.ParquetWriter(path, schema, compression='zstd') as writer:
+        for rows in iter_chunks(session, **kwargs):
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            written += len(rows)
+            last_cursor = rows[-1]['cursor']
+    return written, last_cursor
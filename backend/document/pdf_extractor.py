@@ -0,0 +1,129 @@
+"""
+Parallel PDF text extraction with OCR fallback for scanned pages
+
+Pages are extracted in chunks of CHUNK_PAGES across a process pool of
+PDF_EXTRACT_WORKERS processes; each process opens the file itself, since
+PyMuPDF documents cannot be shared between processes. The pool is created
+on the first large PDF and then shared by every request of this (web
+worker) process, so uploads pay no interpreter startup and concurrent
+uploads never run more than PDF_EXTRACT_WORKERS extraction processes per
+web worker. PDFs of up to PDF_EXTRACT_PARALLEL_MIN_PAGES pages are
+extracted in the request's own thread. A page whose text
+layer has fewer than PDF_MIN_TEXT_CHARS characters is treated as scanned:
+it is rendered at PDF_OCR_DPI and sent to Google Vision in the same worker.
+Mixed digital/scanned PDFs are therefore handled in one pass.
+
+Results come back in page order, with only a few chunks in flight at a
+time, so a consumer that is slower than extraction (translation) does not
+make the whole document pile up in memory.
+"""
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+EXTRACT_WORKERS = int(os.environ.get('PDF_EXTRACT_WORKERS', min(4, os.cpu_count() or 1)))
+CHUNK_PAGES = int(os.environ.get('PDF_EXTRACT_CHUNK_PAGES', 4))
+PARALLEL_MIN_PAGES = int(os.environ.get('PDF_EXTRACT_PARALLEL_MIN_PAGES', 16))
+MIN_TEXT_CHARS = int(os.environ.get('PDF_MIN_TEXT_CHARS', 10))
+OCR_FALLBACK = os.environ.get('PDF_OCR_FALLBACK', 'true').lower() in ('1', 'true', 'yes')
+OCR_DPI = int(os.environ.get('PDF_OCR_DPI', 300))
+OCR_LANGUAGE_HINTS = ['ur', 'hi', 'en', 'pa']
+
+
+def page_count(path):
+    import fitz  # PyMuPDF for PDF parsing (imported on first use)
+
+    with fitz.open(path) as doc:
+        return len(doc)
+
+
+def _ocr_page(page, dpi):
+    from ocr.google_vision_ocr import process_with_vision_api
+
+    image_bytes = page.get_pixmap(dpi=dpi).tobytes('png')
+    return process_with_vision_api(image_bytes, OCR_LANGUAGE_HINTS)
+
+
+def _extract_chunk(path, start, stop, ocr, dpi):
+    """
+    Extract pages [start, stop) of a PDF (runs in a pool process)
+
+    Returns:
+        list of {'page', 'text', 'source': 'text' | 'ocr' | 'empty',
+                 'confidence', 'error'}
+    """
+    import fitz
+
+    results = []
+    with fitz.open(path) as doc:
+        for page_num in range(start, stop):
+            page = doc.load_page(page_num)
+            text = page.get_text("text")
+            result = {'page': page_num + 1, 'text': text, 'source': 'text', 'confidence': None, 'error': None}
+            if len(text.strip()) < MIN_TEXT_CHARS:
+                result['source'] = 'empty'
+                if ocr:
+                    try:
+                        ocr_result = _ocr_page(page, dpi)
+                        if ocr_result['text'].strip():
+                            result.update(text=ocr_result['text'], source='ocr',
+                                          confidence=ocr_result['confidence'])
+                    except Exception as e:
+                        result['error'] = f"OCR failed: {e}"
+            results.append(result)
+    return results
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    """The extraction pool of this process, created on first use"""
+    global _pool, _pool_pid
+    with _pool_lock:
+        # A forked child (gunicorn worker) must not use its parent's pool
+        if _pool is None or _pool_pid != os.getpid():
+            # spawn: no copy of the web worker's threads and sockets in the children
+            _pool = multiprocessing.get_context('spawn').Pool(EXTRACT_WORKERS)
+            _pool_pid = os.getpid()
+        return _pool
+
+
+@atexit.register
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.terminate()
+        _pool = None
+
+
+def extract_pages(path, ocr=OCR_FALLBACK, dpi=OCR_DPI, chunk_pages=CHUNK_PAGES):
+    """
+    Yield extracted pages of a PDF file in page order (see _extract_chunk)
+
+    Documents of up to PARALLEL_MIN_PAGES pages, or with PDF_EXTRACT_WORKERS=1,
+    are extracted in this process; larger ones on the shared pool.
+    """
+    total = page_count(path)
+    chunks = deque((start, min(start + chunk_pages, total)) for start in range(0, total, chunk_pages))
+    if EXTRACT_WORKERS <= 1 or total <= PARALLEL_MIN_PAGES or len(chunks) <= 1:
+        for start, stop in chunks:
+            yield from _extract_chunk(path, start, stop, ocr, dpi)
+        return
+
+    pool = _get_pool()
+    in_flight = deque()
+    while chunks or in_flight:
+        # A few chunks per request at a time, so one large PDF cannot hold
+        # the pool (or memory) while other uploads wait
+        while chunks and len(in_flight) < EXTRACT_WORKERS:
+            in_flight.append(pool.apply_async(_extract_chunk, (path, *chunks.popleft(), ocr, dpi)))
+        yield from in_flight.popleft().get()
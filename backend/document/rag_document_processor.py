@@ -1,5 +1,61 @@
 import re
 
+# Eastern Arabic (U+0660), Extended/Urdu (U+06F0) and Devanagari (U+0966) digits
+_DIGIT_TABLE = str.maketrans({
+    **{chr(0x0660 + i): str(i) for i in range(10)},
+    **{chr(0x06F0 + i): str(i) for i in range(10)},
+    **{chr(0x0966 + i): str(i) for i in range(10)},
+})
+
+# Word labels must end at a separator or digit: "Nokhar 12" has no "No" label
+_KHASRA_LABEL = re.compile(
+    r'^(?:(?:khasra|number|no\.?|خسرہ|خسره|نمبر|खसरा|नं\.?|नंबर)(?=[\s:.#\-]|\d|$)|kh\.|#|[\s:\-])+',
+    re.IGNORECASE
+)
+
+_FIELD_PATTERNS = {
+    "khasra_number": re.compile(
+        r'(?:خسرہ|خسره|खसरा|khasra)\s*(?:نمبر|नंबर|नं\.?|no\.?|number|#)?\s*[:\-]?\s*'
+        r'(\d+(?:\s*[/\\\-]\s*\d+)*)',
+        re.IGNORECASE
+    ),
+    "mauza": re.compile(r'(?:موضع|मौजा|mauza)\s*[:\-]?\s*([^\s،,۔।:\n]+)', re.IGNORECASE),
+    "tehsil": re.compile(r'(?:تحصیل|तहसील|tehsil)\s*[:\-]?\s*([^\s،,۔।:\n]+)', re.IGNORECASE),
+    "district": re.compile(r'(?:ضلع|जिला|district)\s*[:\-]?\s*([^\s،,۔।:\n]+)', re.IGNORECASE),
+    "owner_name": re.compile(
+        r'(?:نام\s*مالک|مالک|मालिक|owner)\s*[:\-]\s*([^\n،,۔।\d]{2,60})',
+        re.IGNORECASE
+    ),
+}
+
+_AREA_PATTERN = re.compile(
+    r'(\d+)\s*(?:کنال|कनाल|kanal)\s*(\d+)\s*(?:مرلہ|مرلے|मरला|marla)',
+    re.IGNORECASE
+)
+
+
+def normalize_digits(text):
+    """Convert Eastern Arabic, Urdu and Devanagari digits to ASCII"""
+    if not text:
+        return text
+    return text.translate(_DIGIT_TABLE)
+
+
+def normalize_khasra(value):
+    """
+    Canonical form of a khasra number used for indexing and lookups
+    e.g. "خسرہ نمبر ۰۱۲۳ / ۴" -> "123/4", "Kh. 45-A" -> "45/A"
+    """
+    if value is None:
+        return None
+    value = normalize_digits(str(value)).strip()
+    value = _KHASRA_LABEL.sub('', value)
+    value = re.sub(r'\s*[/\\\-–]\s*', '/', value)
+    value = re.sub(r'\s+', '', value).upper()
+    value = re.sub(r'\d+', lambda m: str(int(m.group())), value)
+    return value or None
+
+
 def extract_land_record_fields(ocr_text, translated_text):
     """
     Extract structured data from land record text
@@ -18,18 +74,31 @@ def extract_land_record_fields(ocr_text, translated_text):
         "raw_text": ocr_text,
         "translated_text": translated_text
     }
-    
-    # Pattern matching for Khasra Number
-    khasra_pattern = r'خسرہ\s*نمبر[:\s]*(\d+)'
-    match = re.search(khasra_pattern, ocr_text)
-    if match:
-        record["khasra_number"] = match.group(1)
-    
+
+    # Search the original text first, then the translation for anything missing
+    sources = [normalize_digits(t) for t in (ocr_text, translated_text) if t]
+
+    for field, pattern in _FIELD_PATTERNS.items():
+        for source in sources:
+            match = pattern.search(source)
+            if match:
+                record[field] = match.group(1).strip()
+                break
+
+    if record["khasra_number"]:
+        record["khasra_number"] = normalize_khasra(record["khasra_number"])
+
+    if record["owner_name"]:
+        # Latin spelling for matching against Farmer.name_english
+        from translation.transliterator import transliterate
+        record["owner_name_english"] = transliterate(record["owner_name"], 'auto', 'latin')
+
     # Pattern matching for Area
-    area_pattern = r'(\d+)\s*کنال\s*(\d+)\s*مرلہ'
-    match = re.search(area_pattern, ocr_text)
-    if match:
-        record["area_kanal"] = int(match.group(1))
-        record["area_marla"] = int(match.group(2))
-    
+    for source in sources:
+        match = _AREA_PATTERN.search(source)
+        if match:
+            record["area_kanal"] = int(match.group(1))
+            record["area_marla"] = int(match.group(2))
+            break
+
     return record
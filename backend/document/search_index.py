@@ -0,0 +1,300 @@
+"""
+Full-text search index over Document.ocr_text and Document.translated_text
+
+PostgreSQL: a stored tsvector column on `documents` with a GIN index.
+SQLite:     an FTS5 table `documents_fts` whose rowids are the explicit
+            integer keys of `documents_fts_keys` (one per document id).
+            The implicit documents rowid is not used, as VACUUM may
+            renumber it.
+Others:     no index; search falls back to an unranked LIKE scan, and
+            stored text is only lowercased, not folded.
+
+Urdu and Devanagari text is normalized the same way on both sides (index and
+query): Arabic diacritics, tatweel and zero-width joiners are dropped, Arabic
+letter variants are folded to their Urdu forms, nukta letters are folded to
+their base letters and Eastern Arabic / Devanagari digits become ASCII.
+"""
+import logging
+from sqlalchemy import Float, Uuid, and_, bindparam, event, func, inspect, literal, or_, select, text
+
+logger = logging.getLogger(__name__)
+
+# Characters folded to a canonical form before indexing/searching
+_FOLD_MAP = {
+    '\u064a': '\u06cc', '\u0649': '\u06cc',  # Arabic yeh / alef maksura -> Urdu yeh
+    '\u0643': '\u06a9',                       # Arabic kaf -> keheh
+    '\u0647': '\u06c1', '\u06c0': '\u06c1',  # Arabic heh / heh with yeh -> heh goal
+}
+# Precomposed nukta letters (U+0958-U+095F) -> base letters
+_FOLD_MAP.update(dict(zip(map(chr, range(0x0958, 0x0960)), '\u0915\u0916\u0917\u091c\u0921\u0922\u092b\u092f')))
+_FOLD_MAP.update({chr(0x0660 + i): str(i) for i in range(10)})  # Arabic-Indic digits
+_FOLD_MAP.update({chr(0x06F0 + i): str(i) for i in range(10)})  # Extended (Urdu) digits
+_FOLD_MAP.update({chr(0x0966 + i): str(i) for i in range(10)})  # Devanagari digits
+
+# Characters removed before indexing/searching
+_DROP_CHARS = (
+    ''.join(map(chr, range(0x064B, 0x0653)))  # Arabic harakat
+    + '\u0670'  # superscript alef
+    + '\u0640'  # tatweel
+    + '\u093c'  # Devanagari nukta
+    + '\u200c\u200d'  # ZWNJ / ZWJ
+)
+
+_SEARCH_TABLE = str.maketrans({**_FOLD_MAP, **{c: None for c in _DROP_CHARS}})
+
+# Same folding expressed as a PostgreSQL translate() call (chars without a
+# counterpart in the target string are deleted)
+_PG_FROM = ''.join(_FOLD_MAP.keys()) + _DROP_CHARS
+_PG_TO = ''.join(_FOLD_MAP.values())
+
+SQLITE_TOKENIZERS = (
+    "unicode61 remove_diacritics 0 categories 'L* N* Co M*'",  # keep matras inside tokens
+    "unicode61 remove_diacritics 0",
+)
+
+_listeners_registered = False
+
+_UUID_PARAM = bindparam('id', type_=Uuid)
+
+
+def normalize_search_text(value):
+    """Fold script variants so Urdu/Hindi spellings index and match consistently"""
+    if not value:
+        return ''
+    return value.translate(_SEARCH_TABLE).lower()
+
+
+def _document_body(doc):
+    return normalize_search_text(f"{doc.ocr_text or ''} {doc.translated_text or ''}")
+
+
+def _pg_vector_expression():
+    source = "lower(coalesce(ocr_text, '') || ' ' || coalesce(translated_text, ''))"
+    return f"to_tsvector('simple'::regconfig, translate({source}, '{_PG_FROM}', '{_PG_TO}'))"
+
+
+def create_search_index(engine):
+    """Create the dialect-specific index structures (idempotent)"""
+    with engine.begin() as conn:
+        if engine.dialect.name == 'postgresql':
+            conn.execute(text(
+                "ALTER TABLE documents ADD COLUMN IF NOT EXISTS search_vector tsvector "
+                f"GENERATED ALWAYS AS ({_pg_vector_expression()}) STORED"
+            ))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_documents_search_vector "
+                "ON documents USING GIN (search_vector)"
+            ))
+        elif engine.dialect.name == 'sqlite':
+            # Indexes built before the key table existed are keyed by documents.rowid
+            rekey = not inspect(conn).has_table('documents_fts_keys')
+            conn.execute(text(
+                "CREATE TABLE IF NOT EXISTS documents_fts_keys ("
+                "fts_id INTEGER PRIMARY KEY, document_id CHAR(32) NOT NULL UNIQUE)"
+            ))
+            for tokenizer in SQLITE_TOKENIZERS:
+                try:
+                    conn.execute(text(
+                        "CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts "
+                        f"USING fts5(body, tokenize=\"{tokenizer}\")"
+                    ))
+                    break
+                except Exception as e:
+                    logger.warning(f"FTS5 tokenizer '{tokenizer}' unavailable: {e}")
+            if rekey:
+                _rebuild_sqlite(conn)
+        else:
+            logger.warning(f"Full-text search not supported for dialect {engine.dialect.name}")
+
+
+def rebuild_search_index(engine, batch_size=1000):
+    """Re-populate the SQLite FTS table from documents. Returns rows indexed."""
+    if engine.dialect.name != 'sqlite':
+        # The PostgreSQL tsvector column is generated, nothing to rebuild
+        return 0
+    with engine.begin() as conn:
+        return _rebuild_sqlite(conn, batch_size)
+
+
+def _rebuild_sqlite(conn, batch_size=1000):
+    conn.execute(text("DELETE FROM documents_fts"))
+    conn.execute(text("DELETE FROM documents_fts_keys"))
+    conn.execute(text("INSERT INTO documents_fts_keys (document_id) SELECT id FROM documents"))
+    indexed = 0
+    last_key = 0
+    while True:
+        rows = conn.execute(text(
+            "SELECT k.fts_id, d.ocr_text, d.translated_text "
+            "FROM documents_fts_keys k JOIN documents d ON d.id = k.document_id "
+            "WHERE k.fts_id > :last ORDER BY k.fts_id LIMIT :limit"
+        ), {'last': last_key, 'limit': batch_size}).fetchall()
+        if not rows:
+            break
+        conn.execute(
+            text("INSERT INTO documents_fts (rowid, body) VALUES (:rowid, :body)"),
+            [{'rowid': r[0], 'body': normalize_search_text(f"{r[1] or ''} {r[2] or ''}")} for r in rows]
+        )
+        indexed += len(rows)
+        last_key = rows[-1][0]
+    return indexed
+
+
+def _sync_fts_row(connection, doc, delete_only=False):
+    if connection.dialect.name != 'sqlite':
+        return
+    key = connection.execute(
+        text("SELECT fts_id FROM documents_fts_keys WHERE document_id = :id").bindparams(_UUID_PARAM),
+        {'id': doc.id}
+    ).scalar()
+    if key is not None:
+        connection.execute(text("DELETE FROM documents_fts WHERE rowid = :key"), {'key': key})
+        if delete_only:
+            connection.execute(text("DELETE FROM documents_fts_keys WHERE fts_id = :key"), {'key': key})
+            return
+    elif delete_only:
+        return
+    else:
+        key = connection.execute(
+            text("INSERT INTO documents_fts_keys (document_id) VALUES (:id)").bindparams(_UUID_PARAM),
+            {'id': doc.id}
+        ).lastrowid
+    connection.execute(
+        text("INSERT INTO documents_fts (rowid, body) VALUES (:key, :body)"),
+        {'key': key, 'body': _document_body(doc)}
+    )
+
+
+def register_search_listeners():
+    """Keep the SQLite FTS table in sync with ORM writes to Document"""
+    global _listeners_registered
+    if _listeners_registered:
+        return
+    from models import Document
+
+    @event.listens_for(Document, 'after_insert')
+    def _after_insert(mapper, connection, target):
+        _sync_fts_row(connection, target)
+
+    @event.listens_for(Document, 'after_update')
+    def _after_update(mapper, connection, target):
+        state = inspect(target)
+        if state.attrs.ocr_text.history.has_changes() or state.attrs.translated_text.history.has_changes():
+            _sync_fts_row(connection, target)
+
+    @event.listens_for(Document, 'before_delete')
+    def _before_delete(mapper, connection, target):
+        _sync_fts_row(connection, target, delete_only=True)
+
+    _listeners_registered = True
+
+
+def _match_query(q):
+    """Build an FTS5 MATCH expression; the last term is treated as a prefix"""
+    terms = normalize_search_text(q).split()
+    quoted = ['"' + t.replace('"', '""') + '"' for t in terms]
+    if quoted:
+        quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def search_documents(session, q, district=None, tehsil=None, languages=None,
+                     page=1, per_page=20, with_total=True):
+    """
+    Ranked full-text search over documents
+
+    Counting every match costs as much as the search itself for common
+    terms; pass with_total=False to skip it and rely on has_more.
+
+    Returns:
+        (total or None, [(document_id, rank), ...], has_more) for the requested page
+    """
+    dialect = session.get_bind().dialect.name
+    params = {'limit': per_page + 1, 'offset': (page - 1) * per_page}
+    filters = []
+    if district:
+        filters.append("d.district = :district")
+        params['district'] = district
+    if tehsil:
+        filters.append("d.tehsil = :tehsil")
+        params['tehsil'] = tehsil
+    if languages:
+        names = []
+        for i, lang in enumerate(languages):
+            params[f'lang{i}'] = lang
+            names.append(f':lang{i}')
+        filters.append(f"d.detected_language IN ({', '.join(names)})")
+    where = ''.join(f" AND {f}" for f in filters)
+
+    if dialect not in ('postgresql', 'sqlite'):
+        return _like_search(session, q, district, tehsil, languages, page, per_page, with_total)
+
+    if dialect == 'postgresql':
+        params['q'] = normalize_search_text(q)
+        base = (
+            "FROM documents d, plainto_tsquery('simple'::regconfig, :q) query "
+            f"WHERE d.search_vector @@ query{where}"
+        )
+        ranked = f"SELECT d.id, ts_rank(d.search_vector, query) AS rank {base} ORDER BY rank DESC"
+    else:
+        params['q'] = _match_query(q)
+        if not params['q']:
+            return 0, [], False
+        base = (
+            "FROM documents_fts "
+            "JOIN documents_fts_keys k ON k.fts_id = documents_fts.rowid "
+            "JOIN documents d ON d.id = k.document_id "
+            f"WHERE documents_fts MATCH :q{where}"
+        )
+        ranked = f"SELECT d.id, -bm25(documents_fts) AS rank {base} ORDER BY bm25(documents_fts)"
+
+    rows = session.execute(
+        text(f"{ranked} LIMIT :limit OFFSET :offset").columns(id=Uuid, rank=Float), params
+    ).fetchall()
+    total = None
+    if with_total:
+        total = session.execute(text(f"SELECT count(*) {base}"), params).scalar() or 0
+    return total, [(r[0], r[1]) for r in rows[:per_page]], len(rows) > per_page
+
+
+def _like_search(session, q, district, tehsil, languages, page, per_page, with_total):
+    """search_documents() without a full-text index: every term as a substring, newest first"""
+    from models import Document
+
+    terms = normalize_search_text(q).split()
+    if not terms:
+        return 0, [], False
+    conditions = [
+        or_(func.lower(Document.ocr_text).contains(term, autoescape=True),
+            func.lower(Document.translated_text).contains(term, autoescape=True))
+        for term in terms
+    ]
+    if district:
+        conditions.append(Document.district == district)
+    if tehsil:
+        conditions.append(Document.tehsil == tehsil)
+    if languages:
+        conditions.append(Document.detected_language.in_(languages))
+    where = and_(*conditions)
+
+    rows = session.execute(
+        select(Document.id, literal(0.0).label('rank')).where(where)
+        .order_by(Document.created_at.desc(), Document.id)
+        .limit(per_page + 1).offset((page - 1) * per_page)
+    ).all()
+    total = session.execute(select(func.count(Document.id)).where(where)).scalar() if with_total else None
+    return total, [(r[0], r[1]) for r in rows[:per_page]], len(rows) > per_page
+
+
+def make_snippet(value, q, width=160):
+    """Short excerpt of value around the first query term"""
+    if not value:
+        return ''
+    folded = normalize_search_text(value)
+    pos = -1
+    for term in normalize_search_text(q).split():
+        pos = folded.find(term)
+        if pos >= 0:
+            break
+    start = max(0, pos - width // 2) if pos >= 0 else 0
+    snippet = value[start:start + width].strip()
+    return ("..." if start > 0 else "") + snippet + ("..." if start + width < len(value) else "")
@@ -0,0 +1,49 @@
+"""
+Gunicorn settings (picked up automatically from the working directory)
+
+    gunicorn "app:create_app()"
+
+With TRANSLATION_WARMUP=true the AI4Bharat model is loaded once in the master
+(preload_app) before workers are forked, so every worker shares the same
+weights copy-on-write instead of loading ~800MB each on its first request.
+"""
+import gc
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+# Translating a long document on CPU can take minutes
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 300))
+preload_app = True
+
+
+def _warmup_enabled():
+    # With TRANSLATION_SERVICE_ADDRESS the model lives in the translation service, not here
+    return (os.environ.get('TRANSLATION_WARMUP', 'false').lower() == 'true'
+            and not os.environ.get('TRANSLATION_SERVICE_ADDRESS'))
+
+
+def on_starting(server):
+    """Runs in the master after the app is preloaded and before any worker forks"""
+    if not _warmup_enabled():
+        return
+    from translation.ai4bharat_translator import model_manager
+    # Blocks until the load (possibly started by create_app in the background) finishes
+    if model_manager.warmup():
+        server.log.info(f"Translation model ready: {model_manager.status()}")
+    else:
+        server.log.warning(f"Translation model not loaded: {model_manager.status()['error']}")
+    # Keep the garbage collector from touching (and so copying) the preloaded objects
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Split CPU threads between workers so parallel generate() calls do not oversubscribe"""
+    if not _warmup_enabled():
+        return
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // server.cfg.workers))
@@ -1,14 +1,29 @@
 from extensions import db
 from datetime import datetime
+from sqlalchemy import event
+from document.rag_document_processor import normalize_khasra
+from common.geohash import encode as encode_geohash
+import os
+import time
 import uuid
 
+def uuid7():
+    """
+    Time-ordered UUID (RFC 9562 version 7): 48-bit Unix milliseconds followed
+    by random bits, so new rows append to the end of primary key indexes
+    """
+    value = (time.time_ns() // 1000000) << 80 | int.from_bytes(os.urandom(10), 'big')
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
 def generate_uuid():
-    return str(uuid.uuid4())
+    return uuid7()
 
 class Document(db.Model):
     __tablename__ = 'documents'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
+    id = db.Column(db.Uuid, primary_key=True, default=generate_uuid)  # native uuid on PostgreSQL
     filename = db.Column(db.String(255))
     original_path = db.Column(db.Text)
     pdf_path = db.Column(db.Text)  # Generated PDF path
@@ -22,14 +37,29 @@ class Document(db.Model):
     processing_status = db.Column(db.String(20), default='pending')  # pending, processed, failed
     processing_time_ms = db.Column(db.Integer)  # Processing time in milliseconds
     khasra_number = db.Column(db.String(50))
+    khasra_normalized = db.Column(db.String(50))  # normalize_khasra(khasra_number), kept in sync on write
     farmer_name = db.Column(db.String(255))
+    mauza = db.Column(db.String(100))
     district = db.Column(db.String(100))
     tehsil = db.Column(db.String(100))
+    # Place names as read from the record; the columns above hold their canonical
+    # English names (common/place_names.py) so they compare with other tables
+    mauza_raw = db.Column(db.String(100))
+    district_raw = db.Column(db.String(100))
+    tehsil_raw = db.Column(db.String(100))
     is_saved = db.Column(db.Boolean, default=False)  # Permanently saved flag
     notes = db.Column(db.Text)
     tags = db.Column(db.String(500))
     processed_at = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_documents_district_tehsil', 'district', 'tehsil'),
+        db.Index('ix_documents_detected_language', 'detected_language'),
+        db.Index('ix_documents_khasra_key', 'khasra_normalized', 'district', 'tehsil', 'mauza'),
+        db.Index('ix_documents_created_at_id', 'created_at', 'id'),
+    )
     
     def to_dict(self):
         return {
@@ -47,19 +77,24 @@ class Document(db.Model):
             'processing_time_ms': self.processing_time_ms,
             'khasra_number': self.khasra_number,
             'farmer_name': self.farmer_name,
+            'mauza': self.mauza,
             'district': self.district,
             'tehsil': self.tehsil,
+            'mauza_raw': self.mauza_raw,
+            'district_raw': self.district_raw,
+            'tehsil_raw': self.tehsil_raw,
             'is_saved': self.is_saved,
             'notes': self.notes,
             'tags': self.tags,
             'processed_at': self.processed_at.isoformat() if self.processed_at else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
 class Farmer(db.Model):
     __tablename__ = 'farmers'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
+    id = db.Column(db.Uuid, primary_key=True, default=generate_uuid)  # native uuid on PostgreSQL
     name_local = db.Column(db.String(255))
     name_english = db.Column(db.String(255))
     father_name = db.Column(db.String(255))
@@ -86,8 +121,9 @@ class Farmer(db.Model):
 class LandParcel(db.Model):
     __tablename__ = 'land_parcels'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
+    id = db.Column(db.Uuid, primary_key=True, default=generate_uuid)  # native uuid on PostgreSQL
     khasra_number = db.Column(db.String(50), nullable=False)
+    khasra_normalized = db.Column(db.String(50))
     mauza = db.Column(db.String(100))
     tehsil = db.Column(db.String(100))
     district = db.Column(db.String(100))
@@ -98,6 +134,10 @@ class LandParcel(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('ix_land_parcels_khasra_key', 'khasra_normalized', 'district', 'tehsil', 'mauza'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -115,8 +155,9 @@ class LandParcel(db.Model):
 class DisputedLand(db.Model):
     __tablename__ = 'disputed_lands'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
+    id = db.Column(db.Uuid, primary_key=True, default=generate_uuid)  # native uuid on PostgreSQL
     khasra_number = db.Column(db.String(50), nullable=False)
+    khasra_normalized = db.Column(db.String(50))
     mauza = db.Column(db.String(100))
     tehsil = db.Column(db.String(100), nullable=False)
     district = db.Column(db.String(100), nullable=False)
@@ -128,10 +169,12 @@ class DisputedLand(db.Model):
     
     # Multiple Claimants (stored as JSON)
     claimants = db.Column(db.JSON)  # [{"name": "...", "father_name": "...", "claim_type": "..."}]
+    claimants_count = db.Column(db.Integer, default=0)  # len(claimants), kept in sync on write
     
     # Location Data
     latitude = db.Column(db.Float)
     longitude = db.Column(db.Float)
+    geohash = db.Column(db.String(12))  # encode_geohash(latitude, longitude), kept in sync on write
     
     # Land Details
     area_kanal = db.Column(db.Float)
@@ -158,6 +201,12 @@ class DisputedLand(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     resolved_at = db.Column(db.DateTime)
     
+    __table_args__ = (
+        db.Index('ix_disputed_lands_khasra_key', 'khasra_normalized', 'district', 'tehsil', 'mauza'),
+        db.Index('ix_disputed_lands_lat_lng', 'latitude', 'longitude'),
+        db.Index('ix_disputed_lands_geohash', 'geohash'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -169,6 +218,7 @@ class DisputedLand(db.Model):
             'dispute_status': self.dispute_status,
             'dispute_description': self.dispute_description,
             'claimants': self.claimants or [],
+            'claimants_count': self.claimants_count or 0,
             'latitude': self.latitude,
             'longitude': self.longitude,
             'area_kanal': self.area_kanal,
@@ -188,6 +238,106 @@ class DisputedLand(db.Model):
             'resolved_at': self.resolved_at.isoformat() if self.resolved_at else None
         }
 
+class DisputeFacet(db.Model):
+    """Per-facet dispute counts, maintained incrementally by common/dispute_summary.py"""
+    __tablename__ = 'dispute_facets'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    dimension = db.Column(db.String(20), nullable=False)  # total, type, status, district, tehsil, partition
+    parent = db.Column(db.String(100), nullable=False, default='')  # district for tehsil facets
+    value = db.Column(db.String(100), nullable=False, default='')
+    count = db.Column(db.Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        db.UniqueConstraint('dimension', 'parent', 'value', name='uq_dispute_facets_key'),
+    )
+    
+    def to_dict(self):
+        return {
+            'dimension': self.dimension,
+            'parent': self.parent,
+            'value': self.value,
+            'count': self.count
+        }
+
+class DisputeClaimant(db.Model):
+    """One row per claimant of a dispute, maintained by common/claimant_index.py"""
+    __tablename__ = 'dispute_claimants'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    dispute_id = db.Column(db.Uuid, db.ForeignKey('disputed_lands.id', ondelete='CASCADE'), nullable=False, index=True)
+    position = db.Column(db.Integer, nullable=False, default=0)  # index in DisputedLand.claimants
+    word_offset = db.Column(db.Integer, nullable=False, default=0)  # one row per word suffix of the name
+    name = db.Column(db.String(255), nullable=False)
+    father_name = db.Column(db.String(255))
+    claim_type = db.Column(db.String(100))
+    name_normalized = db.Column(db.String(255), nullable=False)  # normalize_name(), from word_offset on
+    name_key = db.Column(db.String(255), nullable=False)  # phonetic_key() of name_normalized
+    
+    __table_args__ = (
+        # text_pattern_ops so LIKE 'prefix%' can use the index on PostgreSQL
+        db.Index('ix_dispute_claimants_name_normalized', 'name_normalized',
+                 postgresql_ops={'name_normalized': 'text_pattern_ops'}),
+        db.Index('ix_dispute_claimants_name_key', 'name_key',
+                 postgresql_ops={'name_key': 'text_pattern_ops'}),
+    )
+
+class FarmerMatchKey(db.Model):
+    """Blocking keys for farmer matching (tehsil + phonetic name word), see common/farmer_matching.py"""
+    __tablename__ = 'farmer_match_keys'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    farmer_id = db.Column(db.Uuid, db.ForeignKey('farmers.id', ondelete='CASCADE'), nullable=False, index=True)
+    tehsil_key = db.Column(db.String(100), nullable=False, default='')
+    block_key = db.Column(db.String(64), nullable=False)
+    
+    __table_args__ = (
+        db.Index('ix_farmer_match_keys_block', 'block_key', 'tehsil_key'),
+    )
+
+class DistrictTarget(db.Model):
+    """Digitization target (number of documents) per district for dashboard progress"""
+    __tablename__ = 'district_targets'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    district = db.Column(db.String(100), nullable=False, unique=True)
+    target_documents = db.Column(db.Integer, nullable=False, default=1000)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'district': self.district,
+            'target_documents': self.target_documents,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+class DataVersion(db.Model):
+    """Monotonic change counter per scope, bumped on every write (see common/data_version.py)"""
+    __tablename__ = 'data_versions'
+    
+    scope = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+class DashboardSnapshot(db.Model):
+    """Dashboard bundle computed for a given data version"""
+    __tablename__ = 'dashboard_snapshots'
+    
+    id = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class TranslationMemoryEntry(db.Model):
+    """Cached segment translation (see translation/translation_memory.py)"""
+    __tablename__ = 'translation_memory'
+    
+    key = db.Column(db.String(64), primary_key=True)  # sha256 of direction, model version, normalized source
+    direction = db.Column(db.String(30), nullable=False)  # e.g. urd_Arab-eng_Latn
+    model_version = db.Column(db.String(150), nullable=False)
+    source_text = db.Column(db.Text, nullable=False)
+    translated_text = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
 class ProcessingStats(db.Model):
     __tablename__ = 'processing_stats'
     
@@ -210,3 +360,33 @@ class ProcessingStats(db.Model):
             'hindi_count': self.hindi_count,
             'english_count': self.english_count
         }
+
+
+def derived_values(model, get):
+    """
+    Denormalized column values for a row, computed from its source columns
+    
+    Used by the ORM write listeners below and by Core bulk inserts, which
+    bypass mapper events. `get(name)` returns the row's value for a column.
+    """
+    values = {}
+    if model in (Document, LandParcel, DisputedLand):
+        # Normalized khasra key for the cross-table land record lookup
+        values['khasra_normalized'] = normalize_khasra(get('khasra_number'))
+    if model is DisputedLand:
+        # Map fields: geohash for clustering, claimant count for markers
+        claimants = get('claimants')
+        values['geohash'] = encode_geohash(get('latitude'), get('longitude'))
+        values['claimants_count'] = len(claimants) if claimants else 0
+    return values
+
+
+@event.listens_for(Document, 'before_insert')
+@event.listens_for(Document, 'before_update')
+@event.listens_for(LandParcel, 'before_insert')
+@event.listens_for(LandParcel, 'before_update')
+@event.listens_for(DisputedLand, 'before_insert')
+@event.listens_for(DisputedLand, 'before_update')
+def _sync_derived_values(mapper, connection, target):
+    for name, value in derived_values(mapper.class_, lambda column: getattr(target, column, None)).items():
+        setattr(target, name, value)
@@ -0,0 +1,82 @@
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from common.bulk_io import BulkImportError, ENTITIES, export_records, get_entity, import_records
+from common.db_routing import read_only
+
+bulk_bp = Blueprint('bulk', __name__)
+
+MIMETYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+
+def _request_format(default='csv'):
+    fmt = (request.args.get('format') or '').lower()
+    if not fmt and 'file' in request.files:
+        filename = request.files['file'].filename or ''
+        fmt = 'ndjson' if filename.lower().endswith(('.ndjson', '.jsonl')) else 'csv'
+    if not fmt:
+        fmt = 'ndjson' if 'ndjson' in (request.content_type or '') else default
+    return fmt
+
+@bulk_bp.route('/<entity>/import', methods=['POST'])
+def bulk_import(entity):
+    """
+    Stream-import CSV or NDJSON rows for disputed-lands, land-parcels or farmers
+
+    Body: multipart 'file' field or the raw CSV/NDJSON request body
+    Query params: format=csv|ndjson, dry_run=1 (validate only)
+    """
+    try:
+        get_entity(entity)
+        fmt = _request_format()
+        stream = request.files['file'].stream if 'file' in request.files else request.stream
+        dry_run = request.args.get('dry_run', '').lower() in ('1', 'true', 'yes')
+
+        report = import_records(entity, stream, fmt, dry_run=dry_run)
+
+        return jsonify({
+            'success': report['failed'] == 0,
+            'data': report
+        }), 200 if report['failed'] == 0 else 207
+    except BulkImportError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@bulk_bp.route('/<entity>/export', methods=['GET'])
+@read_only
+def bulk_export(entity):
+    """
+    Stream all rows for an entity as CSV or NDJSON
+
+    Query params: format=csv|ndjson, district, tehsil
+    """
+    try:
+        get_entity(entity)
+        fmt = _request_format()
+        if fmt not in MIMETYPES:
+            raise BulkImportError("format must be 'csv' or 'ndjson'")
+        filters = {
+            'district': request.args.get('district'),
+            'tehsil': request.args.get('tehsil')
+        }
+
+        return Response(
+            stream_with_context(export_records(entity, fmt, filters)),
+            mimetype=MIMETYPES[fmt],
+            headers={'Content-Disposition': f'attachment; filename={entity}.{fmt}'}
+        )
+    except BulkImportError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+@bulk_bp.route('/entities', methods=['GET'])
+def list_entities():
+    """Importable entities and their columns"""
+    from common.bulk_io import importable_columns
+    return jsonify({
+        'success': True,
+        'data': {
+            name: [column.name for column in importable_columns(spec['model'])]
+            for name, spec in ENTITIES.items()
+        }
+    })
@@ -0,0 +1,76 @@
+from flask import Blueprint, request, jsonify
+from extensions import db
+from models import DistrictTarget
+from common import dashboard, data_version
+from common.http_cache import conditional_json, is_not_modified, not_modified_response
+from common.db_routing import read_only
+
+dashboard_bp = Blueprint('dashboard', __name__)
+
+@dashboard_bp.route('', methods=['GET'])
+@read_only
+def get_dashboard():
+    """OCR stats, district progress and dispute stats in one response, with ETag/304 support"""
+    try:
+        version = data_version.get_version()
+        etag = f"dashboard-v{version}"
+
+        # Nothing changed since the client's copy: answer without touching the snapshot
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+
+        version, payload, computed_at = dashboard.get_bundle(version)
+        return conditional_json({
+            'success': True,
+            'data': {
+                **payload,
+                'version': version,
+                'computed_at': computed_at.isoformat() if computed_at else None
+            }
+        }, etag, last_modified=computed_at)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@dashboard_bp.route('/targets', methods=['GET'])
+@read_only
+def get_district_targets():
+    """Get digitization targets per district"""
+    try:
+        targets = DistrictTarget.query.order_by(DistrictTarget.district).all()
+        return jsonify({
+            'success': True,
+            'data': [t.to_dict() for t in targets]
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@dashboard_bp.route('/targets', methods=['PUT'])
+def update_district_targets():
+    """Create or update district targets. Body: {"Srinagar": 5000, ...}"""
+    data = request.get_json() or {}
+    if not isinstance(data, dict) or not data:
+        return jsonify({'success': False, 'error': 'Expected an object of {district: target}'}), 400
+
+    try:
+        for district, target in data.items():
+            target = int(target)
+            if target < 0:
+                return jsonify({'success': False, 'error': f'Invalid target for {district}'}), 400
+            row = DistrictTarget.query.filter_by(district=district).first()
+            if row:
+                row.target_documents = target
+            else:
+                db.session.add(DistrictTarget(district=district, target_documents=target))
+        db.session.commit()
+
+        targets = DistrictTarget.query.order_by(DistrictTarget.district).all()
+        return jsonify({
+            'success': True,
+            'data': [t.to_dict() for t in targets]
+        })
+    except (TypeError, ValueError):
+        db.session.rollback()
+        return jsonify({'success': False, 'error': 'Targets must be integers'}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
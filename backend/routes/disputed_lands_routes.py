@@ -2,11 +2,16 @@ from flask import Blueprint, request, jsonify
 from extensions import db
 from models import DisputedLand
 from datetime import datetime, date
-from sqlalchemy import or_, and_
+from sqlalchemy import or_, and_, case, func
+from common.geohash import parse_bbox, precision_for_zoom
+from common import claimant_index, dispute_summary
+from common.http_cache import conditional_json, detail_cache_control, is_not_modified, not_modified_response, record_etag
+from common.db_routing import read_only
 
 disputed_lands_bp = Blueprint('disputed_lands', __name__)
 
 @disputed_lands_bp.route('/disputed-lands', methods=['GET'])
+@read_only
 def get_disputed_lands():
     """Get all disputed lands with optional filtering"""
     try:
@@ -45,59 +50,192 @@ def get_disputed_lands():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+MAP_POINT_COLUMNS = (
+    DisputedLand.id, DisputedLand.khasra_number, DisputedLand.mauza, DisputedLand.tehsil,
+    DisputedLand.district, DisputedLand.latitude, DisputedLand.longitude, DisputedLand.dispute_type,
+    DisputedLand.dispute_status, DisputedLand.area_kanal, DisputedLand.claimants_count,
+    DisputedLand.partition_impact
+)
+# At or above this zoom level individual markers are returned instead of clusters
+MAP_POINT_ZOOM = 14
+MAX_MAP_POINTS = 5000
+
+def _map_query(*columns):
+    """Geolocated disputes filtered by district, tehsil and bbox query parameters"""
+    query = db.session.query(*columns).filter(
+        DisputedLand.latitude.isnot(None),
+        DisputedLand.longitude.isnot(None)
+    )
+    
+    district = request.args.get('district')
+    tehsil = request.args.get('tehsil')
+    bbox = request.args.get('bbox')
+    
+    if district:
+        query = query.filter(DisputedLand.district == district)
+    if tehsil:
+        query = query.filter(DisputedLand.tehsil == tehsil)
+    if bbox:
+        west, south, east, north = parse_bbox(bbox)
+        query = query.filter(
+            DisputedLand.latitude.between(south, north),
+            DisputedLand.longitude.between(west, east)
+        )
+    return query
+
+def _map_point(row):
+    return {
+        'id': row.id,
+        'khasra_number': row.khasra_number,
+        'mauza': row.mauza,
+        'tehsil': row.tehsil,
+        'district': row.district,
+        'latitude': row.latitude,
+        'longitude': row.longitude,
+        'dispute_type': row.dispute_type,
+        'dispute_status': row.dispute_status,
+        'area_kanal': row.area_kanal,
+        'claimants_count': row.claimants_count or 0,
+        'partition_impact': row.partition_impact
+    }
+
 @disputed_lands_bp.route('/disputed-lands/map-data', methods=['GET'])
+@read_only
 def get_map_data():
     """Get all disputed lands with location data for map visualization"""
     try:
-        district = request.args.get('district')
-        tehsil = request.args.get('tehsil')
+        rows = _map_query(*MAP_POINT_COLUMNS).all()
         
-        query = DisputedLand.query.filter(
-            DisputedLand.latitude.isnot(None),
-            DisputedLand.longitude.isnot(None)
-        )
+        return jsonify({
+            'success': True,
+            'data': [_map_point(row) for row in rows]
+        })
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@disputed_lands_bp.route('/disputed-lands/map-clusters', methods=['GET'])
+@read_only
+def get_map_clusters():
+    """
+    Get map data for a viewport: geohash-grid clusters at low zoom, individual points at high zoom
+    
+    Query params: bbox=west,south,east,north (required), zoom, district, tehsil
+    """
+    if not request.args.get('bbox'):
+        return jsonify({'success': False, 'error': 'bbox is required (west,south,east,north)'}), 400
+    
+    try:
+        zoom = request.args.get('zoom', 8, type=int)
         
-        if district:
-            query = query.filter(DisputedLand.district == district)
-        if tehsil:
-            query = query.filter(DisputedLand.tehsil == tehsil)
+        if zoom >= MAP_POINT_ZOOM:
+            rows = _map_query(*MAP_POINT_COLUMNS).limit(MAX_MAP_POINTS + 1).all()
+            return jsonify({
+                'success': True,
+                'data': {
+                    'type': 'points',
+                    'zoom': zoom,
+                    'points': [_map_point(row) for row in rows[:MAX_MAP_POINTS]],
+                    'truncated': len(rows) > MAX_MAP_POINTS
+                }
+            })
         
-        lands = query.all()
+        precision = precision_for_zoom(zoom)
+        cell = func.substr(DisputedLand.geohash, 1, precision)
+        rows = _map_query(
+            cell.label('cell'),
+            func.count(DisputedLand.id).label('count'),
+            func.avg(DisputedLand.latitude).label('latitude'),
+            func.avg(DisputedLand.longitude).label('longitude'),
+            func.sum(DisputedLand.claimants_count).label('claimants_count'),
+            func.sum(case((DisputedLand.partition_impact.is_(True), 1), else_=0)).label('partition_affected')
+        ).group_by(cell).all()
         
-        map_data = [{
-            'id': land.id,
-            'khasra_number': land.khasra_number,
-            'mauza': land.mauza,
-            'tehsil': land.tehsil,
-            'district': land.district,
-            'latitude': land.latitude,
-            'longitude': land.longitude,
-            'dispute_type': land.dispute_type,
-            'dispute_status': land.dispute_status,
-            'area_kanal': land.area_kanal,
-            'claimants_count': len(land.claimants) if land.claimants else 0,
-            'partition_impact': land.partition_impact
-        } for land in lands]
+        return jsonify({
+            'success': True,
+            'data': {
+                'type': 'clusters',
+                'zoom': zoom,
+                'precision': precision,
+                'clusters': [{
+                    'geohash': row.cell,
+                    'count': row.count,
+                    'latitude': round(row.latitude, 6),
+                    'longitude': round(row.longitude, 6),
+                    'claimants_count': int(row.claimants_count or 0),
+                    'partition_affected': int(row.partition_affected or 0)
+                } for row in rows]
+            }
+        })
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@disputed_lands_bp.route('/disputed-lands/claimants/search', methods=['GET'])
+@read_only
+def search_claimants():
+    """Find disputes by claimant name (mode=prefix|fuzzy, Urdu/Hindi/Latin spellings)"""
+    q = (request.args.get('q') or '').strip()
+    if not q:
+        return jsonify({'success': False, 'error': 'No search query provided'}), 400
+    
+    mode = request.args.get('mode', 'prefix')
+    if mode not in ('prefix', 'fuzzy'):
+        return jsonify({'success': False, 'error': "mode must be 'prefix' or 'fuzzy'"}), 400
+    
+    try:
+        limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+        min_score = request.args.get('min_score', claimant_index.DEFAULT_MIN_SCORE, type=float)
+        results = claimant_index.search_claimants(
+            q, mode=mode, district=request.args.get('district'), limit=limit, min_score=min_score
+        )
         
         return jsonify({
             'success': True,
-            'data': map_data
+            'data': {
+                'results': [{
+                    'dispute_id': claimant.dispute_id,
+                    'name': claimant.name,
+                    'father_name': claimant.father_name,
+                    'claim_type': claimant.claim_type,
+                    'score': round(score, 3),
+                    'khasra_number': row.khasra_number,
+                    'mauza': row.mauza,
+                    'tehsil': row.tehsil,
+                    'district': row.district,
+                    'dispute_type': row.dispute_type,
+                    'dispute_status': row.dispute_status
+                } for claimant, row, score in results],
+                'mode': mode,
+                'count': len(results)
+            }
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
-@disputed_lands_bp.route('/disputed-lands/<land_id>', methods=['GET'])
+@disputed_lands_bp.route('/disputed-lands/<uuid:land_id>', methods=['GET'])
+@read_only
 def get_disputed_land(land_id):
-    """Get single disputed land details"""
+    """Get single disputed land details (ETag / Last-Modified, 304 when unchanged)"""
     try:
-        land = DisputedLand.query.get(land_id)
-        if not land:
+        stamps = db.session.query(
+            DisputedLand.updated_at, DisputedLand.created_at
+        ).filter(DisputedLand.id == land_id).first()
+        if not stamps:
             return jsonify({'success': False, 'error': 'Land not found'}), 404
         
-        return jsonify({
+        last_modified = stamps.updated_at or stamps.created_at
+        etag = record_etag('land', land_id, last_modified)
+        if is_not_modified(etag, last_modified):
+            return not_modified_response(etag, detail_cache_control())
+        
+        land = DisputedLand.query.get(land_id)
+        return conditional_json({
             'success': True,
             'data': land.to_dict()
-        })
+        }, etag, last_modified=last_modified, cache_control=detail_cache_control())
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -129,6 +267,8 @@ def create_disputed_land():
         )
         
         db.session.add(land)
+        db.session.flush()  # apply column defaults before computing facets
+        dispute_summary.record_change([], dispute_summary.facet_keys(land))
         db.session.commit()
         
         return jsonify({
@@ -139,7 +279,7 @@ def create_disputed_land():
         db.session.rollback()
         return jsonify({'success': False, 'error': str(e)}), 500
 
-@disputed_lands_bp.route('/disputed-lands/<land_id>', methods=['PUT'])
+@disputed_lands_bp.route('/disputed-lands/<uuid:land_id>', methods=['PUT'])
 def update_disputed_land(land_id):
     """Update disputed land record"""
     try:
@@ -148,6 +288,7 @@ def update_disputed_land(land_id):
             return jsonify({'success': False, 'error': 'Land not found'}), 404
         
         data = request.get_json()
+        old_facets = dispute_summary.facet_keys(land)
         
         # Update fields
         for field in ['dispute_status', 'dispute_description', 'claimants', 'latitude', 
@@ -165,6 +306,7 @@ def update_disputed_land(land_id):
             land.resolved_at = datetime.utcnow()
         
         land.updated_at = datetime.utcnow()
+        dispute_summary.record_change(old_facets, dispute_summary.facet_keys(land))
         db.session.commit()
         
         return jsonify({
@@ -175,7 +317,7 @@ def update_disputed_land(land_id):
         db.session.rollback()
         return jsonify({'success': False, 'error': str(e)}), 500
 
-@disputed_lands_bp.route('/disputed-lands/<land_id>', methods=['DELETE'])
+@disputed_lands_bp.route('/disputed-lands/<uuid:land_id>', methods=['DELETE'])
 def delete_disputed_land(land_id):
     """Delete disputed land record"""
     try:
@@ -183,6 +325,7 @@ def delete_disputed_land(land_id):
         if not land:
             return jsonify({'success': False, 'error': 'Land not found'}), 404
         
+        dispute_summary.record_change(dispute_summary.facet_keys(land), [])
         db.session.delete(land)
         db.session.commit()
         
@@ -195,66 +338,38 @@ def delete_disputed_land(land_id):
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @disputed_lands_bp.route('/disputed-lands/stats', methods=['GET'])
+@read_only
 def get_dispute_stats():
     """Get statistics on disputed lands"""
     try:
-        total = DisputedLand.query.count()
-        by_type = db.session.query(
-            DisputedLand.dispute_type,
-            db.func.count(DisputedLand.id)
-        ).group_by(DisputedLand.dispute_type).all()
-        
-        by_status = db.session.query(
-            DisputedLand.dispute_status,
-            db.func.count(DisputedLand.id)
-        ).group_by(DisputedLand.dispute_status).all()
-        
-        by_district = db.session.query(
-            DisputedLand.district,
-            db.func.count(DisputedLand.id)
-        ).group_by(DisputedLand.district).all()
-        
-        partition_affected = DisputedLand.query.filter_by(partition_impact=True).count()
-        
         return jsonify({
             'success': True,
-            'data': {
-                'total_disputes': total,
-                'by_type': {dtype: count for dtype, count in by_type},
-                'by_status': {status: count for status, count in by_status},
-                'by_district': {district: count for district, count in by_district},
-                'partition_affected': partition_affected
-            }
+            'data': dispute_summary.get_stats()
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @disputed_lands_bp.route('/disputed-lands/districts', methods=['GET'])
+@read_only
 def get_districts():
     """Get list of districts with disputed lands"""
     try:
-        districts = db.session.query(DisputedLand.district).distinct().all()
         return jsonify({
             'success': True,
-            'data': [d[0] for d in districts if d[0]]
+            'data': dispute_summary.get_districts()
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @disputed_lands_bp.route('/disputed-lands/tehsils', methods=['GET'])
+@read_only
 def get_tehsils():
     """Get list of tehsils with disputed lands"""
     try:
         district = request.args.get('district')
-        query = db.session.query(DisputedLand.tehsil).distinct()
-        
-        if district:
-            query = query.filter(DisputedLand.district == district)
-        
-        tehsils = query.all()
         return jsonify({
             'success': True,
-            'data': [t[0] for t in tehsils if t[0]]
+            'data': dispute_summary.get_tehsils(district)
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -0,0 +1,105 @@
+from flask import Blueprint, request, jsonify
+import time
+from extensions import db
+from models import Farmer
+from common import farmer_matching
+from common.db_routing import read_only
+
+farmers_bp = Blueprint('farmers', __name__)
+
+def _candidate(farmer, score):
+    return {**farmer.to_dict(), 'score': round(score, 3)}
+
+@farmers_bp.route('/match', methods=['GET'])
+@read_only
+def match_farmers():
+    """Top-k existing farmers for a name (name, father_name, tehsil, district, limit, min_score)"""
+    name = (request.args.get('name') or '').strip()
+    if not name:
+        return jsonify({'success': False, 'error': 'name is required'}), 400
+
+    try:
+        limit = min(max(request.args.get('limit', 10, type=int), 1), 100)
+        min_score = request.args.get('min_score', 0.6, type=float)
+
+        start_time = time.time()
+        matches = farmer_matching.find_matches(
+            name,
+            father_name=request.args.get('father_name'),
+            tehsil=request.args.get('tehsil'),
+            district=request.args.get('district'),
+            limit=limit,
+            min_score=min_score
+        )
+
+        return jsonify({
+            'success': True,
+            'data': {
+                'candidates': [_candidate(farmer, score) for farmer, score in matches],
+                'count': len(matches),
+                'query_time_ms': int((time.time() - start_time) * 1000)
+            }
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@farmers_bp.route('', methods=['POST'])
+def register_farmer():
+    """
+    Register a farmer, refusing likely duplicates in the same tehsil
+
+    Returns 409 with the matching farmers when one scores above the duplicate
+    threshold; pass ?force=true to register anyway.
+    """
+    data = request.get_json() or {}
+    name = data.get('name_local') or data.get('name_english')
+    if not name:
+        return jsonify({'success': False, 'error': 'name_local or name_english is required'}), 400
+
+    try:
+        force = request.args.get('force', '').lower() in ('1', 'true', 'yes')
+        if not force:
+            duplicates = []
+            for variant in {data.get('name_local'), data.get('name_english')} - {None, ''}:
+                duplicates += farmer_matching.find_matches(
+                    variant,
+                    father_name=data.get('father_name'),
+                    tehsil=data.get('tehsil'),
+                    limit=5,
+                    min_score=farmer_matching.DUPLICATE_THRESHOLD
+                )
+            if duplicates:
+                best = {}
+                for farmer, score in duplicates:
+                    if farmer.id not in best or score > best[farmer.id][1]:
+                        best[farmer.id] = (farmer, score)
+                return jsonify({
+                    'success': False,
+                    'error': 'Possible duplicate farmer',
+                    'data': {
+                        'candidates': [
+                            _candidate(farmer, score)
+                            for farmer, score in sorted(best.values(), key=lambda item: item[1], reverse=True)
+                        ]
+                    }
+                }), 409
+
+        farmer = Farmer(
+            name_local=data.get('name_local'),
+            name_english=data.get('name_english'),
+            father_name=data.get('father_name'),
+            address=data.get('address'),
+            tehsil=data.get('tehsil'),
+            district=data.get('district'),
+            phone=data.get('phone')
+        )
+        db.session.add(farmer)
+        db.session.commit()
+
+        return jsonify({
+            'success': True,
+            'data': farmer.to_dict()
+        }), 201
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
@@ -0,0 +1,79 @@
+from flask import Blueprint, request, jsonify
+from extensions import db
+from models import Document, LandParcel, DisputedLand
+from document.rag_document_processor import normalize_khasra
+from sqlalchemy import func, literal, select, union_all
+from common.db_routing import read_only
+
+land_records_bp = Blueprint('land_records', __name__)
+
+def _keyed_select(model, record_type, label_column, khasra, district, tehsil, mauza):
+    """Select compact rows for one table, filtered on the (khasra, district, tehsil, mauza) key"""
+    stmt = select(
+        literal(record_type).label('record_type'),
+        model.id.label('id'),
+        model.khasra_number.label('khasra_number'),
+        model.mauza.label('mauza'),
+        model.tehsil.label('tehsil'),
+        model.district.label('district'),
+        label_column.label('label'),
+        model.created_at.label('created_at')
+    ).where(model.khasra_normalized == khasra)
+
+    # Location names are matched case-insensitively; the khasra key narrows the index scan first
+    if district:
+        stmt = stmt.where(func.lower(model.district) == district.strip().lower())
+    if tehsil:
+        stmt = stmt.where(func.lower(model.tehsil) == tehsil.strip().lower())
+    if mauza:
+        stmt = stmt.where(func.lower(model.mauza) == mauza.strip().lower())
+    return stmt
+
+@land_records_bp.route('/lookup', methods=['GET'])
+@read_only
+def lookup_land_record():
+    """Get all documents, land parcels and disputes for a (district, tehsil, mauza, khasra) key"""
+    khasra = normalize_khasra(request.args.get('khasra'))
+    if not khasra:
+        return jsonify({'success': False, 'error': 'khasra is required'}), 400
+
+    district = request.args.get('district')
+    tehsil = request.args.get('tehsil')
+    mauza = request.args.get('mauza')
+
+    try:
+        # One round trip: UNION ALL over the three khasra-indexed tables
+        stmt = union_all(
+            _keyed_select(Document, 'document', Document.filename, khasra, district, tehsil, mauza),
+            _keyed_select(LandParcel, 'land_parcel', LandParcel.ownership_status, khasra, district, tehsil, mauza),
+            _keyed_select(DisputedLand, 'disputed_land', DisputedLand.dispute_status, khasra, district, tehsil, mauza)
+        )
+        rows = db.session.execute(stmt).mappings().all()
+
+        result = {'documents': [], 'land_parcels': [], 'disputed_lands': []}
+        for row in rows:
+            result[row['record_type'] + 's'].append({
+                'id': row['id'],
+                'khasra_number': row['khasra_number'],
+                'mauza': row['mauza'],
+                'tehsil': row['tehsil'],
+                'district': row['district'],
+                'label': row['label'],
+                'created_at': row['created_at'].isoformat() if row['created_at'] else None
+            })
+
+        return jsonify({
+            'success': True,
+            'data': {
+                'key': {
+                    'khasra': khasra,
+                    'district': district,
+                    'tehsil': tehsil,
+                    'mauza': mauza
+                },
+                **result,
+                'total': len(rows)
+            }
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
@@ -4,14 +4,70 @@ import os
 import time
 from datetime import datetime, date
 from document.upload_handler import save_file
-from ocr.lightweight_pipeline import ocr_pipeline
+from document.rag_document_processor import extract_land_record_fields
 from ocr.google_vision_ocr import process_with_vision_api
 from extensions import db
-from models import Document, Farmer, LandParcel, ProcessingStats
-from sqlalchemy import func
+from models import Document, ProcessingStats
+from common.dashboard import compute_district_progress, compute_ocr_stats
+from common.http_cache import conditional_json, detail_cache_control, is_not_modified, not_modified_response, record_etag
+from common.db_routing import read_only
+from common.place_names import set_document_places
 
 ocr_bp = Blueprint('ocr', __name__)
 
+def _create_document(filepath, image_bytes, result, processing_time_ms):
+    """Create the Document record for an OCR result, with land record fields extracted from the text"""
+    text = result.get('text', '')
+    fields = extract_land_record_fields(text, None) if text else {}
+    
+    doc = Document(
+        filename=os.path.basename(filepath),
+        original_path=filepath,
+        file_type=os.path.splitext(filepath)[1][1:].lower(),
+        file_size_kb=len(image_bytes) // 1024,
+        ocr_text=text,
+        detected_language=result.get('detected_language', 'unknown'),
+        ocr_confidence=result.get('confidence', 0),
+        processing_status='processed',
+        processing_time_ms=processing_time_ms,
+        processed_at=datetime.utcnow(),
+        khasra_number=fields.get('khasra_number'),
+        farmer_name=fields.get('owner_name')
+    )
+    set_document_places(doc, fields.get('district'), fields.get('tehsil'), fields.get('mauza'))
+    db.session.add(doc)
+    return doc
+
+def _get_daily_stats():
+    today = date.today()
+    stats = ProcessingStats.query.filter_by(date=today).first()
+    if not stats:
+        stats = ProcessingStats(date=today)
+        db.session.add(stats)
+    return stats
+
+def _record_processed(detected_lang, processing_time_ms):
+    """Update daily stats for a processed document (caller commits)"""
+    stats = _get_daily_stats()
+    stats.documents_processed += 1
+    stats.total_processing_time_ms += processing_time_ms
+    
+    if detected_lang in ['ur', 'urd', 'urdu']:
+        stats.urdu_count += 1
+    elif detected_lang in ['hi', 'hin', 'hindi']:
+        stats.hindi_count += 1
+    else:
+        stats.english_count += 1
+
+def _record_failed():
+    """Log failed processing in daily stats"""
+    try:
+        db.session.rollback()
+        _get_daily_stats().documents_failed += 1
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+
 @ocr_bp.route('/upload', methods=['POST'])
 def upload_file():
     if 'file' not in request.files:
@@ -45,7 +101,9 @@ def process_ocr():
         
         with open(filepath, 'rb') as f:
             image_bytes = f.read()
-            
+        
+        # Imported on first use: pulls in cv2 and google.cloud.vision
+        from ocr.lightweight_pipeline import ocr_pipeline
         result = ocr_pipeline.process(image_bytes)
         
         processing_time_ms = int((time.time() - start_time) * 1000)
@@ -53,38 +111,8 @@ def process_ocr():
         # Detect language from result
         detected_lang = result.get('detected_language', 'unknown')
         
-        # Create document record
-        doc = Document(
-            filename=os.path.basename(filepath),
-            original_path=filepath,
-            file_type=os.path.splitext(filepath)[1][1:].lower(),
-            file_size_kb=len(image_bytes) // 1024,
-            ocr_text=result.get('text', ''),
-            detected_language=detected_lang,
-            ocr_confidence=result.get('confidence', 0),
-            processing_status='processed',
-            processing_time_ms=processing_time_ms,
-            processed_at=datetime.utcnow()
-        )
-        db.session.add(doc)
-        
-        # Update daily stats
-        today = date.today()
-        stats = ProcessingStats.query.filter_by(date=today).first()
-        if not stats:
-            stats = ProcessingStats(date=today)
-            db.session.add(stats)
-        
-        stats.documents_processed += 1
-        stats.total_processing_time_ms += processing_time_ms
-        
-        if detected_lang in ['ur', 'urd', 'urdu']:
-            stats.urdu_count += 1
-        elif detected_lang in ['hi', 'hin', 'hindi']:
-            stats.hindi_count += 1
-        else:
-            stats.english_count += 1
-            
+        doc = _create_document(filepath, image_bytes, result, processing_time_ms)
+        _record_processed(detected_lang, processing_time_ms)
         db.session.commit()
         
         return jsonify({
@@ -96,17 +124,7 @@ def process_ocr():
             }
         })
     except Exception as e:
-        # Log failed processing
-        try:
-            today = date.today()
-            stats = ProcessingStats.query.filter_by(date=today).first()
-            if not stats:
-                stats = ProcessingStats(date=today)
-                db.session.add(stats)
-            stats.documents_failed += 1
-            db.session.commit()
-        except:
-            pass
+        _record_failed()
         return jsonify({"success": False, "error": str(e)}), 500
 
 @ocr_bp.route('/process-vision', methods=['POST'])
@@ -158,38 +176,8 @@ def process_ocr_vision():
         # Detect language from result
         detected_lang = result.get('detected_language', 'unknown')
         
-        # Create document record
-        doc = Document(
-            filename=os.path.basename(filepath),
-            original_path=filepath,
-            file_type=os.path.splitext(filepath)[1][1:].lower(),
-            file_size_kb=len(image_bytes) // 1024,
-            ocr_text=result.get('text', ''),
-            detected_language=detected_lang,
-            ocr_confidence=result.get('confidence', 0),
-            processing_status='processed',
-            processing_time_ms=processing_time_ms,
-            processed_at=datetime.utcnow()
-        )
-        db.session.add(doc)
-        
-        # Update daily stats
-        today = date.today()
-        stats = ProcessingStats.query.filter_by(date=today).first()
-        if not stats:
-            stats = ProcessingStats(date=today)
-            db.session.add(stats)
-        
-        stats.documents_processed += 1
-        stats.total_processing_time_ms += processing_time_ms
-        
-        if detected_lang in ['ur', 'urd', 'urdu']:
-            stats.urdu_count += 1
-        elif detected_lang in ['hi', 'hin', 'hindi']:
-            stats.hindi_count += 1
-        else:
-            stats.english_count += 1
-            
+        doc = _create_document(filepath, image_bytes, result, processing_time_ms)
+        _record_processed(detected_lang, processing_time_ms)
         db.session.commit()
         
         return jsonify({
@@ -209,17 +197,7 @@ def process_ocr_vision():
             "hint": "Set GOOGLE_VISION_API_KEY in your .env file"
         }), 400
     except Exception as e:
-        # Log failed processing
-        try:
-            today = date.today()
-            stats = ProcessingStats.query.filter_by(date=today).first()
-            if not stats:
-                stats = ProcessingStats(date=today)
-                db.session.add(stats)
-            stats.documents_failed += 1
-            db.session.commit()
-        except:
-            pass
+        _record_failed()
         return jsonify({"success": False, "error": str(e)}), 500
 
 
@@ -229,75 +207,13 @@ def batch_process():
     return jsonify({"success": True, "message": "Batch processing started"})
 
 @ocr_bp.route('/stats', methods=['GET'])
+@read_only
 def get_stats():
     """Get real processing statistics from database"""
     try:
-        # Total documents processed
-        total_processed = db.session.query(func.count(Document.id)).filter(
-            Document.processing_status == 'processed'
-        ).scalar() or 0
-        
-        # Total failed
-        total_failed = db.session.query(func.count(Document.id)).filter(
-            Document.processing_status == 'failed'
-        ).scalar() or 0
-        
-        # Success rate
-        total_attempts = total_processed + total_failed
-        success_rate = (total_processed / total_attempts * 100) if total_attempts > 0 else 0
-        
-        # Average processing time
-        avg_time_result = db.session.query(func.avg(Document.processing_time_ms)).filter(
-            Document.processing_status == 'processed'
-        ).scalar()
-        avg_processing_time = round(avg_time_result / 1000, 2) if avg_time_result else 0
-        
-        # Language distribution
-        urdu_count = db.session.query(func.count(Document.id)).filter(
-            Document.detected_language.in_(['ur', 'urd', 'urdu'])
-        ).scalar() or 0
-        
-        hindi_count = db.session.query(func.count(Document.id)).filter(
-            Document.detected_language.in_(['hi', 'hin', 'hindi'])
-        ).scalar() or 0
-        
-        english_count = db.session.query(func.count(Document.id)).filter(
-            Document.detected_language.in_(['en', 'eng', 'english'])
-        ).scalar() or 0
-        
-        # Unique farmers (from farmer table)
-        farmers_registered = db.session.query(func.count(Farmer.id)).scalar() or 0
-        
-        # Unique parcels
-        parcels_linked = db.session.query(func.count(LandParcel.id)).scalar() or 0
-        
-        # Pending documents
-        pending_records = db.session.query(func.count(Document.id)).filter(
-            Document.processing_status == 'pending'
-        ).scalar() or 0
-        
-        # Accuracy rate (based on confidence scores)
-        avg_confidence = db.session.query(func.avg(Document.ocr_confidence)).filter(
-            Document.processing_status == 'processed'
-        ).scalar()
-        accuracy_rate = round(avg_confidence, 1) if avg_confidence else 0
-        
         return jsonify({
             "success": True,
-            "data": {
-                "total_processed": total_processed,
-                "success_rate": round(success_rate, 1),
-                "avg_processing_time": avg_processing_time,
-                "accuracy_rate": accuracy_rate,
-                "farmers_registered": farmers_registered,
-                "parcels_linked": parcels_linked,
-                "pending_records": pending_records,
-                "language_distribution": {
-                    "urdu": urdu_count,
-                    "hindi": hindi_count,
-                    "english": english_count
-                }
-            }
+            "data": compute_ocr_stats()
         })
     except Exception as e:
         return jsonify({
@@ -316,6 +232,7 @@ def get_stats():
         })
 
 @ocr_bp.route('/documents', methods=['GET'])
+@read_only
 def get_documents():
     """Get list of processed documents"""
     try:
@@ -343,77 +260,170 @@ def get_documents():
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
-@ocr_bp.route('/documents/<doc_id>', methods=['GET'])
+@ocr_bp.route('/documents/<uuid:doc_id>', methods=['GET'])
+@read_only
 def get_document(doc_id):
-    """Get single document details"""
+    """Get single document details (ETag / Last-Modified, 304 when unchanged)"""
     try:
-        doc = Document.query.get(doc_id)
-        if not doc:
+        # Validators come from the timestamps alone, so a 304 never loads the text columns
+        stamps = db.session.query(
+            Document.updated_at, Document.processed_at, Document.created_at
+        ).filter(Document.id == doc_id).first()
+        if not stamps:
             return jsonify({"success": False, "error": "Document not found"}), 404
         
-        return jsonify({
+        last_modified = stamps.updated_at or stamps.processed_at or stamps.created_at
+        etag = record_etag('doc', doc_id, last_modified)
+        if is_not_modified(etag, last_modified):
+            return not_modified_response(etag, detail_cache_control())
+        
+        doc = Document.query.get(doc_id)
+        return conditional_json({
             "success": True,
             "data": {
                 **doc.to_dict(),
                 "ocr_text": doc.ocr_text,
                 "translated_text": doc.translated_text
             }
+        }, etag, last_modified=last_modified, cache_control=detail_cache_control())
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+LANGUAGE_ALIASES = {
+    'ur': ['ur', 'urd', 'urdu'],
+    'hi': ['hi', 'hin', 'hindi'],
+    'en': ['en', 'eng', 'english'],
+    'pa': ['pa', 'pan', 'punjabi'],
+}
+
+@ocr_bp.route('/search', methods=['GET'])
+@read_only
+def search_documents():
+    """Ranked full-text search over OCR and translated text"""
+    from document.search_index import search_documents as run_search, make_snippet
+
+    q = (request.args.get('q') or '').strip()
+    if not q:
+        return jsonify({"success": False, "error": "No search query provided"}), 400
+
+    try:
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = min(max(request.args.get('per_page', 20, type=int), 1), 100)
+        language = request.args.get('language')
+        languages = LANGUAGE_ALIASES.get(language, [language]) if language else None
+
+        start_time = time.time()
+        with_total = request.args.get('total', 'true').lower() not in ('0', 'false', 'no')
+        total, hits, has_more = run_search(
+            db.session, q,
+            district=request.args.get('district'),
+            tehsil=request.args.get('tehsil'),
+            languages=languages,
+            page=page,
+            per_page=per_page,
+            with_total=with_total
+        )
+
+        docs = {}
+        if hits:
+            docs = {doc.id: doc for doc in Document.query.filter(Document.id.in_([h[0] for h in hits])).all()}
+
+        results = []
+        for doc_id, rank in hits:
+            doc = docs.get(doc_id)
+            if not doc:
+                continue
+            results.append({
+                'id': doc.id,
+                'filename': doc.filename,
+                'district': doc.district,
+                'tehsil': doc.tehsil,
+                'khasra_number': doc.khasra_number,
+                'detected_language': doc.detected_language,
+                'processed_at': doc.processed_at.isoformat() if doc.processed_at else None,
+                'rank': round(float(rank or 0), 4),
+                'ocr_snippet': make_snippet(doc.ocr_text, q),
+                'translated_snippet': make_snippet(doc.translated_text, q)
+            })
+
+        return jsonify({
+            "success": True,
+            "data": {
+                "results": results,
+                "total": total,
+                "has_more": has_more,
+                "page": page,
+                "per_page": per_page,
+                "query_time_ms": int((time.time() - start_time) * 1000)
+            }
         })
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
+@ocr_bp.route('/export', methods=['GET'])
+@read_only
+def export_documents():
+    """
+    Stream processed documents with OCR and translated text
+    
+    Query params: format=ndjson|parquet, since, until (ISO dates), district,
+    status (default processed), after (resume cursor), limit
+    """
+    from flask import Response, send_file, stream_with_context
+    from document.corpus_export import build_query, iter_ndjson, write_parquet
+    import tempfile
+    
+    fmt = request.args.get('format', 'ndjson').lower()
+    filters = {
+        'since': request.args.get('since'),
+        'until': request.args.get('until'),
+        'district': request.args.get('district'),
+        'status': request.args.get('status', 'processed'),
+        'after': request.args.get('after')
+    }
+    limit = request.args.get('limit', type=int)
+    
+    try:
+        build_query(**filters)  # validate filters before streaming starts
+        
+        if fmt == 'ndjson':
+            return Response(
+                stream_with_context(iter_ndjson(db.session, limit=limit, **filters)),
+                mimetype='application/x-ndjson; charset=utf-8',
+                headers={'Content-Disposition': 'attachment; filename=documents.ndjson'}
+            )
+        if fmt == 'parquet':
+            # Parquet needs its footer written last, so spool to a temp file
+            tmp = tempfile.NamedTemporaryFile(suffix='.parquet', delete=False)
+            tmp.close()
+            try:
+                rows, last_cursor = write_parquet(db.session, tmp.name, limit=limit, **filters)
+                response = send_file(tmp.name, mimetype='application/vnd.apache.parquet',
+                                     as_attachment=True, download_name='documents.parquet')
+            except BaseException:
+                os.remove(tmp.name)
+                raise
+            response.headers['X-Export-Rows'] = str(rows)
+            if last_cursor:
+                response.headers['X-Export-Cursor'] = last_cursor
+            response.call_on_close(lambda: os.remove(tmp.name))
+            return response
+        return jsonify({"success": False, "error": "format must be 'ndjson' or 'parquet'"}), 400
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except RuntimeError as e:
+        return jsonify({"success": False, "error": str(e)}), 501
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
 @ocr_bp.route('/district-progress', methods=['GET'])
+@read_only
 def get_district_progress():
     """Get progress by district"""
     try:
-        # Group documents by district
-        district_stats = db.session.query(
-            Document.district,
-            func.count(Document.id).label('completed')
-        ).filter(
-            Document.processing_status == 'processed',
-            Document.district.isnot(None)
-        ).group_by(Document.district).all()
-        
-        # Estimated totals per district (you can adjust these)
-        district_targets = {
-            'Srinagar': 5000,
-            'Jammu': 4500,
-            'Anantnag': 3000,
-            'Baramulla': 2500,
-            'Udhampur': 2000,
-            'Pulwama': 1500,
-            'Budgam': 1500,
-            'Kupwara': 1500
-        }
-        
-        progress = []
-        for dist, completed in district_stats:
-            total = district_targets.get(dist, 1000)
-            progress.append({
-                'name': dist,
-                'total': total,
-                'completed': completed,
-                'percentage': round((completed / total) * 100, 1) if total > 0 else 0
-            })
-        
-        # Add districts with no processed documents yet
-        processed_districts = {p['name'] for p in progress}
-        for dist, total in district_targets.items():
-            if dist not in processed_districts:
-                progress.append({
-                    'name': dist,
-                    'total': total,
-                    'completed': 0,
-                    'percentage': 0
-                })
-        
-        # Sort by percentage descending
-        progress.sort(key=lambda x: x['percentage'], reverse=True)
-        
         return jsonify({
             "success": True,
-            "data": progress
+            "data": compute_district_progress()
         })
     except Exception as e:
         return jsonify({"success": False, "error": str(e), "data": []})
@@ -421,7 +431,7 @@ def get_district_progress():
 
 # New endpoints for PDF generation and AI features
 
-@ocr_bp.route('/generate-pdf/<int:doc_id>', methods=['POST'])
+@ocr_bp.route('/generate-pdf/<uuid:doc_id>', methods=['POST'])
 def generate_pdf_from_ocr(doc_id):
     """Generate PDF from OCR processed document"""
     from document.pdf_generator import generate_ocr_pdf
@@ -464,7 +474,7 @@ def generate_pdf_from_ocr(doc_id):
         return jsonify({"success": False, "error": str(e)}), 500
 
 
-@ocr_bp.route('/download-pdf/<int:doc_id>', methods=['GET'])
+@ocr_bp.route('/download-pdf/<uuid:doc_id>', methods=['GET'])
 def download_pdf(doc_id):
     """Download generated PDF"""
     from flask import send_file
@@ -488,7 +498,7 @@ def download_pdf(doc_id):
         return jsonify({"success": False, "error": str(e)}), 500
 
 
-@ocr_bp.route('/summarize/<int:doc_id>', methods=['POST'])
+@ocr_bp.route('/summarize/<uuid:doc_id>', methods=['POST'])
 def summarize_document(doc_id):
     """Generate AI summary using Google Gemini"""
     from common.gemini_ai import summarize_with_gemini
@@ -520,7 +530,7 @@ def summarize_document(doc_id):
         return jsonify({"success": False, "error": str(e)}), 500
 
 
-@ocr_bp.route('/ask-question/<int:doc_id>', methods=['POST'])
+@ocr_bp.route('/ask-question/<uuid:doc_id>', methods=['POST'])
 def ask_document_question(doc_id):
     """Ask a question about the document using AI"""
     from common.gemini_ai import ask_question_about_document
@@ -550,7 +560,7 @@ def ask_document_question(doc_id):
         return jsonify({"success": False, "error": str(e)}), 500
 
 
-@ocr_bp.route('/save-to-database/<int:doc_id>', methods=['POST'])
+@ocr_bp.route('/save-to-database/<uuid:doc_id>', methods=['POST'])
 def save_document_permanent(doc_id):
     """Mark document as permanently saved with additional metadata"""
     try:
@@ -573,8 +583,8 @@ def save_document_permanent(doc_id):
             doc.khasra_number = extracted.get('khasra_number')
             doc.area_kanal = extracted.get('area_kanal')
             doc.area_marla = extracted.get('area_marla')
-            doc.tehsil = extracted.get('tehsil')
-            doc.district = extracted.get('district')
+            set_document_places(doc, extracted.get('district'), extracted.get('tehsil'),
+                                extracted.get('mauza') or doc.mauza_raw or doc.mauza)
         
         db.session.commit()
         
@@ -1,12 +1,72 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 import os
+import tempfile
 import time
-import fitz  # PyMuPDF for PDF parsing
-from translation.ai4bharat_translator import translate_urdu_to_english
-from translation.simple_translator import apply_domain_terms, LAND_RECORD_TERMS
+from translation.ai4bharat_translator import LANGUAGES, model_registry, translate_batch
+from document.pdf_extractor import extract_pages, page_count
+from translation.document_stream import FORMATS, format_event, translate_pages
+from translation.model_manager import ModelUnavailableError
+from translation.segmenter import reassemble, segment_document
+from translation.simple_translator import apply_domain_terms, get_detected_terms, LAND_RECORD_TERMS
+from translation.translation_memory import translation_memory
+from translation.transliterator import transliterate_batch
 
 translation_bp = Blueprint('translation', __name__)
 
+def _stream_format():
+    """'ndjson' or 'sse' when the client asked for a streamed response, else None"""
+    fmt = (request.args.get('stream') or '').lower()
+    if fmt in ('1', 'true', 'yes', 'ndjson'):
+        return 'ndjson'
+    if fmt == 'sse' or 'text/event-stream' in request.headers.get('Accept', ''):
+        return 'sse'
+    if 'application/x-ndjson' in request.headers.get('Accept', ''):
+        return 'ndjson'
+    return None
+
+def _source_language(value):
+    """Requested source language, or None to detect it per segment; ValueError if unsupported"""
+    if not value or value == 'auto':
+        return None
+    if value not in LANGUAGES:
+        raise ValueError(f"Unsupported source_lang '{value}' (expected auto or one of {', '.join(LANGUAGES)})")
+    return value
+
+def _target_language(value):
+    """Requested target language, English by default; ValueError if unsupported"""
+    if not value:
+        return 'en'
+    if value not in LANGUAGES:
+        raise ValueError(f"Unsupported target_lang '{value}' (expected one of {', '.join(LANGUAGES)})")
+    return value
+
+def _save_upload(file):
+    """Save an uploaded PDF to a temporary file; extraction workers open it by path"""
+    fd, path = tempfile.mkstemp(suffix='.pdf')
+    with os.fdopen(fd, 'wb') as out:
+        file.save(out)
+    return path
+
+def _stream_document(file, fmt, source_lang, target_lang):
+    """Translate an uploaded PDF page by page, sending each page as it is done"""
+    path = _save_upload(file)
+
+    def generate():
+        try:
+            for event in translate_pages(page_count(path), extract_pages(path), source_lang, target_lang):
+                yield format_event(event, fmt)
+        except Exception as e:
+            yield format_event({"type": "error", "error": str(e), "status": 500}, fmt)
+        finally:
+            os.remove(path)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype=FORMATS[fmt],
+        # Proxies (nginx) must not buffer the stream
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @translation_bp.route('/text', methods=['POST'])
 def translate_text():
     data = request.get_json()
@@ -16,22 +76,29 @@ def translate_text():
     
     if not text:
         return jsonify({"success": False, "error": "No text provided"}), 400
+    try:
+        source_lang = _source_language(source_lang)
+        target_lang = _target_language(target_lang)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
         
     try:
         start_time = time.time()
         
-        # Currently only supporting Urdu to English as per the implemented function
-        # In a real app, we would switch based on source_lang
-        translated_text = translate_urdu_to_english(text)
-        
-        # Apply domain-specific land record terms
-        translated_text = apply_domain_terms(translated_text)
+        # The source language is detected per sentence unless given; each language
+        # pair is translated by its direction's model (indic-en, en-indic, indic-indic)
+        # One segment per sentence, so repeated phrasing is served from the translation memory
+        segments = segment_document(text)
+        translated_pages = reassemble(segments, translate_batch(
+            [segment for *_, segment in segments], source_lang=source_lang, target_lang=target_lang
+        ))
+        translated_text = "\n\n".join(page_text for _, page_text in translated_pages)
         
-        # Find which domain terms were applied
+        # Apply domain-specific land record terms (English glosses, so only into English)
         terms_applied = []
-        for term in LAND_RECORD_TERMS.keys():
-            if term in text:
-                terms_applied.append(LAND_RECORD_TERMS[term])
+        if target_lang == 'en':
+            translated_text = apply_domain_terms(translated_text)
+            terms_applied = [replacement for _, replacement in get_detected_terms(text)]
         
         processing_time = int((time.time() - start_time) * 1000)
         
@@ -40,20 +107,31 @@ def translate_text():
             "data": {
                 "translated": translated_text,
                 "domain_terms_applied": terms_applied,
-                "processing_time_ms": processing_time
+                "processing_time_ms": processing_time,
+                "source_lang": source_lang or 'auto',
+                "target_lang": target_lang
             }
         })
+    except ModelUnavailableError as e:
+        return jsonify({"success": False, "error": f"Translation unavailable: {e}"}), 503
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
 @translation_bp.route('/document', methods=['POST'])
 def translate_document():
-    """Translate PDF document with support for 100+ pages"""
+    """
+    Translate PDF document with support for 100+ pages
+
+    With ?stream=1 (or Accept: application/x-ndjson) each page is sent as an
+    NDJSON line as soon as it is translated; ?stream=sse (or Accept:
+    text/event-stream) sends Server-Sent Events instead. See
+    translation/document_stream.py for the events.
+    """
     if 'file' not in request.files:
         return jsonify({"success": False, "error": "No file provided"}), 400
     
     file = request.files['file']
-    source_lang = request.form.get('source_lang', 'ur')
+    source_lang = request.form.get('source_lang', 'auto')
     target_lang = request.form.get('target_lang', 'en')
     
     if file.filename == '':
@@ -61,58 +139,57 @@ def translate_document():
     
     if not file.filename.lower().endswith('.pdf'):
         return jsonify({"success": False, "error": "Only PDF files are supported"}), 400
+    try:
+        requested_lang = _source_language(source_lang)
+        target_lang = _target_language(target_lang)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    
+    stream_format = _stream_format()
+    if stream_format:
+        return _stream_document(file, stream_format, requested_lang, target_lang)
     
     try:
         start_time = time.time()
         
-        # Read PDF content
-        pdf_bytes = file.read()
-        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-        
-        total_pages = len(doc)
-        extracted_text = []
-        
-        # Extract text from each page
-        for page_num in range(total_pages):
-            page = doc.load_page(page_num)
-            text = page.get_text("text")
-            if text.strip():
-                extracted_text.append(f"--- Page {page_num + 1} ---\n{text}")
+        # Text layer of every page, Google Vision OCR for scanned pages
+        path = _save_upload(file)
+        try:
+            pages = list(extract_pages(path))
+        finally:
+            os.remove(path)
         
-        doc.close()
+        total_pages = len(pages)
+        extracted_text = [
+            f"--- Page {page['page']} ---\n{page['text']}" for page in pages if page['text'].strip()
+        ]
+        ocr_pages = [page['page'] for page in pages if page['source'] == 'ocr']
         
         # Combine all text
         full_text = "\n\n".join(extracted_text)
         
         if not full_text.strip():
+            ocr_errors = [page['error'] for page in pages if page['error']]
             return jsonify({
                 "success": False, 
-                "error": "No text could be extracted from the PDF. The document may be scanned images. Please use OCR first."
+                "error": "No text could be extracted from the PDF, even with OCR."
+                         + (f" {ocr_errors[0]}" if ocr_errors else "")
             }), 400
         
-        # Translate the text (handle large documents in chunks)
-        MAX_CHUNK_SIZE = 5000  # Characters per chunk
-        translated_chunks = []
+        # Sentences under the model's token limit; cache misses are translated in batches
+        segments = segment_document(full_text)
+        translated_pages = reassemble(segments, translate_batch(
+            [segment for *_, segment in segments], source_lang=requested_lang, target_lang=target_lang
+        ))
+        translated_text = "\n\n".join(
+            f"--- Page {page} ---\n{text}" if page is not None else text
+            for page, text in translated_pages
+        )
         
-        # Split text into manageable chunks
-        text_chunks = [full_text[i:i+MAX_CHUNK_SIZE] for i in range(0, len(full_text), MAX_CHUNK_SIZE)]
-        
-        for chunk in text_chunks:
-            if chunk.strip():
-                translated_chunk = translate_urdu_to_english(chunk)
-                translated_chunks.append(translated_chunk)
-        
-        # Combine translated text
-        translated_text = " ".join(translated_chunks)
-        
-        # Apply domain-specific land record terms
-        translated_text = apply_domain_terms(translated_text)
-        
-        # Find which domain terms were applied
-        terms_applied = []
-        for term, replacement in LAND_RECORD_TERMS.items():
-            if term in full_text:
-                terms_applied.append(replacement)
+        # Apply domain-specific land record terms (English glosses, so only into English)
+        domain_terms = apply_domain_terms if target_lang == 'en' else (lambda text: text)
+        translated_text = domain_terms(translated_text)
+        terms_applied = [replacement for _, replacement in get_detected_terms(full_text)] if target_lang == 'en' else []
         
         processing_time = int((time.time() - start_time) * 1000)
         
@@ -122,19 +199,56 @@ def translate_document():
                 "translated_text": translated_text,
                 "original_text": full_text[:2000] + ("..." if len(full_text) > 2000 else ""),
                 "pages_processed": total_pages,
+                "ocr_pages": ocr_pages,
+                "translated_pages": [
+                    {"page": page, "translated_text": domain_terms(text)}
+                    for page, text in translated_pages
+                ],
+                "segments": len(segments),
                 "total_characters": len(full_text),
-                "domain_terms_applied": list(set(terms_applied)),
+                "domain_terms_applied": terms_applied,
                 "processing_time_ms": processing_time,
                 "source_lang": source_lang,
                 "target_lang": target_lang
             }
         })
         
+    except ModelUnavailableError as e:
+        return jsonify({"success": False, "error": f"Translation unavailable: {e}"}), 503
     except Exception as e:
         import traceback
         traceback.print_exc()
         return jsonify({"success": False, "error": str(e)}), 500
 
+@translation_bp.route('/transliterate', methods=['POST'])
+def transliterate_names():
+    """
+    Transliterate names between Urdu, Devanagari and Latin
+
+    Body: {"names": [...]} (or "text"), "target_script": urdu|devanagari|latin,
+    "source_script": auto (default) or a script
+    """
+    data = request.get_json() or {}
+    names = data.get('names')
+    if names is None and data.get('text') is not None:
+        names = [data['text']]
+    if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+        return jsonify({"success": False, "error": "Provide 'names' as a list of strings or 'text'"}), 400
+    
+    try:
+        results = transliterate_batch(names, data.get('source_script', 'auto'), data.get('target_script', 'latin'))
+        return jsonify({
+            "success": True,
+            "data": {
+                "results": results,
+                "count": len(results)
+            }
+        })
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
 @translation_bp.route('/terms', methods=['GET'])
 def get_domain_terms():
     """Get list of supported domain-specific land record terms"""
@@ -145,3 +259,24 @@ def get_domain_terms():
             "count": len(LAND_RECORD_TERMS)
         }
     })
+
+@translation_bp.route('/memory', methods=['GET'])
+def get_translation_memory_stats():
+    """Translation memory hit rates for this worker since it started"""
+    return jsonify({
+        "success": True,
+        "data": translation_memory.stats()
+    })
+
+@translation_bp.route('/models', methods=['GET'])
+def get_translation_models():
+    """
+    Translation models of this worker: state, memory, loads, evictions and latency
+
+    With a translation service configured the models live in its replicas
+    and this worker's registry stays empty.
+    """
+    return jsonify({
+        "success": True,
+        "data": model_registry.status()
+    })
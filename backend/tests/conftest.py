@@ -0,0 +1,48 @@
+"""
+Shared fixtures: a fresh app on a temporary SQLite database per test
+
+Run from backend/:  python -m pytest -q tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from config import Config  # noqa: E402
+from extensions import db  # noqa: E402
+
+
+@pytest.fixture
+def app(tmp_path):
+    class TestConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'test.db'}"
+        SQLALCHEMY_BINDS = {}
+        UPLOAD_FOLDER = str(tmp_path / 'uploads')
+        TESTING = True
+        AUTO_CREATE_SCHEMA = True
+        TRANSLATION_WARMUP = False
+
+    app = create_app(TestConfig)
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def add(app):
+    """Insert model rows and commit: add(Document(...), Farmer(...))"""
+    def add(*rows):
+        with app.app_context():
+            db.session.add_all(rows)
+            db.session.commit()
+            return [row.id for row in rows]
+    return add
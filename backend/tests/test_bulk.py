@@ -0,0 +1,99 @@
+import io
+import json
+
+from extensions import db
+from models import DisputedLand, DisputeFacet, Document, Farmer, LandParcel
+
+
+def test_csv_import_reports_bad_rows(client, app):
+    body = (
+        'khasra_number,mauza,tehsil,district,area_kanal\n'
+        '12/3,Rakh,Jammu,Jammu,4.5\n'
+        ',Rakh,Jammu,Jammu,2\n'
+        '14,Rakh,Jammu,Jammu,lots\n'
+    )
+    response = client.post('/api/bulk/land-parcels/import?format=csv', data=body, content_type='text/csv')
+    assert response.status_code == 207
+    report = response.get_json()['data']
+    assert (report['inserted'], report['failed']) == (1, 2)
+    assert [error['line'] for error in report['errors']] == [3, 4]
+
+    with app.app_context():
+        parcel = db.session.execute(db.select(LandParcel)).scalar_one()
+        assert (parcel.khasra_number, parcel.khasra_normalized, parcel.area_kanal) == ('12/3', '12/3', 4.5)
+
+
+def test_ndjson_upload_updates_dispute_facets(client, app):
+    rows = [
+        {'khasra_number': '7', 'tehsil': 'Bishnah', 'district': 'Jammu', 'dispute_type': 'refugee_claim',
+         'claimants': [{'name': 'Ram Lal'}]},
+        {'khasra_number': '8', 'tehsil': 'Bishnah', 'district': 'Jammu', 'dispute_type': 'refugee_claim'},
+    ]
+    upload = io.BytesIO(''.join(json.dumps(row) + '\n' for row in rows).encode())
+    response = client.post('/api/bulk/disputed-lands/import', data={'file': (upload, 'disputes.ndjson')})
+    assert response.status_code == 200
+    assert response.get_json()['data']['inserted'] == 2
+
+    with app.app_context():
+        disputes = db.session.execute(db.select(DisputedLand).order_by(DisputedLand.khasra_number)).scalars().all()
+        assert [dispute.claimants_count for dispute in disputes] == [1, 0]
+        facet = db.session.execute(db.select(DisputeFacet).filter_by(dimension='district', value='Jammu')).scalar_one()
+        assert facet.count == 2
+
+
+def test_dry_run_inserts_nothing(client, app):
+    body = 'name_local,district\nرشید,Srinagar\n'
+    data = client.post('/api/bulk/farmers/import?dry_run=1', data=body, content_type='text/csv').get_json()['data']
+    assert (data['valid'], data['inserted'], data['dry_run']) == (1, 0, True)
+    with app.app_context():
+        assert db.session.execute(db.select(Farmer)).first() is None
+
+
+def test_unknown_entity_is_rejected(client):
+    response = client.post('/api/bulk/owners/import', data='a\n1\n', content_type='text/csv')
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+
+def test_bulk_export_streams_filtered_rows(client, add):
+    add(Farmer(name_english='Rashid', district='Srinagar'), Farmer(name_english='Vikram', district='Jammu'))
+
+    response = client.get('/api/bulk/farmers/export?format=ndjson&district=Jammu')
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [row['name_english'] for row in rows] == ['Vikram']
+
+    response = client.get('/api/bulk/farmers/export')
+    assert response.mimetype == 'text/csv'
+    assert len(response.get_data(as_text=True).strip().splitlines()) == 3
+
+
+def test_document_export_resumes_after_cursor(client, add):
+    add(*(Document(filename=f'record{i}.pdf', file_type='pdf', processing_status='processed')
+          for i in range(3)))
+
+    first = client.get('/api/ocr/export?limit=2')
+    assert first.status_code == 200
+    rows = [json.loads(line) for line in first.get_data(as_text=True).splitlines()]
+    assert len(rows) == 2
+
+    rest = client.get(f"/api/ocr/export?after={rows[-1]['cursor']}").get_data(as_text=True).splitlines()
+    filenames = [row['filename'] for row in rows] + [json.loads(line)['filename'] for line in rest]
+    assert sorted(filenames) == ['record0.pdf', 'record1.pdf', 'record2.pdf']
+
+
+def test_document_export_rejects_bad_cursor(client):
+    response = client.get('/api/ocr/export?after=not-a-cursor')
+    assert response.status_code == 400
+
+
+def test_parquet_export_needs_pyarrow(client, add):
+    add(Document(filename='a.pdf', file_type='pdf', processing_status='processed'))
+    response = client.get('/api/ocr/export?format=parquet')
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        assert response.status_code == 501
+    else:
+        assert response.status_code == 200
+        assert response.headers['X-Export-Rows'] == '1'
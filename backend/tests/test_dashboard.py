@@ -0,0 +1,47 @@
+import time
+
+from common import data_version
+
+
+def _etag(client, etag=None):
+    headers = {'If-None-Match': etag} if etag else {}
+    response = client.get('/api/dashboard', headers=headers)
+    return response.status_code, response.headers.get('ETag')
+
+
+def test_unchanged_dashboard_answers_304(client):
+    status, etag = _etag(client)
+    assert status == 200
+    assert _etag(client, etag) == (304, etag)
+
+
+def test_etag_changes_after_a_create(app, client):
+    _, etag = _etag(client)
+
+    start = time.perf_counter()
+    response = client.post('/api/disputed-lands', json={'khasra_number': '12/4', 'district': 'Srinagar',
+                                                             'tehsil': 'Khanyar'})
+    assert response.status_code == 201
+    assert time.perf_counter() - start < 2  # no wait on a locked database
+
+    status, new_etag = _etag(client, etag)
+    assert status == 200
+    assert new_etag != etag
+    assert client.get('/api/dashboard').get_json()['data']['dispute_stats']['total_disputes'] == 1
+    assert _etag(client, new_etag) == (304, new_etag)
+
+
+def test_rollback_keeps_the_version(app):
+    from extensions import db
+    from models import Document
+
+    with app.app_context():
+        before = data_version.get_version()
+        db.session.add(Document(filename='a.pdf', file_type='pdf'))
+        db.session.flush()
+        db.session.rollback()
+        assert data_version.get_version() == before
+
+        db.session.add(Document(filename='a.pdf', file_type='pdf'))
+        db.session.commit()
+        assert data_version.get_version() == before + 1
@@ -0,0 +1,31 @@
+from common import dispute_summary
+
+
+def _create(client, **fields):
+    payload = {'khasra_number': '12/4', 'district': 'Srinagar', 'tehsil': 'Khanyar',
+               'dispute_type': 'inheritance', **fields}
+    response = client.post('/api/disputed-lands', json=payload)
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()['data']['id']
+
+
+def test_facets_follow_create_update_delete(app, client):
+    first = _create(client)
+    _create(client, tehsil='Hazratbal', partition_impact=True)
+    _create(client, district='Jammu', tehsil='Gandhinagar', dispute_type='boundary')
+
+    stats = client.get('/api/disputed-lands/stats').get_json()['data']
+    assert stats['total_disputes'] == 3
+    assert stats['by_district'] == {'Srinagar': 2, 'Jammu': 1}
+    assert stats['partition_affected'] == 1
+    tehsils = client.get('/api/disputed-lands/tehsils?district=Srinagar').get_json()['data']
+    assert tehsils == ['Hazratbal', 'Khanyar']
+
+    assert client.put(f'/api/disputed-lands/{first}', json={'dispute_status': 'resolved'}).status_code == 200
+    assert client.delete(f'/api/disputed-lands/{first}').status_code == 200
+
+    stats = client.get('/api/disputed-lands/stats').get_json()['data']
+    assert stats['total_disputes'] == 2
+    assert client.get('/api/disputed-lands/tehsils?district=Srinagar').get_json()['data'] == ['Hazratbal']
+    with app.app_context():
+        assert dispute_summary.check_consistency() == []
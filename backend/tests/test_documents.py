@@ -0,0 +1,23 @@
+from models import Document
+
+
+def test_documents_list_pages(client, add):
+    add(*(Document(filename=f'record{i}.pdf', file_type='pdf', processing_status='processed')
+          for i in range(3)))
+
+    response = client.get('/api/ocr/documents?per_page=2')
+    assert response.status_code == 200
+    data = response.get_json()['data']
+    assert data['total'] == 3
+    assert len(data['documents']) == 2
+
+    data = client.get('/api/ocr/documents?per_page=2&page=2').get_json()['data']
+    assert len(data['documents']) == 1
+
+
+def test_documents_list_filters_status(client, add):
+    add(Document(filename='a.pdf', file_type='pdf', processing_status='processed'),
+        Document(filename='b.pdf', file_type='pdf', processing_status='failed'))
+
+    data = client.get('/api/ocr/documents?status=failed').get_json()['data']
+    assert [doc['filename'] for doc in data['documents']] == ['b.pdf']
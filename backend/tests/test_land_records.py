@@ -0,0 +1,54 @@
+from models import Document, DisputedLand, LandParcel
+
+URDU_RECORD = 'ضلع سرینگر تحصیل خانیار موضع نوشہرہ خسرہ نمبر ۱۲/۴ مالک: محمد یوسف'
+
+
+def _ingest(app, text):
+    from extensions import db
+    from routes.ocr_routes import _create_document
+
+    with app.app_context():
+        doc = _create_document('/tmp/record.jpg', b'', {'text': text, 'detected_language': 'ur'}, 10)
+        db.session.commit()
+        return doc.id
+
+
+def test_ocr_places_are_stored_as_read_and_canonical(app, client, add):
+    add(LandParcel(khasra_number='12/4', district='Srinagar', tehsil='Khanyar', mauza='Nowshehra'))
+    doc_id = _ingest(app, URDU_RECORD)
+
+    doc = client.get(f'/api/ocr/documents/{doc_id}').get_json()['data']
+    assert (doc['district_raw'], doc['tehsil_raw'], doc['mauza_raw']) == ('سرینگر', 'خانیار', 'نوشہرہ')
+    assert (doc['district'], doc['tehsil'], doc['mauza']) == ('Srinagar', 'Khanyar', 'Nowshehra')
+
+
+def test_lookup_joins_urdu_documents_with_english_rows(app, client, add):
+    add(LandParcel(khasra_number='12/4', district='Srinagar', tehsil='Khanyar', mauza='Nowshehra'),
+        DisputedLand(khasra_number='۱۲/۴', district='Srinagar', tehsil='Khanyar'),
+        LandParcel(khasra_number='12/4', district='Jammu', tehsil='Bahu'))
+    _ingest(app, URDU_RECORD)
+
+    response = client.get('/api/land-records/lookup?khasra=12-4&district=srinagar&tehsil=Khanyar')
+    assert response.status_code == 200
+    data = response.get_json()['data']
+    assert (len(data['documents']), len(data['land_parcels']), len(data['disputed_lands'])) == (1, 1, 1)
+
+    assert client.get('/api/land-records/lookup').status_code == 400
+
+
+def test_district_progress_counts_urdu_documents_under_the_target(app, client):
+    _ingest(app, 'ضلع سرینگر خسرہ نمبر ۷')
+    _ingest(app, 'जिला जम्मू खसरा नंबर 8')
+
+    progress = {row['name']: row for row in client.get('/api/ocr/district-progress').get_json()['data']}
+    assert progress['Srinagar']['completed'] == 1
+    assert progress['Jammu']['completed'] == 1
+    assert 'سرینگر' not in progress
+
+
+def test_unknown_places_are_transliterated(app):
+    from common.place_names import canonical_places
+
+    with app.app_context():
+        places = canonical_places('بارہمولہ', 'حضرت بل', None)
+    assert places == {'district': 'Baramulla', 'tehsil': 'Hazrat Bal', 'mauza': None}
@@ -0,0 +1,57 @@
+import threading
+
+import pytest
+
+from translation.model_manager import ModelManager, ModelUnavailableError
+
+
+def test_loads_once_for_concurrent_callers():
+    loads = []
+    manager = ModelManager('fake', lambda: loads.append(1) or {'model': 'fake'})
+    threads = [threading.Thread(target=manager.get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(loads) == 1
+    assert manager.ready
+
+
+def test_get_never_returns_an_evicted_bundle():
+    manager = ModelManager('fake', lambda: {'model': 'fake'})
+    results = []
+    stop = threading.Event()
+
+    def evict():
+        while not stop.is_set():
+            manager.reset()
+
+    evictor = threading.Thread(target=evict)
+    evictor.start()
+    try:
+        for _ in range(20000):
+            results.append(manager.get())
+    finally:
+        stop.set()
+        evictor.join()
+    assert None not in results
+
+
+def test_failure_is_remembered_until_reset():
+    attempts = []
+
+    def loader():
+        attempts.append(1)
+        raise OSError('weights missing')
+
+    manager = ModelManager('fake', loader)
+    for _ in range(2):
+        with pytest.raises(ModelUnavailableError, match='weights missing'):
+            manager.get()
+    assert len(attempts) == 1
+    assert manager.status()['state'] == 'failed'
+
+    manager.reset()
+    with pytest.raises(ModelUnavailableError):
+        manager.get()
+    assert len(attempts) == 2
@@ -0,0 +1,67 @@
+from models import Document
+
+
+def _documents(add):
+    add(
+        Document(filename='urdu.pdf', ocr_text='خسرہ نمبر ۱۲۳ مالک محمد يوسف', translated_text='Khasra 123 owner Muhammad Yusuf',
+                 district='Srinagar', detected_language='ur'),
+        Document(filename='hindi.pdf', ocr_text='किसान का खेत', translated_text='farmer field owner',
+                 district='Jammu', detected_language='hi'),
+        Document(filename='english.pdf', ocr_text='owner of the orchard', district='Jammu', detected_language='en'),
+    )
+
+
+def _search(client, query):
+    response = client.get(f'/api/ocr/search?{query}')
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()['data']
+
+
+def test_search_folds_urdu_spellings(client, add):
+    _documents(add)
+    # Arabic yeh in the record, Urdu yeh in the query
+    assert [r['filename'] for r in _search(client, 'q=محمد یوسف')['results']] == ['urdu.pdf']
+    assert _search(client, 'q=123')['total'] == 1
+
+
+def test_search_filters_and_pages(client, add):
+    _documents(add)
+    assert _search(client, 'q=owner')['total'] == 3
+    assert _search(client, 'q=owner&district=Jammu')['total'] == 2
+    assert _search(client, 'q=owner&language=ur')['total'] == 1
+
+    first = _search(client, 'q=owner&per_page=2')
+    assert (len(first['results']), first['total'], first['has_more']) == (2, 3, True)
+    second = _search(client, 'q=owner&per_page=2&page=2&total=false')
+    assert (len(second['results']), second['total'], second['has_more']) == (1, None, False)
+    assert {r['id'] for r in first['results']}.isdisjoint(r['id'] for r in second['results'])
+
+
+def test_search_follows_updates_and_deletes(app, client, add):
+    from extensions import db
+
+    (doc_id,) = add(Document(filename='a.pdf', ocr_text='apple orchard'))
+    with app.app_context():
+        doc = db.session.get(Document, doc_id)
+        doc.ocr_text = 'walnut orchard'
+        db.session.commit()
+        assert _search(client, 'q=apple')['total'] == 0
+        assert _search(client, 'q=walnut')['total'] == 1
+        db.session.delete(doc)
+        db.session.commit()
+    assert _search(client, 'q=orchard')['total'] == 0
+
+
+def test_search_requires_a_query(client):
+    assert client.get('/api/ocr/search?q=').status_code == 400
+
+
+def test_like_fallback(app, add):
+    from extensions import db
+    from document.search_index import _like_search
+
+    _documents(add)
+    with app.app_context():
+        total, hits, has_more = _like_search(db.session, 'Owner', 'Jammu', None, None, 1, 1, True)
+        assert (total, len(hits), has_more) == (2, 1, True)
+        assert _like_search(db.session, '100%', None, None, None, 1, 20, True)[0] == 0
@@ -0,0 +1,44 @@
+import pytest
+
+from translation.transliterator import transliterate, transliterate_batch
+
+
+@pytest.mark.parametrize('latin, devanagari', [
+    ('Krishna', 'क्रिश्ना'),
+    ('Preeti', 'प्रीती'),
+    ('Vikram', 'विक्रम'),
+    ('Indra', 'इंद्रा'),
+    ('Vidya', 'विद्या'),
+    ('Vijay', 'विजय'),
+    ('Ravi', 'रवी'),
+])
+def test_latin_to_devanagari(latin, devanagari):
+    assert transliterate(latin, 'latin', 'devanagari') == devanagari
+
+
+@pytest.mark.parametrize('name', ['Krishna', 'Vikram', 'Indra', 'Vijay', 'Sajid'])
+def test_devanagari_reads_back_to_the_same_latin(name):
+    assert transliterate(transliterate(name, 'latin', 'devanagari'), 'devanagari', 'latin') == name
+
+
+@pytest.mark.parametrize('latin, urdu', [
+    ('Rashid', 'رشید'),
+    ('Bashir', 'بشیر'),
+    ('Vijay', 'ویجے'),
+])
+def test_latin_to_urdu(latin, urdu):
+    assert transliterate(latin, 'latin', 'urdu') == urdu
+
+
+def test_urdu_to_latin():
+    assert transliterate('ساجد', 'urdu', 'latin') == 'Sajid'
+    assert transliterate('نجمہ', 'urdu', 'latin') == 'Najma'
+
+
+def test_batch_detects_scripts_and_keeps_none():
+    assert transliterate_batch(['विक्रम सिंह', None, 'Vikram'], 'auto', 'latin') == ['Vikram Singh', None, 'Vikram']
+
+
+def test_endpoint(client):
+    response = client.post('/api/translate/transliterate', json={'names': ['Krishna'], 'target_script': 'devanagari'})
+    assert response.get_json()['data']['results'] == ['क्रिश्ना']
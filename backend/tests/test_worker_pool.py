@@ -0,0 +1,83 @@
+import pytest
+
+from translation.model_manager import ModelUnavailableError
+from translation.worker_pool import TranslationService
+
+
+class LostPool:
+    """A pool whose replica died: tasks are accepted and never called back"""
+
+    def __init__(self):
+        self.tasks = []
+
+    def apply_async(self, func, args, callback=None, error_callback=None):
+        self.tasks.append((callback, error_callback))
+
+
+class FakeConnection:
+    def __init__(self, *messages):
+        self.messages = list(messages)
+        self.sent = []
+
+    def recv(self):
+        if not self.messages:
+            raise EOFError
+        return self.messages.pop(0)
+
+    def send(self, message):
+        self.sent.append(message)
+
+    def close(self):
+        pass
+
+
+def _service(queue_size=2):
+    service = TranslationService('127.0.0.1:6199', replicas=1, queue_size=queue_size,
+                                 authkey=b'test', task_timeout=5)
+    service._pool = LostPool()
+    return service
+
+
+def _translate(service, *request_ids):
+    connection = FakeConnection(*(('translate', i, (['text'], 'ur', 'en')) for i in request_ids))
+    service._handle(connection)
+    return connection.sent
+
+
+def test_lost_batches_time_out_and_free_their_slots():
+    service = _service()
+    assert _translate(service, 1, 2) == []
+    assert _translate(service, 3)[0][0] == 'unavailable'  # queue full
+
+    assert service.expire_tasks() == 0
+    assert service.expire_tasks(now=float('inf')) == 2
+    assert service.status()['in_flight'] == 0
+    assert _translate(service, 4) == []  # slots are back
+
+
+def test_late_callbacks_are_dropped():
+    service = _service(queue_size=1)
+    connection = FakeConnection(('translate', 1, (['text'], 'ur', 'en')))
+    service._handle(connection)
+    callback, _ = service._pool.tasks[0]
+
+    service.expire_tasks(now=float('inf'))
+    callback(['late'])
+    assert [kind for kind, *_ in connection.sent] == ['unavailable']
+    assert service.status()['completed'] == 1
+
+
+def test_replica_errors_release_the_slot():
+    service = _service(queue_size=1)
+    connection = FakeConnection(('translate', 1, (['text'], 'ur', 'en')))
+    service._handle(connection)
+    _, error_callback = service._pool.tasks[0]
+
+    error_callback(ModelUnavailableError('no model'))
+    assert connection.sent == [('unavailable', 1, 'no model')]
+    assert _translate(service, 2) == []
+
+
+def test_refuses_remote_address_without_authkey():
+    with pytest.raises(ValueError):
+        TranslationService('10.0.0.5:6100', authkey=None)
@@ -1,48 +1,188 @@
-from transformers import AutoModelForSeq2SeqLM
+import importlib.util
 import os
+from translation.batching import MAX_BATCH_SIZE, MAX_BATCH_TOKENS, estimate_tokens, plan_batches
+from translation.inference_backends import load_engine
+from translation.language_detector import detect_languages
+from translation.model_registry import ModelRegistry
+from translation.translation_memory import normalize_source, translation_memory
+from translation import worker_pool
 
-# Handle missing IndicTransToolkit gracefully
-try:
-    from IndicTransToolkit import IndicProcessor, IndicTransTokenizer
-    INDIC_TOOLKIT_AVAILABLE = True
-except ImportError:
+# Direction -> IndicTrans2 model; AI4BHARAT_MODEL_<DIRECTION> picks another size
+MODELS = {
+    direction: os.environ.get(f"AI4BHARAT_MODEL_{direction.replace('-', '_').upper()}", model_id)
+    for direction, model_id in (
+        ('indic-en', "ai4bharat/indictrans2-indic-en-dist-200M"),
+        ('en-indic', "ai4bharat/indictrans2-en-indic-dist-200M"),
+        ('indic-indic', "ai4bharat/indictrans2-indic-indic-dist-320M"),
+    )
+}
+MODEL_NAME = MODELS['indic-en']
+MODEL_REVISION = os.environ.get('AI4BHARAT_MODEL_REVISION', 'main')
+# torch (float32), torch-int8, ctranslate2 or onnx - see translation/inference_backends.py
+BACKEND = os.environ.get('TRANSLATION_BACKEND', 'torch')
+# Requested or detected language code -> IndicTrans2 language tag
+LANGUAGES = {'en': 'eng_Latn', 'ur': 'urd_Arab', 'hi': 'hin_Deva', 'pa': 'pan_Guru'}
+ENGLISH = LANGUAGES['en']
+MAX_OUTPUT_TOKENS = 256
+
+# Checked without importing: IndicTransToolkit pulls in torch/transformers
+INDIC_TOOLKIT_AVAILABLE = importlib.util.find_spec("IndicTransToolkit") is not None
+if not INDIC_TOOLKIT_AVAILABLE:
     print("Warning: IndicTransToolkit not found. Translation features will be disabled.")
-    INDIC_TOOLKIT_AVAILABLE = False
-    IndicProcessor = None
-    IndicTransTokenizer = None
-
-# Load model (downloads ~800MB on first run)
-# We should probably load this lazily or check if it exists to avoid long startup times during dev
-model = None
-processor = None
-tokenizer = None
-
-if INDIC_TOOLKIT_AVAILABLE:
-    try:
-        model = AutoModelForSeq2SeqLM.from_pretrained(
-            "ai4bharat/indictrans2-indic-en-dist-200M"
-        )
-        processor = IndicProcessor(inference=True)
-        tokenizer = IndicTransTokenizer(direction="indic-en")
-    except Exception as e:
-        print(f"Warning: Could not load AI4Bharat model: {e}")
+
+
+def direction_of(src_lang, tgt_lang):
+    """Model direction ('indic-en', 'en-indic' or 'indic-indic') between two language tags"""
+    if src_lang == ENGLISH:
+        return 'en-indic'
+    return 'indic-en' if tgt_lang == ENGLISH else 'indic-indic'
+
+
+def model_version(direction):
+    """Translation memory entries are only reused for the same model, revision and backend"""
+    return f"{MODELS[direction]}@{MODEL_REVISION}/{BACKEND}"
+
+
+MODEL_VERSION = model_version('indic-en')
+
+
+def _load_model(direction, model_id):
+    """(engine, processor) - downloads ~800MB per model on first run"""
+    from IndicTransToolkit import IndicProcessor, IndicTransTokenizer
+
+    tokenizer = IndicTransTokenizer(direction=direction)
+    engine = load_engine(BACKEND, model_id, MODEL_REVISION, tokenizer, MAX_OUTPUT_TOKENS, direction)
+    return engine, IndicProcessor(inference=True)
+
+
+def _model_bytes(bundle):
+    engine, _ = bundle
+    return engine.memory_bytes()
+
+
+# Models are loaded on the first translation request in their direction or
+# by an explicit warmup, so importing this module - and starting the app -
+# stays fast
+model_registry = ModelRegistry(
+    _load_model,
+    MODELS,
+    _model_bytes,
+    available=INDIC_TOOLKIT_AVAILABLE,
+    unavailable_reason="IndicTransToolkit not installed (requires C++ Build Tools)"
+)
+# The indic-en model, warmed up at startup (app.py, gunicorn.conf.py)
+model_manager = model_registry.manager('indic-en')
+
+
+def translation_status():
+    """
+    Readiness of whatever serves translations here: the service if configured,
+    else the local indic-en model, with the registry's metrics
+    """
+    if worker_pool.configured():
+        return worker_pool.service_status()
+    return {**model_manager.status(), 'registry': model_registry.status()}
+
+
+def _generate(engine, processor, segments, src_lang, tgt_lang):
+    batch = processor.preprocess_batch(segments, src_lang=src_lang, tgt_lang=tgt_lang)
+    return processor.postprocess_batch(engine.generate(batch), lang=tgt_lang)
+
+
+def translate_locally(sources, max_batch_tokens=MAX_BATCH_TOKENS, max_batch_size=MAX_BATCH_SIZE,
+                      src_lang=LANGUAGES['ur'], tgt_lang=ENGLISH):
+    """Run a model in this process over non-blank segments of one language pair (no translation memory)"""
+    direction = direction_of(src_lang, tgt_lang)
+    translations = [''] * len(sources)
+    for batch in plan_batches([estimate_tokens(s) for s in sources], max_batch_tokens, max_batch_size):
+        with model_registry.use(direction, segments=len(batch)) as (engine, processor):
+            generated = _generate(engine, processor, [sources[b] for b in batch], src_lang, tgt_lang)
+        for b, translated in zip(batch, generated):
+            translations[b] = translated
+    return translations
+
+
+def translate_batch(texts, max_batch_tokens=MAX_BATCH_TOKENS, max_batch_size=MAX_BATCH_SIZE, use_memory=True,
+                    source_lang=None, target_lang='en'):
+    """
+    Translate many segments into target_lang with as few generate() calls as possible
+
+    The language of each segment is detected from its script unless
+    source_lang ('ur', 'hi', 'pa' or 'en') is given. Segments already in
+    target_lang and segments without letters are returned unchanged
+    without reaching a model; the rest are grouped by language pair, each
+    pair served by its direction's model (indic-en, en-indic or
+    indic-indic, loaded on demand by model_registry). Segments found in
+    the translation memory are not sent to a model, and repeated segments
+    are translated once. The rest are bucketed by length
+    (translation/batching.py) so batches carry little padding, and run
+    here or on the translation service (translation/worker_pool.py) when
+    one is configured. Results come back in input order; blank segments
+    are returned as empty strings.
+
+    Raises:
+        ValueError: Unsupported target_lang
+        ModelUnavailableError: The model is not installed or failed to load,
+            or the translation service is unreachable or full
+    """
+    if target_lang not in LANGUAGES:
+        raise ValueError(f"Unsupported target_lang '{target_lang}' (expected one of {', '.join(LANGUAGES)})")
+    tgt_lang = LANGUAGES[target_lang]
+    results = [''] * len(texts)
+    pending = [i for i, text in enumerate(texts) if text and text.strip()]
+    if not pending:
+        return results
+
+    languages = [source_lang] * len(pending) if source_lang else detect_languages([texts[i] for i in pending])
+    by_language = {}
+    for i, language in zip(pending, languages):
+        if language in LANGUAGES and language != target_lang:
+            by_language.setdefault(LANGUAGES[language], []).append(i)
+        else:
+            results[i] = texts[i]  # already in the target language, or only numbers and punctuation
+
+    for src_lang, indices in by_language.items():
+        translations = _translate_language([texts[i] for i in indices], src_lang, tgt_lang,
+                                           max_batch_tokens, max_batch_size, use_memory)
+        for i, translated in zip(indices, translations):
+            results[i] = translated
+    return results
+
+
+def _translate_language(texts, src_lang, tgt_lang, max_batch_tokens, max_batch_size, use_memory):
+    direction = f"{src_lang}-{tgt_lang}"
+    version = model_version(direction_of(src_lang, tgt_lang))
+    results = [''] * len(texts)
+    cached = translation_memory.lookup(texts, direction, version) if use_memory else [None] * len(texts)
+    misses = {}
+    for i, hit in enumerate(cached):
+        if hit is None:
+            misses.setdefault(normalize_source(texts[i]), []).append(i)
+        else:
+            results[i] = hit
+    if not misses:
+        return results
+
+    sources = [texts[indices[0]] for indices in misses.values()]
+    if worker_pool.configured():
+        translations = worker_pool.get_client().translate(sources, max_batch_tokens, max_batch_size,
+                                                          src_lang, tgt_lang)
+    else:
+        translations = translate_locally(sources, max_batch_tokens, max_batch_size, src_lang, tgt_lang)
+
+    for indices, translated in zip(misses.values(), translations):
+        for i in indices:
+            results[i] = translated
+    if use_memory:
+        translation_memory.store(zip(sources, translations), direction, version)
+    return results
+
 
 def translate_urdu_to_english(text):
-    if not INDIC_TOOLKIT_AVAILABLE:
-        return "Translation unavailable: IndicTransToolkit not installed (requires C++ Build Tools)."
-        
-    if not model:
-        return "Model not loaded"
-        
-    # Preprocess
-    batch = processor.preprocess_batch([text], src_lang="urd_Arab", tgt_lang="eng_Latn")
-    
-    # Tokenize
-    inputs = tokenizer(batch, return_tensors="pt", padding=True)
-    
-    # Generate translation
-    outputs = model.generate(**inputs, max_length=256)
-    
-    # Decode
-    translated = tokenizer.batch_decode(outputs, skip_special_tokens=True)
-    return processor.postprocess_batch(translated)[0]
+    """
+    Translate Urdu text to English
+
+    Raises:
+        ModelUnavailableError: The model is not installed or failed to load
+    """
+    return translate_batch([text])[0]
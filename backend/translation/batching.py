@@ -0,0 +1,56 @@
+"""
+Length-bucketed batch planning for seq2seq translation
+
+A batch costs roughly (batch size x longest sequence) tokens because every
+row is padded to the longest one. Sorting segments by length before cutting
+batches keeps similar lengths together, so little compute is spent on
+padding; each batch is then filled up to a padded-token budget.
+"""
+import os
+
+# Padded input tokens per generate() call and rows per call
+MAX_BATCH_TOKENS = int(os.environ.get('TRANSLATION_MAX_BATCH_TOKENS', 4096))
+MAX_BATCH_SIZE = int(os.environ.get('TRANSLATION_MAX_BATCH_SIZE', 32))
+
+# IndicTrans2 SentencePiece splits an Urdu/Hindi word into ~1.6 pieces on
+# average, plus language tags and </s>
+TOKENS_PER_WORD = 1.6
+SPECIAL_TOKENS = 3
+
+
+def estimate_tokens(text):
+    """Approximate model input length of a segment without running the tokenizer"""
+    return int(len(text.split()) * TOKENS_PER_WORD) + SPECIAL_TOKENS
+
+
+def plan_batches(lengths, max_tokens=MAX_BATCH_TOKENS, max_size=MAX_BATCH_SIZE):
+    """
+    Group segment indices into batches of similar length
+
+    Args:
+        lengths: Token length of each segment
+        max_tokens: Budget for batch size x longest length in the batch
+        max_size: Maximum segments per batch
+
+    Returns:
+        list of index lists, shortest segments first; a segment longer than
+        the budget gets a batch of its own
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    batches = []
+    batch = []
+    for index in order:
+        # Sorted ascending, so the new segment is the longest in the batch
+        if batch and (len(batch) >= max_size or (len(batch) + 1) * lengths[index] > max_tokens):
+            batches.append(batch)
+            batch = []
+        batch.append(index)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def padding_ratio(lengths, batches):
+    """Fraction of the padded batch tokens that are padding (for benchmarks)"""
+    padded = sum(len(batch) * max(lengths[i] for i in batch) for batch in batches)
+    return 1 - sum(lengths) / padded if padded else 0.0
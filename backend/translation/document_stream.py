@@ -0,0 +1,97 @@
+"""
+Page-by-page document translation for streaming responses
+
+translate_document(stream=1) does not wait for the whole PDF: pages come
+from document/pdf_extractor.py in order, a few at a time, and each is
+translated and sent to the client straight away as one event. Only a few
+pages' text is held in memory, never the whole document or its translation.
+
+Events (dicts, serialized by format_event):
+
+    {"type": "start", "pages_total": 120}
+    {"type": "page", "page": 1, "source": "text", "translated_text": "...", "segments": 31,
+     "error": null, "pages_done": 1, "pages_total": 120, "elapsed_ms": 812}
+    {"type": "done", "pages_done": 120, "segments": 3650, "ocr_pages": 4,
+     "domain_terms_applied": [...], "processing_time_ms": 95120}
+    {"type": "error", "error": "...", "status": 503}
+
+A page's "source" is "text" (text layer), "ocr" (scanned, read by Google
+Vision) or "empty" (nothing found; "error" says why if OCR failed). An
+error ends the stream after the pages already sent.
+"""
+import json
+import time
+from translation.ai4bharat_translator import translate_batch
+from translation.model_manager import ModelUnavailableError
+from translation.segmenter import reassemble, segment_document
+from translation.simple_translator import apply_domain_terms, get_detected_terms
+
+FORMATS = {
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'sse': 'text/event-stream; charset=utf-8',
+}
+
+
+def translate_pages(pages_total, pages, source_lang=None, target_lang='en'):
+    """
+    Translate extracted pages (document/pdf_extractor.py) one at a time
+
+    source_lang and target_lang are passed on to translate_batch (source_lang
+    None: detected per segment). Yields event dicts.
+    """
+    start_time = time.time()
+    yield {"type": "start", "pages_total": pages_total}
+
+    pages_done = 0
+    segment_count = 0
+    ocr_pages = 0
+    terms_applied = {}
+    try:
+        for extracted in pages:
+            text = extracted['text']
+            segments = segment_document(text) if text.strip() else []
+            translated = reassemble(segments, translate_batch(
+                [segment for *_, segment in segments], source_lang=source_lang, target_lang=target_lang
+            ))
+            segment_count += len(segments)
+            ocr_pages += extracted['source'] == 'ocr'
+            pages_done += 1
+            translated_text = '\n\n'.join(page_text for _, page_text in translated)
+            if target_lang == 'en':  # the domain terms are English glosses
+                translated_text = apply_domain_terms(translated_text)
+                for _, replacement in get_detected_terms(text):
+                    terms_applied[replacement] = True
+            yield {
+                "type": "page",
+                "page": extracted['page'],
+                "source": extracted['source'],
+                "translated_text": translated_text,
+                "segments": len(segments),
+                "error": extracted['error'],
+                "pages_done": pages_done,
+                "pages_total": pages_total,
+                "elapsed_ms": int((time.time() - start_time) * 1000),
+            }
+    except ModelUnavailableError as e:
+        yield {"type": "error", "error": f"Translation unavailable: {e}", "status": 503}
+        return
+    except Exception as e:
+        yield {"type": "error", "error": str(e), "status": 500}
+        return
+
+    yield {
+        "type": "done",
+        "pages_done": pages_done,
+        "segments": segment_count,
+        "ocr_pages": ocr_pages,
+        "domain_terms_applied": list(terms_applied),
+        "processing_time_ms": int((time.time() - start_time) * 1000),
+    }
+
+
+def format_event(event, fmt='ndjson'):
+    """One NDJSON line or one Server-Sent Event"""
+    data = json.dumps(event, ensure_ascii=False)
+    if fmt == 'sse':
+        return f"event: {event['type']}\ndata: {data}\n\n"
+    return data + '\n'
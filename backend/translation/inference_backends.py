@@ -0,0 +1,144 @@
+"""
+CPU inference backends for IndicTrans2
+
+All backends take preprocessed sentences (IndicProcessor output) and return
+decoded, not yet postprocessed, translations, so ai4bharat_translator.py
+works the same on top of any of them. Select one with TRANSLATION_BACKEND:
+
+- torch        float32 PyTorch (baseline)
+- torch-int8   PyTorch with dynamic int8 quantization of every nn.Linear
+               at load time; no conversion step
+- ctranslate2  CTranslate2 int8 model converted ahead of time into
+               TRANSLATION_CT2_DIR:
+                 ct2-transformers-converter --model <MODEL_NAME>
+                   --trust_remote_code --quantization int8
+                   --output_dir <TRANSLATION_CT2_DIR>
+- onnx         ONNX Runtime model exported ahead of time into
+               TRANSLATION_ONNX_DIR:
+                 optimum-cli export onnx --model <MODEL_NAME>
+                   --trust-remote-code <TRANSLATION_ONNX_DIR>
+
+Converted models of the other directions go next to the indic-en one, with
+the direction appended: <TRANSLATION_CT2_DIR>-en-indic, and so on.
+
+benchmarks/backend_benchmark.py compares them against the float32 baseline.
+"""
+import os
+
+BACKENDS = ('torch', 'torch-int8', 'ctranslate2', 'onnx')
+
+_CACHE_DIR = os.environ.get('AI4BHARAT_CACHE_DIR', './models/ai4bharat')
+CT2_DIR = os.environ.get('TRANSLATION_CT2_DIR', os.path.join(_CACHE_DIR, 'ct2-int8'))
+ONNX_DIR = os.environ.get('TRANSLATION_ONNX_DIR', os.path.join(_CACHE_DIR, 'onnx'))
+NUM_BEAMS = int(os.environ.get('TRANSLATION_NUM_BEAMS', 1))  # greedy, as before
+
+
+class TorchEngine:
+    """transformers generate() on a PyTorch (optionally quantized) or ONNX Runtime model"""
+
+    def __init__(self, model, tokenizer, max_length):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+
+    def generate(self, batch):
+        import torch
+
+        inputs = self.tokenizer(batch, return_tensors="pt", padding=True)
+        with torch.inference_mode():
+            outputs = self.model.generate(**inputs, max_length=self.max_length, num_beams=NUM_BEAMS)
+        return self.tokenizer.batch_decode(outputs, skip_special_tokens=True)
+
+    def memory_bytes(self):
+        if hasattr(self.model, 'state_dict'):
+            return _tensor_bytes(self.model.state_dict().values())
+        return _dir_bytes(self.model.model_save_dir)  # ONNX Runtime sessions
+
+
+class CTranslate2Engine:
+    """CTranslate2 translator working on SentencePiece token strings"""
+
+    def __init__(self, translator, tokenizer, max_length, model_dir):
+        self.translator = translator
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+        self.model_dir = model_dir
+
+    def generate(self, batch):
+        source = [self.tokenizer.convert_ids_to_tokens(ids) for ids in self.tokenizer(batch)["input_ids"]]
+        results = self.translator.translate_batch(
+            source, beam_size=NUM_BEAMS, max_decoding_length=self.max_length
+        )
+        return [
+            self.tokenizer.decode(self.tokenizer.convert_tokens_to_ids(result.hypotheses[0]), skip_special_tokens=True)
+            for result in results
+        ]
+
+    def memory_bytes(self):
+        return _dir_bytes(self.model_dir)
+
+
+def _tensor_bytes(values):
+    """Bytes of the tensors in a state_dict (quantized layers keep theirs in tuples)"""
+    total = 0
+    for value in values:
+        if isinstance(value, (tuple, list)):
+            total += _tensor_bytes(value)
+        elif hasattr(value, 'element_size'):
+            total += value.element_size() * value.nelement()
+    return total
+
+
+def _dir_bytes(path):
+    """Size of a converted model on disk, which its runtime loads whole"""
+    return sum(
+        os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names
+    )
+
+
+def converted_dir(base, direction):
+    return base if direction == 'indic-en' else f"{base}-{direction}"
+
+
+def _require_dir(path, backend):
+    if not os.path.isdir(path):
+        raise FileNotFoundError(f"{backend} model not found in {path} (see translation/inference_backends.py)")
+
+
+def load_engine(backend, model_name, revision, tokenizer, max_length, direction='indic-en'):
+    """
+    Load the model of a direction for a backend
+
+    Raises:
+        ValueError: Unknown backend
+        FileNotFoundError: Converted model directory missing (ctranslate2, onnx)
+        ImportError: Backend library not installed
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown TRANSLATION_BACKEND '{backend}' (expected one of {', '.join(BACKENDS)})")
+
+    if backend == 'ctranslate2':
+        import ctranslate2
+
+        model_dir = converted_dir(CT2_DIR, direction)
+        _require_dir(model_dir, backend)
+        translator = ctranslate2.Translator(
+            model_dir, device='cpu', compute_type='int8', intra_threads=int(os.environ.get('OMP_NUM_THREADS', 0))
+        )
+        return CTranslate2Engine(translator, tokenizer, max_length, model_dir)
+
+    if backend == 'onnx':
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+        model_dir = converted_dir(ONNX_DIR, direction)
+        _require_dir(model_dir, backend)
+        return TorchEngine(ORTModelForSeq2SeqLM.from_pretrained(model_dir), tokenizer, max_length)
+
+    import torch
+    from transformers import AutoModelForSeq2SeqLM
+
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_name, revision=revision, trust_remote_code=True)
+    model.eval()
+    if backend == 'torch-int8':
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return TorchEngine(model, tokenizer, max_length)
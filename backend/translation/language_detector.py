@@ -1,3 +1,92 @@
+"""
+Script-based language detection for Urdu, Hindi, Punjabi and English
+
+Records here are written in one of four scripts: Arabic (Urdu), Devanagari
+(Hindi), Gurmukhi (Punjabi) and Latin (English), so counting the letters of
+each script is enough to tell them apart. Code points are mapped to a
+script with one lookup table over the Basic Multilingual Plane and counted
+with numpy; a batch of segments is counted with a single bincount.
+Digits, punctuation and spaces (other than Arabic-Indic digits) count for
+no script.
+
+A segment with any real share of Indic letters (INDIC_MIN_SHARE) is
+reported in its majority Indic script, since land records mix in English
+words and numbers that should not take the segment away from the model.
+
+numpy and the table are loaded on the first detection, not at app import.
+"""
+from functools import lru_cache
+
+SCRIPTS = ('other', 'arabic', 'devanagari', 'gurmukhi', 'latin')
+LANGUAGES = {'arabic': 'ur', 'devanagari': 'hi', 'gurmukhi': 'pa', 'latin': 'en'}
+UNKNOWN = 'unknown'  # no letters at all, e.g. only numbers
+
+INDIC_MIN_SHARE = 0.2
+
+_RANGES = {
+    'arabic': [(0x0600, 0x06FF), (0x0750, 0x077F), (0x08A0, 0x08FF), (0xFB50, 0xFDFF), (0xFE70, 0xFEFF)],
+    'devanagari': [(0x0900, 0x097F), (0xA8E0, 0xA8FF)],
+    'gurmukhi': [(0x0A00, 0x0A7F)],
+    'latin': [(0x0041, 0x005A), (0x0061, 0x007A), (0x00C0, 0x024F)],
+}
+
+
+@lru_cache(maxsize=None)
+def _script_table():
+    import numpy as np
+
+    # One byte per BMP code point; the last entry also stands for everything above it
+    table = np.zeros(0x10001, dtype=np.uint8)
+    for script, ranges in _RANGES.items():
+        for start, end in ranges:
+            table[start:end + 1] = SCRIPTS.index(script)
+    return table
+
+
+_INDIC = [SCRIPTS.index(script) for script in ('arabic', 'devanagari', 'gurmukhi')]
+_LATIN = SCRIPTS.index('latin')
+
+
+def _code_points(text):
+    import numpy as np
+
+    return np.frombuffer(text.encode('utf-32-le'), dtype='<u4')
+
+
+def _script_counts(texts):
+    """Letters per script for each text, as rows of len(SCRIPTS) counts"""
+    import numpy as np
+
+    codes = _code_points(''.join(texts))
+    scripts = _script_table()[np.minimum(codes, 0x10000)]
+    if len(texts) == 1:
+        return [np.bincount(scripts, minlength=len(SCRIPTS)).tolist()]
+    owners = np.repeat(np.arange(len(texts)), [len(text) for text in texts])
+    counts = np.bincount(owners * len(SCRIPTS) + scripts, minlength=len(texts) * len(SCRIPTS))
+    return counts.reshape(len(texts), len(SCRIPTS)).tolist()
+
+
+def _language(counts):
+    indic = max(_INDIC, key=lambda script: counts[script])
+    indic_letters = sum(counts[script] for script in _INDIC)
+    if indic_letters and indic_letters >= INDIC_MIN_SHARE * (indic_letters + counts[_LATIN]):
+        return LANGUAGES[SCRIPTS[indic]]
+    return 'en' if counts[_LATIN] else UNKNOWN
+
+
+def script_histogram(text):
+    """{script: letter count} for the scripts present in text"""
+    counts = _script_counts([text])[0]
+    return {script: count for script, count in zip(SCRIPTS, counts) if count and script != 'other'}
+
+
+def detect_languages(texts):
+    """Language code ('ur', 'hi', 'pa', 'en' or 'unknown') for each text"""
+    if not texts:
+        return []
+    return [_language(counts) for counts in _script_counts(texts)]
+
+
 def detect_language(text):
-    # Placeholder
-    return "ur"
+    """Language code of one text (see detect_languages)"""
+    return _language(_script_counts([text])[0])
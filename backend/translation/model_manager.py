@@ -0,0 +1,111 @@
+"""
+Lazy, thread-safe holder for a translation model
+
+The model is loaded on first use (get()) or ahead of time with warmup(),
+exactly once per process even when several request threads ask for it at the
+same time. Under gunicorn, gunicorn.conf.py calls warmup() in the master with
+preload_app so forked workers share the loaded weights copy-on-write instead
+of each loading their own copy.
+
+A failed load is remembered and re-raised as ModelUnavailableError rather
+than retried on every request; reset() allows another attempt.
+"""
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+NOT_LOADED = 'not_loaded'
+LOADING = 'loading'
+READY = 'ready'
+FAILED = 'failed'
+UNAVAILABLE = 'unavailable'
+
+
+class ModelUnavailableError(RuntimeError):
+    """The model is not installed or could not be loaded"""
+
+
+class ModelManager:
+    def __init__(self, name, loader, available=True, unavailable_reason=None):
+        """
+        Args:
+            name: Model identifier reported in status()
+            loader: Zero-argument callable returning the loaded model bundle
+            available: False when the model's dependencies are not installed
+            unavailable_reason: Error message used when available is False
+        """
+        self.name = name
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._loaded = None  # (bundle,) while READY; replaced as a whole so get() can read it unlocked
+        self._state = NOT_LOADED if available else UNAVAILABLE
+        self._error = None if available else unavailable_reason
+        self._load_seconds = None
+
+    @property
+    def ready(self):
+        return self._state == READY
+
+    def get(self):
+        """The loaded model bundle, loading it first if needed"""
+        loaded = self._loaded
+        if loaded is not None:
+            return loaded[0]
+        with self._lock:
+            if self._state in (NOT_LOADED, LOADING):
+                self._load()
+            if self._state != READY:
+                raise ModelUnavailableError(f"{self.name}: {self._error}")
+            return self._loaded[0]
+
+    def _load(self):
+        self._state = LOADING
+        start_time = time.time()
+        try:
+            bundle = self._loader()
+        except Exception as e:
+            logger.error(f"Could not load {self.name}: {e}")
+            self._state = FAILED
+            self._error = str(e)
+            return
+        self._load_seconds = round(time.time() - start_time, 2)
+        self._loaded = (bundle,)
+        self._state = READY
+        self._error = None
+        logger.info(f"Loaded {self.name} in {self._load_seconds}s")
+
+    def warmup(self, background=False):
+        """
+        Load the model now instead of on the first request
+
+        Returns True when the model is ready. With background=True the load runs
+        in a daemon thread and this returns immediately.
+        """
+        if background:
+            threading.Thread(target=self.warmup, name=f"warmup-{self.name}", daemon=True).start()
+            return self.ready
+        try:
+            self.get()
+        except ModelUnavailableError:
+            return False
+        return True
+
+    def reset(self):
+        """Drop the loaded model (or remembered failure) so the next get() loads again"""
+        with self._lock:
+            if self._state != UNAVAILABLE:
+                self._loaded = None
+                self._state = NOT_LOADED
+                self._error = None
+
+    def status(self):
+        """Readiness summary for /api/health (never triggers a load)"""
+        return {
+            'model': self.name,
+            'state': self._state,
+            'ready': self.ready,
+            'load_seconds': self._load_seconds,
+            'error': self._error,
+        }
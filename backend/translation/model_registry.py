@@ -0,0 +1,210 @@
+"""
+Translation models keyed by (direction, model id), within a memory budget
+
+Records arrive in Urdu, Hindi and Punjabi and notices go out from English,
+so one process may need the indic-en, en-indic and indic-indic models -
+but rarely all at once, and each costs about a gigabyte. The registry holds
+one ModelManager per (direction, model id), created and loaded on first
+use. Once the loaded models together exceed TRANSLATION_MODEL_MEMORY_MB,
+the least recently used ones are dropped until they fit again.
+
+A model that is translating right now (inside use()) is never evicted; if
+nothing else can go, the budget is exceeded for a while and a warning
+logged. A model larger than the whole budget is still loaded.
+
+The budget applies per process: each gunicorn worker, or each replica of
+the translation service (translation/worker_pool.py), has its own registry.
+"""
+import gc
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from translation.model_manager import ModelManager
+
+logger = logging.getLogger(__name__)
+
+MEMORY_BUDGET_MB = int(os.environ.get('TRANSLATION_MODEL_MEMORY_MB', 2048))
+LATENCY_SAMPLES = 256
+MB = 1024 * 1024
+
+
+class _Entry:
+    def __init__(self, manager):
+        self.manager = manager
+        self.size = None  # bytes, measured on the last load
+        self.users = 0
+        self.loads = 0
+        self.evictions = 0
+        self.last_used = None
+        self.batches = 0
+        self.segments = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+
+
+class ModelRegistry:
+    def __init__(self, loader, models, size_of, budget_mb=MEMORY_BUDGET_MB, available=True,
+                 unavailable_reason=None):
+        """
+        Args:
+            loader: Callable (direction, model_id) returning the loaded model bundle
+            models: {direction: default model id}
+            size_of: Callable returning the memory of a loaded bundle in bytes
+            budget_mb: Memory all loaded models may take together
+            available: False when the models' dependencies are not installed
+            unavailable_reason: Error message used when available is False
+        """
+        self.models = dict(models)
+        self.budget = budget_mb * MB
+        self._loader = loader
+        self._size_of = size_of
+        self._available = available
+        self._unavailable_reason = unavailable_reason
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # least recently used first
+        self._loads = 0
+        self._evictions = 0
+
+    def _key(self, direction, model_id=None):
+        if direction not in self.models:
+            raise ValueError(f"Unknown translation direction '{direction}' (expected one of {', '.join(self.models)})")
+        return direction, model_id or self.models[direction]
+
+    def _entry(self, key):
+        # Caller holds the lock
+        entry = self._entries.get(key)
+        if entry is None:
+            direction, model_id = key
+            manager = ModelManager(
+                f"{model_id} ({direction})",
+                lambda: self._load(key),
+                available=self._available,
+                unavailable_reason=self._unavailable_reason
+            )
+            entry = self._entries[key] = _Entry(manager)
+        return entry
+
+    def _load(self, key):
+        # Runs under the entry's ModelManager lock, once per actual load
+        with self._lock:
+            expected = self._entries[key].size or 0
+        self._make_room(key, expected)
+        bundle = self._loader(*key)
+        size = self._size_of(bundle)
+        with self._lock:
+            entry = self._entries[key]
+            entry.size = size
+            entry.loads += 1
+            self._loads += 1
+        logger.info(f"Model {key[1]} ({key[0]}) takes {size / MB:.0f} MB")
+        return bundle
+
+    def manager(self, direction, model_id=None):
+        """The ModelManager of a model (created, not loaded, if new)"""
+        with self._lock:
+            return self._entry(self._key(direction, model_id)).manager
+
+    def _used(self):
+        # Caller holds the lock
+        return sum(entry.size or 0 for entry in self._entries.values() if entry.manager.ready)
+
+    def _make_room(self, keep, needed=0):
+        """
+        Evict least recently used idle models until needed more bytes fit in the budget
+
+        Returns:
+            Bytes still over the budget (0 or less when everything fits)
+        """
+        evicted = []
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if self._used() + needed <= self.budget:
+                    break
+                if key == keep or entry.users or not entry.manager.ready:
+                    continue
+                entry.manager.reset()
+                entry.evictions += 1
+                self._evictions += 1
+                evicted.append(key)
+            over = self._used() + needed - self.budget
+        for direction, model_id in evicted:
+            logger.info(f"Evicted {model_id} ({direction}) to stay within {self.budget // MB} MB")
+        if evicted:
+            gc.collect()  # release the weights now rather than at the next collection
+        return over
+
+    @contextmanager
+    def use(self, direction, model_id=None, segments=0):
+        """
+        Loaded model bundle of a direction, kept from eviction while in use
+
+        The time spent inside the block is recorded as one batch of
+        `segments` segments for the latency metrics.
+
+        Raises:
+            ValueError: Unknown direction
+            ModelUnavailableError: The model is not installed or failed to load
+        """
+        key = self._key(direction, model_id)
+        with self._lock:
+            entry = self._entry(key)
+            entry.users += 1
+            self._entries.move_to_end(key)
+        try:
+            bundle = entry.manager.get()
+            over = self._make_room(key)
+            if over > 0:
+                logger.warning(f"Translation models exceed the memory budget by {over / MB:.0f} MB "
+                               "(the others are in use)")
+            start = time.perf_counter()
+            yield bundle
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                entry.batches += 1
+                entry.segments += segments
+                entry.latencies.append(elapsed)
+        finally:
+            with self._lock:
+                entry.users -= 1
+                entry.last_used = time.time()
+            # Models kept over the budget while in use can go now
+            self._make_room(key)
+
+    def warmup(self, direction, model_id=None, background=False):
+        """Load a model now instead of on first use (see ModelManager.warmup)"""
+        return self.manager(direction, model_id).warmup(background=background)
+
+    def status(self):
+        """Per-model state, memory and latency, plus load/eviction totals (never triggers a load)"""
+        with self._lock:
+            entries = list(self._entries.items())
+            used, loads, evictions = self._used(), self._loads, self._evictions
+            models = []
+            for (direction, model_id), entry in entries:
+                latencies = sorted(entry.latencies)
+                models.append({
+                    **entry.manager.status(),
+                    'direction': direction,
+                    'model_id': model_id,
+                    'memory_mb': round(entry.size / MB) if entry.size else None,
+                    'in_use': entry.users,
+                    'loads': entry.loads,
+                    'evictions': entry.evictions,
+                    'last_used': entry.last_used,
+                    'batches': entry.batches,
+                    'segments': entry.segments,
+                    'latency_ms': {
+                        'mean': round(1000 * sum(latencies) / len(latencies), 1),
+                        'p50': round(1000 * latencies[len(latencies) // 2], 1),
+                        'p95': round(1000 * latencies[int(len(latencies) * 0.95)], 1),
+                    } if latencies else None,
+                })
+        return {
+            'memory_budget_mb': self.budget // MB,
+            'memory_used_mb': round(used / MB),
+            'loads': loads,
+            'evictions': evictions,
+            'models': models,
+        }
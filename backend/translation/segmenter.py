@@ -0,0 +1,111 @@
+"""
+Sentence segmentation for Urdu / Hindi documents
+
+Extracted document text is cut at page markers ("--- Page N ---"), then at
+blank lines (paragraphs), then at line breaks, then after sentence
+terminators: Urdu full stop ۔, Devanagari danda । / ॥, Arabic ؟ and Latin
+? ! . (a "." between digits, as in "12.5 kanal", is not a sentence end).
+Jamabandi and Fard pages are tabular, one record per line, so lines are
+kept: reassemble() puts the translations back on the same lines.
+
+Every sentence is its own segment, which is what the translation memory
+caches. Only a sentence over MAX_SEGMENT_TOKENS estimated tokens is cut,
+between words, so that none is truncated at the model's output limit.
+"""
+import re
+from translation.batching import estimate_tokens
+
+# Leaves headroom under the generate() limit of 256 output tokens, since
+# estimate_tokens() is approximate and English output runs a little longer
+MAX_SEGMENT_TOKENS = 200
+
+PAGE_MARKER_RE = re.compile(r'^--- Page (\d+) ---$', re.MULTILINE)
+_PARAGRAPH_RE = re.compile(r'\n\s*\n')
+_TERMINATORS = '۔।॥؟?!'
+_SENTENCE_END_RE = re.compile(
+    rf'(?<=[{_TERMINATORS}])(?:\s+|(?=[^\s{_TERMINATORS}]))'  # OCR often drops the space after ۔
+    r'|(?<=[^\d\s]\.)\s+|(?<=\d\.)\s+(?=\D)'
+)
+
+
+def split_pages(text):
+    """[(page number, page text)]; text before the first marker (or without markers) has page None"""
+    pages = []
+    matches = list(PAGE_MARKER_RE.finditer(text))
+    leading = text[:matches[0].start()] if matches else text
+    if leading.strip():
+        pages.append((None, leading))
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        pages.append((int(match.group(1)), text[match.end():end]))
+    return pages
+
+
+def split_sentences(line):
+    """Sentences of one line, terminators kept, whitespace collapsed"""
+    text = ' '.join(line.split())
+    return [sentence.strip() for sentence in _SENTENCE_END_RE.split(text) if sentence.strip()]
+
+
+def _split_long(sentence, max_tokens):
+    pieces = []
+    words = []
+    for word in sentence.split():
+        if words and estimate_tokens(' '.join(words + [word])) > max_tokens:
+            pieces.append(' '.join(words))
+            words = []
+        words.append(word)
+    if words:
+        pieces.append(' '.join(words))
+    return pieces
+
+
+def _fit(sentence, max_tokens):
+    return _split_long(sentence, max_tokens) if estimate_tokens(sentence) > max_tokens else [sentence]
+
+
+def segment_document(text, max_tokens=MAX_SEGMENT_TOKENS):
+    """
+    Split document text into translation segments, one per sentence
+
+    Returns:
+        list of (page, paragraph index within the page, line index within
+        the paragraph, segment text)
+    """
+    segments = []
+    for page, page_text in split_pages(text):
+        paragraphs = [p for p in _PARAGRAPH_RE.split(page_text) if p.strip()]
+        for index, paragraph in enumerate(paragraphs):
+            lines = [line for line in paragraph.split('\n') if line.strip()]
+            for line_index, line in enumerate(lines):
+                for sentence in split_sentences(line):
+                    for segment in _fit(sentence, max_tokens):
+                        segments.append((page, index, line_index, segment))
+    return segments
+
+
+def reassemble(segments, translations):
+    """
+    Put translated segments back together per page
+
+    Segments of a line are joined with spaces, lines with line breaks and
+    paragraphs with blank lines.
+
+    Returns:
+        list of (page, translated page text) in document order
+    """
+    pages = []
+    last_paragraph = last_line = None
+    for (page, paragraph, line, _), translated in zip(segments, translations):
+        if not pages or pages[-1][0] != page:
+            pages.append((page, [[[]]]))
+        elif paragraph != last_paragraph:
+            pages[-1][1].append([[]])
+        elif line != last_line:
+            pages[-1][1][-1].append([])
+        last_paragraph, last_line = paragraph, line
+        pages[-1][1][-1][-1].append(translated)
+    return [
+        (page, '\n\n'.join('\n'.join(' '.join(parts) for parts in lines) for lines in paragraphs))
+        for page, paragraphs in pages
+    ]
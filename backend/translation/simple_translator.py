@@ -1,6 +1,8 @@
 # Comprehensive Land Record Terminology Dictionary for Jammu & Kashmir
 # Covers Urdu, Hindi, and regional terms used in land records
 
+from translation.term_matcher import TermMatcher
+
 LAND_RECORD_TERMS = {
     # ===========================================
     # URDU → ENGLISH (Primary Land Record Terms)
@@ -153,6 +155,23 @@ LAND_RECORD_TERMS = {
     "پہاڑی": "Hilly/Mountain",
 }
 
+_matcher = None
+
+def domain_term_matcher():
+    """LAND_RECORD_TERMS compiled once (on first use) into a single-pass longest-match matcher"""
+    global _matcher
+    if _matcher is None:
+        _matcher = TermMatcher(LAND_RECORD_TERMS)
+    return _matcher
+
+def replace_domain_terms(text):
+    """
+    Replace land record terms in one pass, longest match first
+    ("خسرہ نمبر" before "خسرہ").
+    Returns (replaced text, list of matched terms in order of first occurrence).
+    """
+    return domain_term_matcher().replace(text)
+
 def apply_domain_terms(translated_text):
     """
     Post-process translated text to ensure land record terms are correctly translated.
@@ -160,24 +179,14 @@ def apply_domain_terms(translated_text):
     """
     if not translated_text:
         return translated_text
-        
-    for term, replacement in LAND_RECORD_TERMS.items():
-        translated_text = translated_text.replace(term, replacement)
-    return translated_text
+    return replace_domain_terms(translated_text)[0]
 
 def get_detected_terms(original_text):
     """
     Detect which domain-specific terms are present in the original text.
     Returns a list of (original_term, translation) tuples.
     """
-    detected = []
-    if not original_text:
-        return detected
-        
-    for term, replacement in LAND_RECORD_TERMS.items():
-        if term in original_text:
-            detected.append((term, replacement))
-    return detected
+    return [(term, LAND_RECORD_TERMS[term]) for term in domain_term_matcher().find_terms(original_text)]
 
 def get_term_categories():
     """
@@ -0,0 +1,80 @@
+"""
+Single-pass dictionary term matching
+
+The terms are compiled once into a trie-shaped regular expression: every
+trie node becomes a group of alternatives keyed by distinct next characters,
+and a complete term with longer continuations becomes an optional (greedy)
+group. Scanning the text is then one pass of the C regex engine that only
+ever follows one trie branch per position. The result is leftmost-longest
+matching: "خسرہ نمبر" wins over "خسرہ", whatever the dictionary order. Cost
+grows with text length and term length, not with the number of terms.
+"""
+import re
+
+_END = ''  # trie key marking a complete term
+
+
+def _build_trie(terms):
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[_END] = True
+    return trie
+
+
+def _trie_pattern(node):
+    """Regex source matching exactly the terms below this trie node, longest first"""
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in node.items() if char != _END]
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    if _END in node:
+        # A shorter term ends here: the continuation is optional, tried first (greedy)
+        return f"(?:{body})?"
+    return body
+
+
+class TermMatcher:
+    def __init__(self, terms, whole_words=False):
+        """
+        Args:
+            terms: {term: replacement}
+            whole_words: Only match terms not preceded or followed by a word character
+        """
+        self.terms = dict(terms)
+        source = _trie_pattern(_build_trie(term for term in self.terms if term))
+        if whole_words:
+            source = rf"(?<!\w)(?:{source})(?!\w)"
+        # A dictionary without terms matches nothing
+        self._pattern = re.compile(source or r'(?!)')
+
+    def finditer(self, text):
+        """Non-overlapping leftmost-longest matches as (start, end, term)"""
+        for match in self._pattern.finditer(text):
+            yield match.start(), match.end(), match.group(0)
+
+    def find_terms(self, text):
+        """Distinct terms present in text, in order of first occurrence"""
+        if not text:
+            return []
+        return list(dict.fromkeys(match.group(0) for match in self._pattern.finditer(text)))
+
+    def replace(self, text):
+        """
+        Replace every matched term with its replacement in one pass
+
+        Returns:
+            (replaced text, distinct matched terms in order of first occurrence)
+        """
+        if not text:
+            return text, []
+        matched = {}
+
+        def _substitute(match):
+            term = match.group(0)
+            matched[term] = True
+            return self.terms[term]
+
+        return self._pattern.sub(_substitute, text), list(matched)
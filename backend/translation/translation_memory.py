@@ -0,0 +1,158 @@
+"""
+Sentence-level translation memory
+
+Jamabandi and Fard pages repeat the same headers, column labels and
+boilerplate on every page, so segment translations are cached, keyed by
+sha256(direction, model version, normalized source). Two layers:
+
+- an in-process LRU of TRANSLATION_MEMORY_SIZE entries
+- the translation_memory table, shared by all workers and kept across
+  restarts (only used inside an app context)
+
+Entries of an older model version are never returned for a newer one.
+Database errors degrade to a cache miss; they never fail a translation.
+"""
+import hashlib
+import logging
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+from flask import has_app_context
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from extensions import db
+from models import TranslationMemoryEntry
+
+logger = logging.getLogger(__name__)
+
+MEMORY_SIZE = int(os.environ.get('TRANSLATION_MEMORY_SIZE', 20000))
+QUERY_CHUNK = 500
+
+
+def normalize_source(text):
+    """Cache form of a segment: NFC, whitespace collapsed"""
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+def memory_key(text, direction, model_version):
+    return hashlib.sha256(f"{direction}\0{model_version}\0{normalize_source(text)}".encode('utf-8')).hexdigest()
+
+
+class TranslationMemory:
+    def __init__(self, maxsize=MEMORY_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._counts = {'lookups': 0, 'memory_hits': 0, 'store_hits': 0, 'misses': 0, 'stored': 0}
+
+    def _remember(self, key, translated):
+        with self._lock:
+            self._entries[key] = translated
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _count(self, **increments):
+        with self._lock:
+            for name, value in increments.items():
+                self._counts[name] += value
+
+    def lookup(self, texts, direction, model_version):
+        """Cached translation for each text, or None where it has none"""
+        keys = [memory_key(text, direction, model_version) for text in texts]
+        results = [None] * len(texts)
+        with self._lock:
+            for i, key in enumerate(keys):
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    results[i] = self._entries[key]
+        memory_hits = sum(result is not None for result in results)
+
+        missing = {key for key, result in zip(keys, results) if result is None}
+        found = self._load(missing) if missing else {}
+        for i, key in enumerate(keys):
+            if results[i] is None and key in found:
+                results[i] = found[key]
+                self._remember(key, found[key])
+
+        store_hits = sum(result is not None for result in results) - memory_hits
+        self._count(lookups=len(texts), memory_hits=memory_hits, store_hits=store_hits,
+                    misses=len(texts) - memory_hits - store_hits)
+        return results
+
+    def _load(self, keys):
+        if not has_app_context():
+            return {}
+        table = TranslationMemoryEntry.__table__
+        keys = list(keys)
+        found = {}
+        try:
+            with db.engine.connect() as connection:
+                for start in range(0, len(keys), QUERY_CHUNK):
+                    query = select(table.c.key, table.c.translated_text) \
+                        .where(table.c.key.in_(keys[start:start + QUERY_CHUNK]))
+                    found.update(connection.execute(query).all())
+        except SQLAlchemyError as e:
+            logger.warning(f"Translation memory lookup failed: {e}")
+        return found
+
+    def store(self, pairs, direction, model_version):
+        """Remember (source, translation) pairs in both layers"""
+        rows = {}
+        for source, translated in pairs:
+            if not translated:
+                continue
+            key = memory_key(source, direction, model_version)
+            self._remember(key, translated)
+            rows[key] = {
+                'key': key,
+                'direction': direction,
+                'model_version': model_version,
+                'source_text': normalize_source(source),
+                'translated_text': translated,
+            }
+        if rows and has_app_context():
+            self._save(rows)
+
+    def _save(self, rows):
+        table = TranslationMemoryEntry.__table__
+        try:
+            # Own transaction, independent of the request's session
+            with db.engine.begin() as connection:
+                existing = set()
+                keys = list(rows)
+                for start in range(0, len(keys), QUERY_CHUNK):
+                    existing.update(connection.execute(
+                        select(table.c.key).where(table.c.key.in_(keys[start:start + QUERY_CHUNK]))
+                    ).scalars())
+                new_rows = [row for key, row in rows.items() if key not in existing]
+                if new_rows:
+                    connection.execute(table.insert(), new_rows)
+            self._count(stored=len(new_rows))
+        except IntegrityError:
+            pass  # stored concurrently by another worker
+        except SQLAlchemyError as e:
+            logger.warning(f"Translation memory store failed: {e}")
+
+    def clear(self):
+        """Empty the in-process layer and reset counters (the table is kept)"""
+        with self._lock:
+            self._entries.clear()
+            for name in self._counts:
+                self._counts[name] = 0
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self._counts)
+            size = len(self._entries)
+        hits = counts['memory_hits'] + counts['store_hits']
+        return {
+            **counts,
+            'hit_rate': round(hits / counts['lookups'], 4) if counts['lookups'] else None,
+            'memory_entries': size,
+            'memory_capacity': self.maxsize,
+        }
+
+
+translation_memory = TranslationMemory()
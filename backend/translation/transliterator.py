@@ -1,3 +1,432 @@
+"""
+Table-driven transliteration of names between Urdu, Devanagari and Latin
+
+Every word is read into a shared phoneme sequence and written out again in
+the target script, so three readers and three writers cover all six
+directions. Both sides are lookup tables plus a few context rules:
+
+- Urdu (abjad): short vowels are not written, so a vowel is inserted where
+  two consonants would otherwise start a syllable ("اکبر" -> "akbar"); و is a
+  consonant at the start of a word or before a vowel letter, ی at the start
+  or after a vowel, both are vowels elsewhere; a final ہ after a consonant is
+  a vowel ("نجمہ" -> "najma"); after a long ا the next consonant pair takes an
+  i ("ساجد" -> "sajid").
+- Devanagari (abugida): conjuncts, vowel signs and nukta letters are read
+  per syllable, then the inherent a is dropped at the end of a word and
+  between single consonants with vowels on both sides (Hindi schwa deletion:
+  "कमला" -> "kamla"). Written Devanagari joins consonants with no vowel
+  between them into a conjunct ("Vikram" -> "विक्रम").
+- Latin: longest-match tokens (kh, sh, aa, ee ...); a single i is short
+  and ee/ii long ("Vijay", "Preeti"), but a final a, i or u is long.
+
+Common name words (Muhammad, Singh ...) come from NAME_TABLE instead, in
+their usual spelling. Words are memoized, since names repeat heavily;
+transliterate_batch() also skips repeated names in a batch.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+
+SCRIPTS = ('urdu', 'devanagari', 'latin')
+_SCRIPT_ALIASES = {'ur': 'urdu', 'arabic': 'urdu', 'hi': 'devanagari', 'en': 'latin'}
+
+# Phoneme -> (Latin, Devanagari, Urdu)
+CONSONANTS = {
+    'k': ('k', 'क', 'ک'), 'kh': ('kh', 'ख', 'کھ'), 'x': ('kh', 'ख़', 'خ'), 'g': ('g', 'ग', 'گ'),
+    'gh': ('gh', 'घ', 'گھ'), 'G': ('gh', 'ग़', 'غ'), 'q': ('q', 'क़', 'ق'), 'ng': ('n', 'ङ', 'ن'),
+    'ch': ('ch', 'च', 'چ'), 'chh': ('chh', 'छ', 'چھ'), 'j': ('j', 'ज', 'ج'), 'jh': ('jh', 'झ', 'جھ'),
+    'T': ('t', 'ट', 'ٹ'), 'Th': ('th', 'ठ', 'ٹھ'), 'D': ('d', 'ड', 'ڈ'), 'Dh': ('dh', 'ढ', 'ڈھ'),
+    'N': ('n', 'ण', 'ن'), 'R': ('r', 'ड़', 'ڑ'), 'Rh': ('rh', 'ढ़', 'ڑھ'),
+    't': ('t', 'त', 'ت'), 'th': ('th', 'थ', 'تھ'), 'd': ('d', 'द', 'د'), 'dh': ('dh', 'ध', 'دھ'),
+    'n': ('n', 'न', 'ن'), 'p': ('p', 'प', 'پ'), 'ph': ('ph', 'फ', 'پھ'), 'f': ('f', 'फ़', 'ف'),
+    'b': ('b', 'ब', 'ب'), 'bh': ('bh', 'भ', 'بھ'), 'm': ('m', 'म', 'م'), 'y': ('y', 'य', 'ی'),
+    'r': ('r', 'र', 'ر'), 'l': ('l', 'ल', 'ل'), 'v': ('v', 'व', 'و'), 'w': ('w', 'व', 'و'),
+    'sh': ('sh', 'श', 'ش'), 's': ('s', 'स', 'س'), 'h': ('h', 'ह', 'ہ'), 'z': ('z', 'ज़', 'ز'),
+    'zh': ('zh', 'ज़', 'ژ'),
+}
+
+# Phoneme -> (Latin, Devanagari letter, Devanagari sign, Urdu initial, medial, final)
+VOWELS = {
+    'a': ('a', 'अ', '', 'ا', '', ''),
+    'aa': ('a', 'आ', 'ा', 'آ', 'ا', 'ا'),
+    'aH': ('a', 'आ', 'ा', 'ا', 'ہ', 'ہ'),  # final ہ read as a vowel
+    'i': ('i', 'इ', 'ि', 'ا', '', 'ی'),
+    'ii': ('i', 'ई', 'ी', 'ای', 'ی', 'ی'),
+    'u': ('u', 'उ', 'ु', 'ا', '', 'و'),
+    'uu': ('u', 'ऊ', 'ू', 'او', 'و', 'و'),
+    'e': ('e', 'ए', 'े', 'ای', 'ی', 'ے'),
+    'ai': ('ai', 'ऐ', 'ै', 'ای', 'ی', 'ے'),
+    'o': ('o', 'ओ', 'ो', 'او', 'و', 'و'),
+    'au': ('au', 'औ', 'ौ', 'او', 'و', 'و'),
+}
+NASAL = 'ṁ'  # anusvara / noon ghunna
+
+# Frequent name words in their usual spelling: (Latin, Urdu, Devanagari)
+NAME_TABLE = [
+    ('Muhammad', 'محمد', 'मुहम्मद'), ('Ahmad', 'احمد', 'अहमद'), ('Ali', 'علی', 'अली'),
+    ('Khan', 'خان', 'ख़ान'), ('Ghulam', 'غلام', 'ग़ुलाम'), ('Hussain', 'حسین', 'हुसैन'),
+    ('Hassan', 'حسن', 'हसन'), ('Abdullah', 'عبداللہ', 'अब्दुल्लाह'), ('Rehman', 'رحمان', 'रहमान'),
+    ('Yusuf', 'یوسف', 'यूसुफ़'), ('Iqbal', 'اقبال', 'इक़बाल'), ('Imtiaz', 'امتیاز', 'इम्तियाज़'),
+    ('Ishaq', 'اسحاق', 'इसहाक़'), ('Ismail', 'اسماعیل', 'इस्माइल'), ('Irfan', 'عرفان', 'इरफ़ान'),
+    ('Shah', 'شاہ', 'शाह'), ('Begum', 'بیگم', 'बेगम'), ('Bibi', 'بی بی', 'बीबी'),
+    ('Fatima', 'فاطمہ', 'फ़ातिमा'), ('Ayesha', 'عائشہ', 'आयशा'), ('Bhat', 'بھٹ', 'भट'),
+    ('Dar', 'ڈار', 'डार'), ('Mir', 'میر', 'मीर'), ('Wani', 'وانی', 'वानी'), ('Lone', 'لون', 'लोन'),
+    ('Singh', 'سنگھ', 'सिंह'), ('Kaur', 'کور', 'कौर'), ('Kumar', 'کمار', 'कुमार'), ('Ram', 'رام', 'राम'),
+    ('Lal', 'لال', 'लाल'), ('Devi', 'دیوی', 'देवी'), ('Sharma', 'شرما', 'शर्मा'), ('Gupta', 'گپتا', 'गुप्ता'),
+    ('Din', 'دین', 'दीन'), ('Ullah', 'اللہ', 'उल्लाह'), ('Qureshi', 'قریشی', 'क़ुरैशी'),
+    ('Malik', 'ملک', 'मलिक'), ('Sheikh', 'شیخ', 'शेख़'), ('Syed', 'سید', 'सैयद'),
+    ('Imran', 'عمران', 'इमरान'), ('Abdul', 'عبدال', 'अब्दुल'),
+]
+# Urdu compounds written as one word: عبدالرشید -> Abdul Rashid
+_URDU_PREFIXES = ('عبدال',)
+# Other Latin spellings of the same names
+_LATIN_VARIANTS = {
+    'mohammad': 'muhammad', 'mohammed': 'muhammad', 'muhammed': 'muhammad', 'mohd': 'muhammad',
+    'ahmed': 'ahmad', 'husain': 'hussain', 'hussein': 'hussain', 'hasan': 'hassan',
+    'rahman': 'rehman', 'yousuf': 'yusuf', 'yousaf': 'yusuf', 'yousef': 'yusuf', 'fatma': 'fatima',
+    'aisha': 'ayesha', 'ayisha': 'ayesha', 'shaikh': 'sheikh', 'sayed': 'syed', 'sayyid': 'syed',
+}
+
+# --- Urdu -------------------------------------------------------------------
+
+_URDU_FOLD = str.maketrans({
+    'ي': 'ی', 'ى': 'ی', 'ك': 'ک', 'ه': 'ہ', 'ة': 'ہ', 'ۀ': 'ہ', 'ۂ': 'ہ',
+    'أ': 'ا', 'إ': 'ا', 'ٱ': 'ا', 'ؤ': 'و', 'ـ': None,
+})
+_URDU_CONSONANTS = {
+    'ب': 'b', 'پ': 'p', 'ت': 't', 'ٹ': 'T', 'ث': 's', 'ج': 'j', 'چ': 'ch', 'ح': 'h', 'خ': 'x',
+    'د': 'd', 'ڈ': 'D', 'ذ': 'z', 'ر': 'r', 'ڑ': 'R', 'ز': 'z', 'ژ': 'zh', 'س': 's', 'ش': 'sh',
+    'ص': 's', 'ض': 'z', 'ط': 't', 'ظ': 'z', 'غ': 'G', 'ف': 'f', 'ق': 'q', 'ک': 'k', 'گ': 'g',
+    'ل': 'l', 'م': 'm', 'ن': 'n', 'ہ': 'h',
+}
+_URDU_ASPIRATED = {'k': 'kh', 'g': 'gh', 'ch': 'chh', 'j': 'jh', 'T': 'Th', 'D': 'Dh', 'R': 'Rh',
+                   't': 'th', 'd': 'dh', 'p': 'ph', 'b': 'bh'}
+_URDU_MARKS = {'َ': 'a', 'ِ': 'i', 'ُ': 'u', 'ٰ': 'aa'}  # zabar, zer, pesh, khari zabar
+
+
+def _read_urdu(word):
+    """[(kind, phoneme)] with kind 'C', 'V' or 'N'; written vowels only"""
+    units = []
+    for i, char in enumerate(word):
+        prev = word[i - 1] if i else None
+        nxt = word[i + 1] if i + 1 < len(word) else None
+        initial = not units
+        if char == 'ھ' and units and units[-1][0] == 'C':
+            units[-1] = ('C', _URDU_ASPIRATED.get(units[-1][1], units[-1][1]))
+        elif char == 'ّ' and units and units[-1][0] == 'C':  # shadda doubles the consonant
+            units.append(units[-1])
+        elif char in _URDU_MARKS:
+            units.append(('V', _URDU_MARKS[char]))
+        elif char == 'ا':
+            units.append(('V', 'a' if initial else 'aa'))
+        elif char == 'آ':
+            units.append(('V', 'aa'))
+        elif char == 'ع':
+            if initial or (units and units[-1][0] == 'C'):
+                units.append(('V', 'a' if nxt != 'ا' else 'aa'))
+        elif char == 'و':
+            if initial or nxt in ('ا', 'ی', 'ے'):
+                units.append(('C', 'w'))
+            else:
+                units.append(('V', 'o' if nxt is None else 'uu'))
+        elif char == 'ی':
+            if initial or (units[-1][0] == 'V' and nxt is not None):
+                units.append(('C', 'y'))
+            else:
+                units.append(('V', 'ii'))
+        elif char == 'ے':
+            units.append(('V', 'e'))
+        elif char == 'ئ':
+            units.append(('V', 'i'))
+        elif char == 'ہ' and nxt is None and prev not in ('ا', 'و') and units:
+            units.append(('V', 'aH'))
+        elif char == 'ں':
+            units.append(('N', NASAL))
+        elif char in _URDU_CONSONANTS:
+            units.append(('C', _URDU_CONSONANTS[char]))
+    return units
+
+
+def _urdu_phonemes(word):
+    """Written Urdu units with the unwritten short vowels put back"""
+    units = _read_urdu(word)
+    phonemes = []
+    open_syllable = False  # the current syllable already has its vowel
+    for k, (kind, phoneme) in enumerate(units):
+        phonemes.append((kind, phoneme))
+        if kind != 'C':
+            open_syllable = kind == 'V'
+            continue
+        nxt = units[k + 1][0] if k + 1 < len(units) else None
+        if nxt == 'C':
+            after_long_a = k > 0 and units[k - 1] == ('V', 'aa')
+            if not open_syllable or after_long_a:
+                # this consonant starts a syllable of its own: give it a vowel
+                phonemes.append(('V', 'i' if after_long_a and open_syllable else 'a'))
+                open_syllable = True
+            else:
+                open_syllable = False  # this consonant closes the syllable
+        else:
+            open_syllable = False
+    return phonemes
+
+
+def _write_urdu(phonemes):
+    out = []
+    for k, (kind, phoneme) in enumerate(phonemes):
+        last = k == len(phonemes) - 1
+        if kind == 'C':
+            if last and phoneme == 'y' and k and phonemes[k - 1] == ('V', 'a'):
+                out.append('ے')  # Sanjay, Vijay
+            # Doubled consonants are written once
+            elif not (out and k and phonemes[k - 1] == (kind, phoneme)):
+                out.append(CONSONANTS[phoneme][2])
+        elif kind == 'N':
+            out.append('ں' if last else 'ن')
+        else:
+            _, _, _, initial, medial, final = VOWELS[phoneme]
+            out.append(initial if k == 0 else final if last else medial)
+    return ''.join(out)
+
+
+# --- Devanagari -------------------------------------------------------------
+
+_DEVANAGARI_CONSONANTS = {
+    'क': 'k', 'ख': 'kh', 'ग': 'g', 'घ': 'gh', 'ङ': 'ng', 'च': 'ch', 'छ': 'chh', 'ज': 'j', 'झ': 'jh',
+    'ञ': 'n', 'ट': 'T', 'ठ': 'Th', 'ड': 'D', 'ढ': 'Dh', 'ण': 'N', 'त': 't', 'थ': 'th', 'द': 'd',
+    'ध': 'dh', 'न': 'n', 'प': 'p', 'फ': 'ph', 'ब': 'b', 'भ': 'bh', 'म': 'm', 'य': 'y', 'र': 'r',
+    'ल': 'l', 'ळ': 'l', 'व': 'v', 'श': 'sh', 'ष': 'sh', 'स': 's', 'ह': 'h',
+}
+_DEVANAGARI_NUKTA = {'k': 'q', 'kh': 'x', 'g': 'G', 'j': 'z', 'ph': 'f', 'D': 'R', 'Dh': 'Rh', 'y': 'y'}
+_DEVANAGARI_VOWELS = {
+    'अ': 'a', 'आ': 'aa', 'इ': 'i', 'ई': 'ii', 'उ': 'u', 'ऊ': 'uu', 'ए': 'e', 'ऐ': 'ai',
+    'ओ': 'o', 'औ': 'au', 'ऑ': 'o',
+}
+_DEVANAGARI_SIGNS = {
+    'ा': 'aa', 'ि': 'i', 'ी': 'ii', 'ु': 'u', 'ू': 'uu', 'े': 'e', 'ै': 'ai', 'ो': 'o',
+    'ौ': 'au', 'ॅ': 'e', 'ॉ': 'o',
+}
+_VIRAMA, _NUKTA = '्', '़'
+
+
+def _devanagari_phonemes(word):
+    # Syllables: [consonant phonemes, vowel, vowel is inherent, nasal]
+    syllables = []
+    joining = False  # previous consonant carried a virama
+    for char in word:
+        if char in _DEVANAGARI_CONSONANTS:
+            if joining:
+                syllables[-1][0].append(_DEVANAGARI_CONSONANTS[char])
+                syllables[-1][1], syllables[-1][2] = 'a', True
+            else:
+                syllables.append([[_DEVANAGARI_CONSONANTS[char]], 'a', True, False])
+            joining = False
+        elif char == _NUKTA and syllables and syllables[-1][0]:
+            consonants = syllables[-1][0]
+            consonants[-1] = _DEVANAGARI_NUKTA.get(consonants[-1], consonants[-1])
+        elif char == _VIRAMA and syllables:
+            syllables[-1][1], syllables[-1][2] = None, False
+            joining = True
+        elif char in _DEVANAGARI_SIGNS and syllables:
+            syllables[-1][1], syllables[-1][2] = _DEVANAGARI_SIGNS[char], False
+        elif char == 'ृ' and syllables:  # vocalic r: कृष्ण -> krishna
+            syllables[-1][0].append('r')
+            syllables[-1][1], syllables[-1][2] = 'i', False
+        elif char == 'ऋ':
+            syllables.append([['r'], 'i', False, False])
+            joining = False
+        elif char in _DEVANAGARI_VOWELS:
+            syllables.append([[], _DEVANAGARI_VOWELS[char], False, False])
+            joining = False
+        elif char in ('ं', 'ँ') and syllables:
+            syllables[-1][3] = True
+        elif char == 'ः' and syllables:
+            syllables.append([['h'], None, False, False])
+
+    # Schwa deletion: at the end of a word (not after a conjunct), then right to
+    # left wherever a consonant with a vowel follows (not a doubled one, as in
+    # मुहम्मद) and a vowel precedes
+    def spoken(syllable):
+        return syllable[1] is not None
+
+    if len(syllables) > 1 and syllables[-1][2] and len(syllables[-1][0]) == 1 and not syllables[-1][3]:
+        syllables[-1][1] = None
+    for k in range(len(syllables) - 2, 0, -1):
+        current, before, after = syllables[k], syllables[k - 1], syllables[k + 1]
+        if (current[2] and not current[3] and spoken(before) and spoken(after)
+                and after[0] and after[0][0] != 'y' and after[0][:2] != after[0][:1] * 2):
+            current[1] = None
+
+    phonemes = []
+    for consonants, vowel, _, nasal in syllables:
+        phonemes.extend(('C', consonant) for consonant in consonants)
+        if vowel:
+            phonemes.append(('V', vowel))
+        if nasal:
+            phonemes.append(('N', NASAL))
+    return phonemes
+
+
+def _write_devanagari(phonemes):
+    out = []
+    for k, (kind, phoneme) in enumerate(phonemes):
+        nxt = phonemes[k + 1] if k + 1 < len(phonemes) else None
+        if kind == 'C':
+            out.append(CONSONANTS[phoneme][1])
+            if nxt and nxt[0] == 'C':
+                out.append(_VIRAMA)  # no vowel in between: conjunct (क्रिश्ना, मुहम्मद)
+        elif kind == 'N':
+            out.append('ं')
+        else:
+            _, letter, sign, *_ = VOWELS[phoneme]
+            after_consonant = k > 0 and phonemes[k - 1][0] == 'C'
+            out.append(sign if after_consonant else letter)
+    return ''.join(out)
+
+
+# --- Latin ------------------------------------------------------------------
+
+_LATIN_CONSONANTS = {
+    'chh': 'chh', 'kh': 'x', 'gh': 'gh', 'ch': 'ch', 'jh': 'jh', 'th': 'th', 'dh': 'dh', 'ph': 'ph',
+    'bh': 'bh', 'sh': 'sh', 'zh': 'zh', 'rh': 'Rh', 'ck': 'k', 'k': 'k', 'c': 'k', 'g': 'g',
+    'j': 'j', 't': 't', 'd': 'd', 'n': 'n', 'p': 'p', 'f': 'f', 'b': 'b', 'm': 'm', 'y': 'y',
+    'r': 'r', 'l': 'l', 'v': 'v', 'w': 'w', 's': 's', 'h': 'h', 'z': 'z', 'q': 'q', 'x': 'x',
+}
+_LATIN_VOWELS = {
+    'aa': 'aa', 'ee': 'ii', 'ii': 'ii', 'oo': 'uu', 'uu': 'uu', 'ai': 'ai', 'ei': 'ai',
+    'au': 'au', 'ou': 'au', 'a': 'a', 'e': 'e', 'i': 'i', 'o': 'o', 'u': 'u',
+}
+_LATIN_TOKEN_RE = re.compile('|'.join(sorted(
+    list(_LATIN_CONSONANTS) + list(_LATIN_VOWELS), key=len, reverse=True
+)))
+_LABIALS = {'p', 'ph', 'b', 'bh', 'm'}
+
+
+def _latin_phonemes(word):
+    phonemes = []
+    tokens = _LATIN_TOKEN_RE.findall(word)
+    for k, token in enumerate(tokens):
+        last = k == len(tokens) - 1
+        if token in _LATIN_VOWELS:
+            vowel = _LATIN_VOWELS[token]
+            if last and phonemes and phonemes[-1][0] == 'C':
+                vowel = {'a': 'aa', 'i': 'ii', 'u': 'uu'}.get(vowel, vowel)  # final vowels are long: Sharma, Ravi, Raju
+            phonemes.append(('V', vowel))
+        elif token == 'y' and last and phonemes and phonemes[-1][0] == 'C':
+            phonemes.append(('V', 'ii'))  # Aly, Shelly
+        elif token == 'n' and phonemes and phonemes[-1][0] == 'V' and not last \
+                and tokens[k + 1] in _LATIN_CONSONANTS and tokens[k + 1] not in ('y', 'h', 'w', 'v', 'r'):
+            phonemes.append(('N', NASAL))  # nasal before a consonant: anusvara
+        elif token == 'x':
+            phonemes.extend((('C', 'k'), ('C', 's')))
+        else:
+            phonemes.append(('C', _LATIN_CONSONANTS[token]))
+    return phonemes
+
+
+def _write_latin(phonemes):
+    out = []
+    for k, (kind, phoneme) in enumerate(phonemes):
+        if kind == 'N':
+            nxt = phonemes[k + 1][1] if k + 1 < len(phonemes) else None
+            out.append('m' if nxt in _LABIALS else 'n')
+        elif kind == 'C':
+            out.append(CONSONANTS[phoneme][0])
+        else:
+            out.append(VOWELS[phoneme][0])
+    return ''.join(out).capitalize()
+
+
+# --- Words and texts --------------------------------------------------------
+
+_READERS = {'urdu': _urdu_phonemes, 'devanagari': _devanagari_phonemes, 'latin': _latin_phonemes}
+_WRITERS = {'urdu': _write_urdu, 'devanagari': _write_devanagari, 'latin': _write_latin}
+_WORD_RES = {
+    'urdu': re.compile('[\u0621-\u063A\u0641-\u065F\u066E-\u06D3]+'),  # letters and marks, no digits or ۔
+    'devanagari': re.compile('[\u0900-\u0963\u0971-\u097F]+'),  # no danda or digits
+    'latin': re.compile('[A-Za-z]+'),
+}
+
+
+def _table_key(word, script):
+    if script == 'latin':
+        word = word.lower()
+        return _LATIN_VARIANTS.get(word, word)
+    if script == 'urdu':
+        return word.translate(_URDU_FOLD)
+    return unicodedata.normalize('NFC', word)
+
+
+_NAME_INDEX = {
+    script: {_table_key(entry[column], script): entry for entry in NAME_TABLE}
+    for column, script in ((0, 'latin'), (1, 'urdu'), (2, 'devanagari'))
+}
+_TABLE_COLUMNS = {'latin': 0, 'urdu': 1, 'devanagari': 2}
+
+
+@lru_cache(maxsize=65536)
+def transliterate_word(word, source_script, target_script):
+    """One word from source to target script (both normalized script names)"""
+    entry = _NAME_INDEX[source_script].get(_table_key(word, source_script))
+    if entry:
+        return entry[_TABLE_COLUMNS[target_script]]
+    if source_script == 'urdu':
+        word = word.translate(_URDU_FOLD)
+        for prefix in _URDU_PREFIXES:
+            if word.startswith(prefix) and len(word) > len(prefix) + 1:
+                rest = word[len(prefix):]
+                separator = '' if target_script == 'urdu' else ' '
+                return transliterate_word(prefix, source_script, target_script) + separator \
+                    + transliterate_word(rest, source_script, target_script)
+    elif source_script == 'latin':
+        word = word.lower()
+    phonemes = _READERS[source_script](word)
+    if source_script == 'latin' and target_script == 'urdu':
+        # Romanized names do not mark length, and Urdu writes their i with ی (Rashid -> رشید)
+        phonemes = [('V', 'ii') if phoneme == ('V', 'i') and k else phoneme for k, phoneme in enumerate(phonemes)]
+    return _WRITERS[target_script](phonemes)
+
+
+def _script(name):
+    script = _SCRIPT_ALIASES.get(name, name)
+    if script not in SCRIPTS:
+        raise ValueError(f"Unsupported script '{name}' (expected one of {', '.join(SCRIPTS)})")
+    return script
+
+
+def _detect_script(text):
+    from translation.language_detector import detect_language
+
+    return {'ur': 'urdu', 'hi': 'devanagari', 'en': 'latin'}.get(detect_language(text))
+
+
 def transliterate(text, source_script, target_script):
-    # Placeholder
-    return text
+    """
+    Transliterate a name (or any text) between 'urdu', 'devanagari' and 'latin'
+
+    source_script may be 'auto' (or None) to detect it. Characters outside the
+    source script (digits, punctuation, other scripts) are kept as they are;
+    text in an unsupported script is returned unchanged.
+
+    Raises:
+        ValueError: Unknown script name
+    """
+    target = _script(target_script)
+    if not text:
+        return text
+    text = unicodedata.normalize('NFC', text)
+    source = _detect_script(text) if source_script in (None, 'auto') else _script(source_script)
+    if source is None or source == target:
+        return text
+    return _WORD_RES[source].sub(lambda m: transliterate_word(m.group(0), source, target), text)
+
+
+def transliterate_batch(texts, source_script, target_script):
+    """transliterate() for many texts; repeated texts are done once. None stays None."""
+    done = {}
+    results = []
+    for text in texts:
+        if text not in done:
+            done[text] = transliterate(text, source_script, target_script) if text is not None else None
+        results.append(done[text])
+    return results
@@ -0,0 +1,394 @@
+"""
+Translation service: a fixed pool of model replicas behind a request queue
+
+Without it every gunicorn worker loads its own copy of the model, and a long
+document ties up the worker that received it. With TRANSLATION_SERVICE_ADDRESS
+set, Flask workers hold no model at all. They send batches of segments to a
+separate process started with
+
+    flask --app app translation-service --replicas 2
+
+That process runs TRANSLATION_REPLICAS model processes (multiprocessing.Pool)
+and accepts requests over a local authenticated socket
+(multiprocessing.connection). A document's batches are submitted as separate
+requests (up to TRANSLATION_REQUEST_WINDOW at a time) and awaited as
+futures, so replicas work on them in parallel. Each replica starts with the
+indic-en model and loads other directions on demand, within its own
+TRANSLATION_MODEL_MEMORY_MB (translation/model_registry.py).
+Web concurrency (gunicorn workers/threads) and model memory (replicas) are
+sized independently.
+
+multiprocessing.connection unpickles what it receives, so whoever can
+connect can run code in the service: TRANSLATION_SERVICE_AUTHKEY has no
+default, and neither the service nor the client start without it. Bind to
+loopback or a unix socket unless the network in between is trusted.
+
+At most TRANSLATION_QUEUE_SIZE batches may be queued or running. Beyond
+that, requests are refused straight away with ModelUnavailableError (HTTP
+503) instead of waiting in an unbounded queue. The same error is raised
+when the service cannot be reached. A batch not answered within
+TRANSLATION_SERVICE_TIMEOUT (e.g. its replica died, so the pool never calls
+back) is failed and its queue slot released; the pool starts a new replica.
+"""
+import ipaddress
+import itertools
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from multiprocessing.connection import Client, Listener
+from translation.batching import MAX_BATCH_SIZE, MAX_BATCH_TOKENS, estimate_tokens, plan_batches
+from translation.model_manager import ModelUnavailableError
+
+logger = logging.getLogger(__name__)
+
+SERVICE_ADDRESS = os.environ.get('TRANSLATION_SERVICE_ADDRESS')  # host:port or a unix socket path
+AUTHKEY = os.environ.get('TRANSLATION_SERVICE_AUTHKEY', '').encode('utf-8') or None  # required, no default
+REPLICAS = int(os.environ.get('TRANSLATION_REPLICAS', 1))
+QUEUE_SIZE = int(os.environ.get('TRANSLATION_QUEUE_SIZE', 64))
+REQUEST_TIMEOUT = float(os.environ.get('TRANSLATION_SERVICE_TIMEOUT', 300))
+# Batches of one translate() call in flight at once
+REQUEST_WINDOW = int(os.environ.get('TRANSLATION_REQUEST_WINDOW', 4))
+STATUS_TIMEOUT = 2
+WATCHDOG_INTERVAL = 1  # seconds between checks for batches past their deadline
+
+
+def configured():
+    return bool(SERVICE_ADDRESS)
+
+
+def parse_address(address):
+    """('host', port) for "host:port", otherwise a unix socket path"""
+    host, sep, port = address.rpartition(':')
+    if sep and port.isdigit():
+        return host or '127.0.0.1', int(port)
+    return address
+
+
+def _is_loopback(address):
+    if not isinstance(address, tuple):
+        return True  # unix socket
+    host = address[0]
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False  # a host name that may resolve anywhere
+
+
+def check_endpoint(address, authkey):
+    """
+    Refuse to serve or connect without an authkey
+
+    Raises:
+        ValueError: No authkey (the message names the exposure for non-loopback addresses)
+    """
+    if authkey:
+        return
+    if _is_loopback(parse_address(address)):
+        raise ValueError(f"TRANSLATION_SERVICE_AUTHKEY must be set to use the translation service at {address}")
+    raise ValueError(f"Refusing non-loopback translation service address {address} without an explicit "
+                     "TRANSLATION_SERVICE_AUTHKEY: any host that reaches it could run code in the service")
+
+
+# ---------------------------------------------------------------------------
+# Replica processes
+
+def _init_replica(ready_queue, threads):
+    if threads:
+        try:
+            import torch
+            torch.set_num_threads(threads)
+        except ImportError:
+            pass
+    from translation.ai4bharat_translator import model_manager
+    model_manager.warmup()
+    ready_queue.put((os.getpid(), model_manager.status()))
+
+
+def _translate_in_replica(segments, src_lang, tgt_lang):
+    from translation.ai4bharat_translator import translate_locally
+    return translate_locally(segments, src_lang=src_lang, tgt_lang=tgt_lang)
+
+
+# ---------------------------------------------------------------------------
+# Service
+
+class TranslationService:
+    def __init__(self, address=SERVICE_ADDRESS, replicas=REPLICAS, queue_size=QUEUE_SIZE, authkey=AUTHKEY,
+                 task_timeout=REQUEST_TIMEOUT):
+        """
+        Raises:
+            ValueError: No authkey (see check_endpoint)
+        """
+        check_endpoint(address, authkey)
+        self.address = parse_address(address)
+        self.replicas = replicas
+        self.queue_size = queue_size
+        self.authkey = authkey
+        self.task_timeout = task_timeout
+        self._slots = threading.BoundedSemaphore(queue_size)
+        self._lock = threading.Lock()
+        self._task_ids = itertools.count()
+        self._tasks = {}  # task id -> (deadline, reply, request id) until answered
+        self._in_flight = 0
+        self._completed = 0
+        self._replica_status = {}
+        self._pool = None
+
+    def start_pool(self):
+        # spawn: replicas start from a clean interpreter instead of a copy of this one's threads
+        context = multiprocessing.get_context('spawn')
+        ready_queue = context.Queue()
+        threads = max(1, (os.cpu_count() or 1) // self.replicas)
+        self._pool = context.Pool(self.replicas, initializer=_init_replica, initargs=(ready_queue, threads))
+        threading.Thread(target=self._collect_ready, args=(ready_queue,), daemon=True).start()
+        threading.Thread(target=self._watch_deadlines, daemon=True).start()
+
+    def _collect_ready(self, ready_queue):
+        while True:
+            pid, status = ready_queue.get()
+            with self._lock:
+                self._replica_status[pid] = status
+            logger.info(f"Translation replica {pid}: {status['state']}")
+
+    def serve_forever(self):
+        if self._pool is None:
+            self.start_pool()
+        with Listener(self.address, authkey=self.authkey) as listener:
+            logger.info(f"Translation service listening on {self.address} with {self.replicas} replicas")
+            while True:
+                try:
+                    connection = listener.accept()
+                except (OSError, multiprocessing.AuthenticationError) as e:
+                    logger.warning(f"Rejected translation client: {e}")
+                    continue
+                threading.Thread(target=self._handle, args=(connection,), daemon=True).start()
+
+    def _handle(self, connection):
+        send_lock = threading.Lock()
+
+        def reply(kind, request_id, payload):
+            with send_lock:
+                try:
+                    connection.send((kind, request_id, payload))
+                except OSError:
+                    pass  # client went away
+
+        while True:
+            try:
+                kind, request_id, payload = connection.recv()
+            except (EOFError, OSError):
+                break
+            if kind == 'status':
+                reply('result', request_id, self.status())
+            elif kind != 'translate':
+                reply('error', request_id, f"Unknown request '{kind}'")
+            elif not self._slots.acquire(blocking=False):
+                reply('unavailable', request_id, f"translation queue full ({self.queue_size} batches)")
+            else:
+                task_id = next(self._task_ids)
+                with self._lock:
+                    self._in_flight += 1
+                    self._tasks[task_id] = (time.monotonic() + self.task_timeout, reply, request_id)
+                try:
+                    self._pool.apply_async(
+                        _translate_in_replica, payload,
+                        callback=lambda result, task_id=task_id: self._finish(task_id, 'result', result),
+                        error_callback=lambda error, task_id=task_id: self._finish(
+                            task_id, 'unavailable' if isinstance(error, ModelUnavailableError) else 'error', str(error)
+                        )
+                    )
+                except Exception as e:  # pool closed or payload not picklable
+                    self._finish(task_id, 'error', str(e))
+        connection.close()
+
+    def _finish(self, task_id, kind, payload):
+        """Answer a batch and release its slot, once (callbacks of timed-out batches are dropped)"""
+        with self._lock:
+            task = self._tasks.pop(task_id, None)
+            if task is None:
+                return
+            self._in_flight -= 1
+            self._completed += 1
+        self._slots.release()
+        _, reply, request_id = task
+        reply(kind, request_id, payload)
+
+    def expire_tasks(self, now=None):
+        """Fail batches past their deadline. Returns how many expired."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            expired = [task_id for task_id, (deadline, *_) in self._tasks.items() if deadline <= now]
+        for task_id in expired:
+            self._finish(task_id, 'unavailable', f"Translation replica did not answer within {self.task_timeout:g}s")
+        if expired:
+            logger.warning(f"{len(expired)} translation batch(es) timed out; was a replica lost?")
+        return len(expired)
+
+    def _watch_deadlines(self):
+        while True:
+            time.sleep(WATCHDOG_INTERVAL)
+            self.expire_tasks()
+
+    def status(self):
+        with self._lock:
+            replicas = list(self._replica_status.values())
+            in_flight, completed = self._in_flight, self._completed
+        ready = sum(1 for status in replicas if status['ready'])
+        failed = [status['error'] for status in replicas if status['state'] not in ('ready', 'loading')]
+        if ready:
+            state = 'ready'
+        elif failed and len(failed) >= self.replicas:
+            state = 'failed'
+        else:
+            state = 'loading'
+        return {
+            'model': replicas[0]['model'] if replicas else None,
+            'state': state,
+            'ready': bool(ready),
+            'load_seconds': max((s['load_seconds'] for s in replicas if s['load_seconds'] is not None), default=None),
+            'error': failed[0] if failed and not ready else None,
+            'replicas': self.replicas,
+            'replicas_ready': min(ready, self.replicas),
+            'in_flight': in_flight,
+            'queue_size': self.queue_size,
+            'completed': completed,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Client (used by Flask workers)
+
+class TranslationClient:
+    """One connection per process; many requests may be in flight on it"""
+
+    def __init__(self, address=SERVICE_ADDRESS, authkey=AUTHKEY):
+        """
+        Raises:
+            ModelUnavailableError: No authkey (see check_endpoint)
+        """
+        try:
+            check_endpoint(address, authkey)
+        except ValueError as e:
+            raise ModelUnavailableError(str(e))
+        self.address = address
+        self.authkey = authkey
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pending = None
+        self._pid = None
+        self._ids = itertools.count()
+
+    def _connect(self):
+        # Caller holds the lock; a forked child never reuses its parent's socket
+        if self._connection is None or self._pid != os.getpid():
+            try:
+                connection = Client(parse_address(self.address), authkey=self.authkey)
+            except (OSError, EOFError, multiprocessing.AuthenticationError) as e:
+                raise ModelUnavailableError(f"Translation service unreachable at {self.address}: {e}")
+            self._connection, self._pending, self._pid = connection, {}, os.getpid()
+            threading.Thread(target=self._read, args=(connection, self._pending), daemon=True).start()
+        return self._connection
+
+    def _read(self, connection, pending):
+        while True:
+            try:
+                kind, request_id, payload = connection.recv()
+            except (EOFError, OSError):
+                break
+            with self._lock:
+                future = pending.pop(request_id, None)
+            if future is None:
+                continue
+            if kind == 'result':
+                future.set_result(payload)
+            elif kind == 'unavailable':
+                future.set_exception(ModelUnavailableError(payload))
+            else:
+                future.set_exception(RuntimeError(payload))
+        with self._lock:
+            if self._connection is connection:
+                self._connection = None
+            failed = list(pending.values())
+            pending.clear()
+        for future in failed:
+            future.set_exception(ModelUnavailableError(f"Translation service at {self.address} closed the connection"))
+
+    def submit(self, kind, payload=None):
+        """Send a request; returns a Future for the reply"""
+        future = Future()
+        with self._lock:
+            connection = self._connect()
+            request_id = next(self._ids)
+            self._pending[request_id] = future
+            try:
+                connection.send((kind, request_id, payload))
+            except OSError as e:
+                self._pending.pop(request_id, None)
+                self._connection = None
+                raise ModelUnavailableError(f"Translation service unreachable at {self.address}: {e}")
+        return future
+
+    def _abandon(self, futures):
+        """Stop waiting for replies that nobody will read (late replies are then dropped)"""
+        futures = set(futures)
+        with self._lock:
+            if self._pending:
+                for request_id in [rid for rid, future in self._pending.items() if future in futures]:
+                    del self._pending[request_id]
+
+    def translate(self, sources, max_batch_tokens=MAX_BATCH_TOKENS, max_batch_size=MAX_BATCH_SIZE,
+                  src_lang='urd_Arab', tgt_lang='eng_Latn', timeout=REQUEST_TIMEOUT):
+        """Translate segments of one language pair on the service, one request per length-bucketed batch"""
+        pending = deque(plan_batches([estimate_tokens(s) for s in sources], max_batch_tokens, max_batch_size))
+        in_flight = deque()
+        translations = [''] * len(sources)
+        try:
+            while pending or in_flight:
+                # A bounded window, so one long document cannot fill the service queue by itself
+                while pending and len(in_flight) < REQUEST_WINDOW:
+                    batch = pending.popleft()
+                    in_flight.append((batch, self.submit('translate', ([sources[i] for i in batch], src_lang, tgt_lang))))
+                batch, future = in_flight[0]
+                for i, translated in zip(batch, future.result(timeout)):
+                    translations[i] = translated
+                in_flight.popleft()
+        except FutureTimeoutError:
+            self._abandon(future for _, future in in_flight)
+            raise ModelUnavailableError(f"Translation service did not answer within {timeout}s")
+        except Exception:
+            self._abandon(future for _, future in in_flight)
+            raise
+        return translations
+
+    def status(self, timeout=STATUS_TIMEOUT):
+        future = self.submit('status')
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            self._abandon([future])
+            raise
+
+
+_client = None
+
+
+def get_client():
+    global _client
+    if _client is None:
+        _client = TranslationClient()
+    return _client
+
+
+def service_status():
+    """Service readiness for /api/health, without ever raising"""
+    try:
+        return {**get_client().status(), 'service': SERVICE_ADDRESS}
+    except (ModelUnavailableError, FutureTimeoutError) as e:
+        return {'model': None, 'state': 'unreachable', 'ready': False, 'load_seconds': None,
+                'error': str(e) or 'timed out', 'service': SERVICE_ADDRESS}